@@ -0,0 +1,147 @@
+"""
+ReGraph SDK - Sharded Batch Benchmark
+
+Runs a workload through ``BatchOrchestrator`` against an in-memory stand-in
+for the batch API (a MockTransport handler). Each batch completes after a few
+polls; the stand-in fails items at random, and whole batches too (always the
+first one), so they are resubmitted with identical contents. The
+workload runs twice: without a journal and with a RequestJournal configured.
+The run fails if any item ends without a result, if a resubmission is answered
+with a batch that already exists instead of a new one, or if a batch is
+created more often than the orchestrator reports.
+
+Usage:
+    python benchmarks/bench_batches.py [--requests 20000] [--shard-size 500]
+        [--fail-rate 0.05] [--batch-fail-rate 0.1] [--polls 3]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from regraph import BatchOrchestrator, MockTransport, ReGraph, RequestJournal  # noqa: E402
+
+
+class _Store:
+    """Batches held by the stand-in, shared by the orchestrator's threads."""
+
+    def __init__(self, fail_rate: float, batch_fail_rate: float, polls: int):
+        self.fail_rate = fail_rate
+        self.batch_fail_rate = batch_fail_rate
+        self.polls = polls
+        self.rng = random.Random(0)
+        self.lock = threading.Lock()
+        self.batches = {}  # batch_id -> {"requests": list, "failed": set, "lost": bool, "polls": int}
+        self.creates = 0
+
+    def handle(self, method, path, body, headers):
+        with self.lock:
+            if method == "POST" and path == "/batch":
+                self.creates += 1
+                batch_id = f"b{self.creates}"
+                requests = json.loads(body)["requests"]
+                failed = {i for i in range(len(requests)) if self.rng.random() < self.fail_rate}
+                lost = self.creates == 1 or self.rng.random() < self.batch_fail_rate
+                self.batches[batch_id] = {"requests": requests, "failed": failed, "lost": lost, "polls": 0}
+                return 200, json.dumps(self._job(batch_id)).encode()
+            if method == "GET" and path.startswith("/batch/"):
+                batch_id = path.rsplit("/", 1)[-1]
+                if batch_id not in self.batches:
+                    return 404, b'{"error": {"message": "no such batch"}}'
+                self.batches[batch_id]["polls"] += 1
+                return 200, json.dumps(self._job(batch_id)).encode()
+        return 404, b'{"error": {"message": "not found"}}'
+
+    def _job(self, batch_id):
+        batch = self.batches[batch_id]
+        total = len(batch["requests"])
+        done = batch["polls"] >= self.polls
+        if done and batch["lost"]:
+            return {"batch_id": batch_id, "status": "failed", "total_requests": total,
+                    "completed_requests": 0, "failed_requests": total, "created_at": ""}
+        job = {
+            "batch_id": batch_id,
+            "status": "completed" if done else "processing",
+            "total_requests": total,
+            "completed_requests": total - len(batch["failed"]) if done else 0,
+            "failed_requests": len(batch["failed"]) if done else 0,
+            "created_at": "",
+        }
+        if done:
+            job["results"] = [
+                {"index": i, "status": "failed" if i in batch["failed"] else "completed",
+                 "output": None if i in batch["failed"] else r["custom_id"]}
+                for i, r in enumerate(batch["requests"])
+            ]
+        return job
+
+
+def _run(args, journal_path):
+    store = _Store(args.fail_rate, args.batch_fail_rate, args.polls)
+    journal = RequestJournal(journal_path) if journal_path else None
+    client = ReGraph(api_key="bench", transport=MockTransport(store.handle, record_calls=False), journal=journal)
+    requests = [
+        {"custom_id": f"req-{i}", "model": "gpt-5", "messages": [{"role": "user", "content": f"item {i}"}]}
+        for i in range(args.requests)
+    ]
+    orchestrator = BatchOrchestrator(client, shard_size=args.shard_size, poll_interval=0.01, max_poll_interval=0.05)
+
+    start = time.perf_counter()
+    run = orchestrator.run(requests)
+    elapsed = time.perf_counter() - start
+    client.close()
+    if journal is not None:
+        journal.close()
+
+    label = "with journal" if journal_path else "without journal"
+    print(f"{label}:")
+    print(f"  requests:            {args.requests} in {elapsed:.2f} s")
+    print(f"  batches created:     {store.creates} ({len(run.batch_ids)} reported)")
+    print(f"  items resubmitted:   {run.resubmitted}")
+    print(f"  failed after retries: {len(run.errors)}")
+
+    failed = False
+    missing = [i for i, r in enumerate(run.results) if r is None and i not in run.errors]
+    if missing:
+        print(f"FAIL: {len(missing)} items ended without a result or an error")
+        failed = True
+    wrong = [i for i, r in enumerate(run.results) if r is not None and r["output"] != requests[i]["custom_id"]]
+    if wrong:
+        print(f"FAIL: {len(wrong)} results were merged into the wrong position")
+        failed = True
+    if len(set(run.batch_ids)) != len(run.batch_ids):
+        print("FAIL: a resubmission was answered with an existing batch")
+        failed = True
+    if store.creates != len(run.batch_ids):
+        print("FAIL: batches created on the server do not match the batches tracked")
+        failed = True
+    if run.resubmitted and store.creates <= -(-args.requests // args.shard_size):
+        print("FAIL: failed items were not sent again")
+        failed = True
+    return failed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000, help="Items in the workload")
+    parser.add_argument("--shard-size", type=int, default=500, help="Items per batch")
+    parser.add_argument("--fail-rate", type=float, default=0.05, help="Chance that an item fails")
+    parser.add_argument("--batch-fail-rate", type=float, default=0.1, help="Chance that a whole batch fails")
+    parser.add_argument("--polls", type=int, default=3, help="Polls before a batch completes")
+    args = parser.parse_args()
+
+    failed = _run(args, None)
+    with tempfile.TemporaryDirectory() as tmp:
+        failed |= _run(args, os.path.join(tmp, "regraph.journal"))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
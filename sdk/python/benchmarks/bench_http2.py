@@ -0,0 +1,197 @@
+"""
+ReGraph SDK - HTTP/2 Multiplexing Benchmark
+
+Starts a local HTTP/2 (h2c) stand-in for the API that answers chat completions
+after a fixed latency, then fires many concurrent requests through a client
+using HTTP2Transport. Reports throughput and connection-level metrics; the
+run fails if more connections are opened than the transport allows or if any
+request fails. A streamed response larger than the flow-control window is also
+checked.
+
+Requires the h2 package (``pip install regraph[http2]``).
+
+Usage:
+    python benchmarks/bench_http2.py [--requests 5000] [--concurrency 1000]
+        [--latency-ms 50] [--server-max-streams 100] [--connections 2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import h2.config  # noqa: E402
+import h2.connection  # noqa: E402
+import h2.events  # noqa: E402
+import h2.exceptions  # noqa: E402
+import h2.settings  # noqa: E402
+
+from regraph import HTTP2Transport, ReGraph  # noqa: E402
+
+STREAM_BYTES = 8 * 1024 * 1024
+
+
+class _StandInProtocol(asyncio.Protocol):
+    """Minimal HTTP/2 server: chat completions plus one large streamed response."""
+
+    def __init__(self, latency: float, max_streams: int):
+        self.latency = latency
+        self.conn = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        self.conn.local_settings = h2.settings.Settings(
+            client=False,
+            initial_values={h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: max_streams},
+        )
+        self.bodies = {}
+        self.pending = {}  # stream id -> flow-control waiter
+        self.reset = set()  # streams cancelled by the client
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.conn.initiate_connection()
+        self.transport.write(self.conn.data_to_send())
+
+    def data_received(self, data):
+        for event in self.conn.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                self.bodies[event.stream_id] = (dict(event.headers), bytearray())
+            elif isinstance(event, h2.events.DataReceived):
+                self.bodies[event.stream_id][1].extend(event.data)
+                self.conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+            elif isinstance(event, h2.events.StreamEnded):
+                headers, body = self.bodies.pop(event.stream_id)
+                asyncio.ensure_future(self.respond(event.stream_id, headers, bytes(body)))
+            elif isinstance(event, h2.events.StreamReset):
+                self.bodies.pop(event.stream_id, None)
+                self.reset.add(event.stream_id)
+            elif isinstance(event, h2.events.WindowUpdated):
+                for waiter in list(self.pending.values()):
+                    if not waiter.done():
+                        waiter.set_result(None)
+        self.transport.write(self.conn.data_to_send())
+
+    async def respond(self, stream_id, headers, body):
+        if headers[":path"].endswith("/stream"):
+            await self.send(stream_id, b"x" * STREAM_BYTES, "application/octet-stream")
+            return
+        await asyncio.sleep(self.latency)
+        request = json.loads(body or b"{}")
+        payload = json.dumps({
+            "id": f"chatcmpl-{stream_id}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", ""),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "ok"},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6},
+        }).encode()
+        await self.send(stream_id, payload, "application/json")
+
+    async def send(self, stream_id, payload, content_type):
+        try:
+            await self._send(stream_id, payload, content_type)
+        except h2.exceptions.StreamClosedError:
+            pass  # Reset by the client while we were responding
+        finally:
+            self.pending.pop(stream_id, None)
+
+    async def _send(self, stream_id, payload, content_type):
+        if stream_id in self.reset:
+            return
+        self.conn.send_headers(stream_id, [
+            (":status", "200"),
+            ("content-type", content_type),
+            ("content-length", str(len(payload))),
+        ])
+        offset = 0
+        while offset < len(payload):
+            window = min(self.conn.local_flow_control_window(stream_id), self.conn.max_outbound_frame_size)
+            if window <= 0:
+                waiter = self.pending[stream_id] = asyncio.get_running_loop().create_future()
+                self.transport.write(self.conn.data_to_send())
+                await waiter
+                continue
+            chunk = payload[offset : offset + window]
+            offset += len(chunk)
+            self.conn.send_data(stream_id, chunk, end_stream=offset == len(payload))
+        self.transport.write(self.conn.data_to_send())
+
+
+def start_server(latency: float, max_streams: int) -> str:
+    """Run the stand-in on a background event loop; returns its base URL."""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    address = []
+
+    async def serve():
+        server = await loop.create_server(lambda: _StandInProtocol(latency, max_streams), "127.0.0.1", 0)
+        address.append(server.sockets[0].getsockname()[1])
+        ready.set()
+
+    threading.Thread(target=lambda: (loop.run_until_complete(serve()), loop.run_forever()), daemon=True).start()
+    ready.wait()
+    return f"http://127.0.0.1:{address[0]}/v1"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000, help="Total chat requests")
+    parser.add_argument("--concurrency", type=int, default=1000, help="Client threads")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Stand-in response latency")
+    parser.add_argument("--server-max-streams", type=int, default=100, help="SETTINGS_MAX_CONCURRENT_STREAMS")
+    parser.add_argument("--connections", type=int, default=2, help="HTTP/2 connections allowed")
+    args = parser.parse_args()
+
+    base_url = start_server(args.latency_ms / 1000, args.server_max_streams)
+    transport = HTTP2Transport(base_url, max_connections=args.connections)
+    client = ReGraph(api_key="bench", base_url=base_url, transport=transport)
+    messages = [{"role": "user", "content": "ping"}]
+
+    def call(_):
+        return client.chat.completions.create(model="gpt-5", messages=messages)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as executor:
+        results = list(executor.map(call, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    status, chunks = transport.stream("GET", "/stream")
+    streamed = sum(len(chunk) for chunk in chunks)
+
+    metrics = transport.metrics()
+    ideal = args.requests / (args.connections * args.server_max_streams) * args.latency_ms / 1000
+    print(f"requests:              {len(results)} in {elapsed:.2f} s ({len(results) / elapsed:,.0f} req/s)")
+    print(f"ideal (stream limit):  {ideal:.2f} s")
+    print(f"connections opened:    {metrics['connections_opened']}")
+    print(f"peak active streams:   {metrics['peak_active_streams']}")
+    print(f"streams opened:        {metrics['streams_opened']}")
+    print(f"slot waits:            {metrics['slot_waits']}")
+    print(f"bytes sent/received:   {metrics['bytes_sent']:,} / {metrics['bytes_received']:,}")
+    print(f"streamed response:     {streamed:,} bytes (status {status})")
+    client.close()
+
+    failed = False
+    if metrics["connections_opened"] > args.connections:
+        print("FAIL: more connections than allowed")
+        failed = True
+    if metrics["peak_active_streams"] > args.connections * args.server_max_streams:
+        print("FAIL: exceeded the server's stream limit")
+        failed = True
+    if streamed != STREAM_BYTES:
+        print("FAIL: streamed response truncated")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+ReGraph SDK - Import-Time Benchmark
+
+Measures ``import regraph`` plus construction of the first client in fresh
+interpreters, and fails if the median exceeds the tracked budget or if
+construction pulls in modules that should only load on the first request.
+
+Usage:
+    python benchmarks/bench_import.py [--runs 20] [--budget-ms 25]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Tracked startup budget for `import regraph` + `ReGraph(api_key=...)`.
+BUDGET_MS = 25.0
+
+# Modules that must not be imported until a request is actually made.
+DEFERRED_MODULES = ("http.client", "ssl", "dataclasses", "regraph.models", "regraph._pool")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import regraph
+imported = time.perf_counter()
+regraph.ReGraph(api_key="bench")
+constructed = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "total_ms": (constructed - start) * 1000,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (DEFERRED_MODULES,)
+
+
+def run_probe() -> dict:
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=package_root)
+    output = subprocess.check_output([sys.executable, "-c", _PROBE], env=env)
+    return json.loads(output)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Fresh interpreters to sample")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="Median budget")
+    args = parser.parse_args()
+
+    run_probe()  # warm the bytecode cache
+    samples = [run_probe() for _ in range(args.runs)]
+    import_ms = statistics.median(s["import_ms"] for s in samples)
+    total_ms = statistics.median(s["total_ms"] for s in samples)
+    loaded = sorted({m for s in samples for m in s["loaded"]})
+
+    print(f"import regraph:          {import_ms:7.2f} ms (median of {args.runs})")
+    print(f"import + first client:   {total_ms:7.2f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: loaded at construction: {', '.join(loaded)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("FAIL: over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
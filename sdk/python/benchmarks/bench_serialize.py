@@ -0,0 +1,141 @@
+"""
+ReGraph SDK - Chat Serialization Benchmark
+
+Replays multi-turn conversations the way a chat application sends them: every
+turn resends the whole history plus one new user message. Compares encoding
+the message list on every turn (with the standard library and with orjson)
+against a MessageHistory, which encodes each message once and assembles the
+body from cached bytes. A last pass goes through ``chat.completions.create``
+on a MockTransport to include the client's own per-call work. The run fails
+if any strategy produces a body that decodes differently.
+
+orjson is optional (``pip install regraph[speedups]``); without it the orjson
+rows are skipped.
+
+Usage:
+    python benchmarks/bench_serialize.py [--turns 100] [--conversations 20]
+        [--message-chars 600]
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from regraph import ChatMessage, MessageHistory, MockTransport, ReGraph, _json  # noqa: E402
+from regraph.messages import encode_chat_body  # noqa: E402
+
+PARAMS = {"model": "gpt-5", "temperature": 0.7, "top_p": 1.0, "frequency_penalty": 0.0, "presence_penalty": 0.0}
+
+
+def _conversation(turns: int, chars: int, rng: random.Random):
+    """System prompt followed by alternating user and assistant messages."""
+    alphabet = string.ascii_letters + "      .,\"'\né"
+
+    def text() -> str:
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(chars // 2, chars * 3 // 2)))
+
+    messages = [ChatMessage(role="system", content=text())]
+    for _ in range(turns):
+        messages.append(ChatMessage(role="user", content=text()))
+        messages.append(ChatMessage(role="assistant", content=text()))
+    return messages
+
+
+def _per_turn_list(conversation, dumps):
+    """Encode the whole history every turn, as the client did before MessageHistory."""
+    bodies = []
+    history = []
+    for msg in conversation:
+        history.append(msg)
+        if msg.role != "user":
+            continue
+        formatted = [{"role": m.role, "content": m.content, **({"name": m.name} if m.name else {})} for m in history]
+        bodies.append(dumps({**PARAMS, "messages": formatted}))
+    return bodies
+
+
+def _message_history(conversation):
+    bodies = []
+    history = MessageHistory()
+    for msg in conversation:
+        history.append(msg)
+        if msg.role == "user":
+            bodies.append(encode_chat_body(PARAMS, history))
+    return bodies
+
+
+def _time(fn, conversations):
+    start = time.perf_counter()
+    results = [fn(c) for c in conversations]
+    return time.perf_counter() - start, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=100, help="User turns per conversation")
+    parser.add_argument("--conversations", type=int, default=20, help="Conversations replayed")
+    parser.add_argument("--message-chars", type=int, default=600, help="Average characters per message")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    conversations = [_conversation(args.turns, args.message_chars, rng) for _ in range(args.conversations)]
+    requests = args.turns * args.conversations
+    orjson = _json.orjson
+
+    def stdlib_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+    strategies = [("list + json.dumps (before)", lambda c: _per_turn_list(c, stdlib_dumps), None)]
+    if orjson is not None:
+        strategies.append(("list + orjson", lambda c: _per_turn_list(c, orjson.dumps), orjson))
+    strategies.append(("MessageHistory (json)", _message_history, None))
+    if orjson is not None:
+        strategies.append(("MessageHistory (orjson)", _message_history, orjson))
+
+    print(f"{args.conversations} conversations x {args.turns} turns, ~{args.message_chars} chars per message")
+    print(f"{'strategy':<34} {'total':>9} {'per request':>12} {'speedup':>8}")
+    failed = False
+    reference = baseline = None
+    for name, fn, encoder in strategies:
+        _json.orjson = encoder
+        elapsed, bodies = _time(fn, conversations)
+        decoded = [[json.loads(b) for b in c[:: max(1, args.turns // 5)]] for c in bodies]
+        if reference is None:
+            reference, baseline = decoded, elapsed
+        elif decoded != reference:
+            print(f"FAIL: {name} produced different bodies")
+            failed = True
+        print(f"{name:<34} {elapsed * 1000:>7.1f}ms {elapsed / requests * 1e6:>10.1f}us {baseline / elapsed:>7.1f}x")
+    _json.orjson = orjson
+
+    # End to end through the client, on a transport that answers instantly.
+    transport = MockTransport(record_calls=False)
+    transport.add("POST", "/inference", {
+        "id": "c1",
+        "model": "gpt-5",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    })
+    client = ReGraph(api_key="bench", transport=transport)
+    for name, as_history in (("chat.completions.create(list)", False), ("chat.completions.create(history)", True)):
+        start = time.perf_counter()
+        for conversation in conversations:
+            history = MessageHistory() if as_history else []
+            for msg in conversation:
+                history.append(msg)
+                if msg.role == "user":
+                    client.chat.completions.create(model="gpt-5", messages=history)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<34} {elapsed * 1000:>7.1f}ms {elapsed / requests * 1e6:>10.1f}us")
+    client.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
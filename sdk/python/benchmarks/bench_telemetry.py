@@ -0,0 +1,167 @@
+"""
+ReGraph SDK - Provider Telemetry Benchmark
+
+Starts a local stand-in for the telemetry endpoint and runs a TelemetryAgent
+against it at a high sample rate. One of the agent's samplers raises every few
+calls, and the stand-in rejects some pushes with a 503 and answers others with
+a body that is not JSON. Reports the agent's sampling cost and counters. The
+run fails if the agent's thread dies, if the working samplers stop being
+recorded, or if any sample taken is missing on the stand-in after the final
+flush.
+
+Usage:
+    python benchmarks/bench_telemetry.py [--seconds 3] [--sample-ms 10]
+        [--push-ms 100] [--fail-every 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from regraph import ReGraph  # noqa: E402
+from regraph.telemetry import SystemSampler, TelemetryAgent  # noqa: E402
+
+
+class _Store:
+    """Samples received by the stand-in, keyed by their sequence number."""
+
+    def __init__(self, fail_every: int):
+        self.fail_every = fail_every
+        self.lock = threading.Lock()
+        self.samples = {}  # "seq" metric -> {metric: value}
+        self.posts = 0
+        self.rejected = 0
+        self.garbled = 0
+
+
+def _handler(store: _Store):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def reply(self, status, body: bytes):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+            with store.lock:
+                store.posts += 1
+                n = store.posts
+                if store.fail_every and n % store.fail_every == 0:
+                    store.rejected += 1
+                    return self.reply(503, b'{"error": {"message": "try again"}}')
+                for i, seq in enumerate(payload["metrics"]["seq"]):
+                    store.samples[seq] = {k: v[i] for k, v in payload["metrics"].items()}
+                if store.fail_every and n % store.fail_every == 1 and n > 1:
+                    # Stored, but the reply is cut short: the agent sends these samples again.
+                    store.garbled += 1
+                    return self.reply(200, b'{"accepted": ')
+            self.reply(200, b'{"accepted": true}')
+
+    return Handler
+
+
+class _Counter:
+    """Numbers the samples, so the stand-in can tell a resent sample from a new one."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"seq": float(self.calls)}
+
+
+class _FlakySampler:
+    """Reports a counter, raising on every ``fail_every``-th call."""
+
+    def __init__(self, fail_every: int):
+        self.fail_every = fail_every
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail_every and self.calls % self.fail_every == 0:
+            raise RuntimeError("sensor unavailable")
+        return {"flaky_calls": float(self.calls)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0, help="How long the agent runs")
+    parser.add_argument("--sample-ms", type=float, default=10.0, help="Sample interval")
+    parser.add_argument("--push-ms", type=float, default=100.0, help="Push interval")
+    parser.add_argument("--fail-every", type=int, default=5, help="Fail every Nth sampler call and push")
+    args = parser.parse_args()
+
+    store = _Store(args.fail_every)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(store))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = ReGraph(api_key="bench", base_url=f"http://127.0.0.1:{server.server_address[1]}/v1")
+
+    flaky = _FlakySampler(args.fail_every)
+    agent = TelemetryAgent(
+        client,
+        device_id="dev_bench",
+        sample_interval=args.sample_ms / 1000,
+        push_interval=args.push_ms / 1000,
+        samplers=[_Counter(), SystemSampler(), flaky],
+    )
+    agent.start()
+    time.sleep(args.seconds)
+    alive = agent._thread is not None and agent._thread.is_alive()
+    agent.stop()
+    for _ in range(3):  # The final flush can hit an injected failure too
+        if agent.metrics()["buffered"] == 0 or agent.push():
+            break
+    stats = agent.metrics()
+    client.close()
+    server.shutdown()
+
+    expected = args.seconds * 1000 / args.sample_ms
+    with store.lock:
+        received = dict(store.samples)
+    flaky_values = sum(1 for s in received.values() if s.get("flaky_calls") is not None)
+    memory_values = sum(1 for s in received.values() if s.get("memory_percent") is not None)
+    print(f"samples:               {stats['samples']} of ~{expected:.0f} "
+          f"({stats['sampling_seconds'] / max(1, stats['samples']) * 1e6:.0f} us each)")
+    print(f"sample failures:       {stats['sample_failures']} (last error: {stats['last_error']})")
+    print(f"pushes:                {stats['pushes']} ok, {stats['push_failures']} failed "
+          f"({store.rejected} rejected, {store.garbled} garbled)")
+    print(f"received:              {len(received)} samples, {flaky_values} with the flaky metric")
+    print(f"dropped / buffered:    {stats['dropped']} / {stats['buffered']}")
+
+    failed = False
+    if not alive:
+        print("FAIL: the telemetry thread died")
+        failed = True
+    if stats["samples"] < expected * 0.5:
+        print("FAIL: sampling fell behind")
+        failed = True
+    if args.fail_every and not (stats["sample_failures"] and stats["push_failures"] and store.garbled):
+        print("FAIL: the injected failures were not exercised")
+        failed = True
+    if memory_values != len(received) and sys.platform.startswith("linux"):
+        print("FAIL: a failing sampler cost the other samplers' values")
+        failed = True
+    if len(received) != stats["samples"] - stats["dropped"] or stats["buffered"]:
+        print("FAIL: samples were lost")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
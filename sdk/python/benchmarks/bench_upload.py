@@ -0,0 +1,191 @@
+"""
+ReGraph SDK - Chunked Upload Benchmark
+
+Starts a local stand-in for the upload API, then uploads a generated file with
+``client.files.upload``: the first attempt is cancelled part-way through, the
+second resumes from the manifest. The stand-in injects transient errors,
+reassembles the parts, and checks the SHA-256 of the result; the returned
+reference is then used to create a training job and deploy a model. The run
+fails if any part is sent again after resuming, if the reassembled file does
+not match, or if the reference is rejected.
+
+Usage:
+    python benchmarks/bench_upload.py [--size-mb 256] [--part-mb 8]
+        [--concurrency 8] [--fail-every 25]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from regraph import CancellationToken, ReGraph, RequestCancelledError  # noqa: E402
+
+
+class _Store:
+    """Upload state shared by the stand-in's handler threads."""
+
+    def __init__(self, fail_every: int):
+        self.fail_every = fail_every
+        self.lock = threading.Lock()
+        self.uploads = {}  # upload_id -> {"meta": dict, "parts": {n: bytes}, "url": str}
+        self.part_puts = 0
+        self.failures = 0
+        self.parts_stored = 0  # Complete, verified parts (aborted PUTs are not counted)
+
+
+def _handler(store: _Store):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def reply(self, status, obj):
+            body = json.dumps(obj).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def body(self) -> bytes:
+            return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        def do_GET(self):
+            upload = store.uploads.get(self.path.rsplit("/", 1)[-1])
+            if upload is None:
+                return self.reply(404, {"error": {"message": "no such upload"}})
+            parts = [{"part_number": n, "sha256": hashlib.sha256(p).hexdigest()} for n, p in upload["parts"].items()]
+            self.reply(200, {"upload_id": upload["meta"]["upload_id"], "parts": parts})
+
+        def do_PUT(self):
+            _, _, _, upload_id, _, number = self.path.split("/")
+            payload = self.body()
+            with store.lock:
+                store.part_puts += 1
+                if store.fail_every and store.part_puts % store.fail_every == 0:
+                    store.failures += 1
+                    return self.reply(503, {"error": {"message": "try again"}})
+            if hashlib.sha256(payload).hexdigest() != self.headers.get("X-Content-SHA256"):
+                return self.reply(400, {"error": {"message": "part checksum mismatch"}})
+            with store.lock:
+                store.uploads[upload_id]["parts"][int(number)] = payload
+                store.parts_stored += 1
+            self.reply(200, {"part_number": int(number)})
+
+        def do_POST(self):
+            data = json.loads(self.body() or b"{}")
+            if self.path == "/v1/uploads":
+                upload_id = f"upl_{uuid.uuid4().hex[:12]}"
+                meta = dict(data, upload_id=upload_id)
+                store.uploads[upload_id] = {"meta": meta, "parts": {}, "url": None}
+                return self.reply(201, {"upload_id": upload_id, "part_size": data["part_size"]})
+            if self.path.endswith("/complete"):
+                upload = store.uploads[self.path.split("/")[3]]
+                numbers = [p["part_number"] for p in data["parts"]]
+                if numbers != sorted(upload["parts"]):
+                    return self.reply(400, {"error": {"message": "missing parts"}})
+                digest = hashlib.sha256()
+                for n in numbers:
+                    digest.update(upload["parts"][n])
+                meta = upload["meta"]
+                if digest.hexdigest() != meta["sha256"]:
+                    return self.reply(400, {"error": {"message": "file checksum mismatch"}})
+                upload["url"] = f"regraph://uploads/{meta['upload_id']}"
+                return self.reply(200, {
+                    "upload_id": meta["upload_id"],
+                    "url": upload["url"],
+                    "filename": meta["filename"],
+                    "size_bytes": meta["size_bytes"],
+                    "sha256": meta["sha256"],
+                    "purpose": meta["purpose"],
+                })
+            # Training jobs and deployments accept only references to completed uploads.
+            reference = data.get("dataset") or data.get("weights_url")
+            if not any(u["url"] == reference for u in store.uploads.values()):
+                return self.reply(400, {"error": {"message": f"unknown upload {reference}"}})
+            self.reply(201, {"job_id": "job_bench", "status": "queued", "dataset": reference})
+
+    return Handler
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=256, help="Size of the generated file")
+    parser.add_argument("--part-mb", type=int, default=8, help="Part size")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parts in flight")
+    parser.add_argument("--fail-every", type=int, default=25, help="Fail every Nth part PUT with a 503")
+    args = parser.parse_args()
+
+    store = _Store(args.fail_every)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(store))
+    server.daemon_threads = True
+    server.handle_error = lambda request, address: None  # Cancelled PUTs drop their connection
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = ReGraph(api_key="bench", base_url=f"http://127.0.0.1:{server.server_address[1]}/v1")
+
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "dataset.jsonl")
+    with open(path, "wb") as f:
+        for _ in range(args.size_mb):
+            f.write(os.urandom(1024 * 1024))
+    part_size = args.part_mb * 1024 * 1024
+    parts_total = -(-args.size_mb // args.part_mb)
+
+    # First attempt: cancelled once half of the parts are in.
+    token = CancellationToken()
+
+    def cancel_halfway(p):
+        if p.parts_done >= parts_total // 2:
+            token.cancel()
+
+    start = time.perf_counter()
+    try:
+        client.files.upload(path, part_size=part_size, concurrency=args.concurrency,
+                            progress=cancel_halfway, cancel_token=token)
+        print("FAIL: upload was not interrupted")
+        return 1
+    except RequestCancelledError:
+        pass
+    stored_before_resume = store.parts_stored
+
+    resumed = []
+    reference = client.files.upload(path, part_size=part_size, concurrency=args.concurrency,
+                                    progress=lambda p: resumed.append(p))
+    elapsed = time.perf_counter() - start
+    # No progress is reported when every part was already in before the cancel.
+    retries = resumed[-1].retries if resumed else 0
+    stored_after_resume = store.parts_stored - stored_before_resume
+
+    job = client.training.jobs.create(model="llama-3-8b", dataset=reference.url)
+    deployment = client.models.deploy("bench-adapter", "llama-3-8b", weights_url=reference.url)
+
+    print(f"uploaded:              {args.size_mb} MiB in {elapsed:.2f} s ({args.size_mb / elapsed:,.0f} MiB/s)")
+    print(f"parts:                 {parts_total} ({stored_before_resume} stored before resume, {stored_after_resume} after)")
+    print(f"injected failures:     {store.failures} (retried: {retries} in resumed run)")
+    print(f"reference:             {reference.url} ({reference.size_bytes:,} bytes)")
+    print(f"training job dataset:  {job.dataset}")
+    print(f"deployment:            {deployment.get('status')}")
+    client.close()
+
+    failed = False
+    if store.parts_stored != parts_total:
+        print("FAIL: parts were sent more than once")
+        failed = True
+    if os.path.exists(path + ".upload.json"):
+        print("FAIL: manifest left behind")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,20 +4,50 @@ ReGraph Python SDK - Decentralized AI Compute Marketplace
 OpenAI-compatible client for accessing 50+ AI models at up to 80% lower cost.
 """
 
-from .client import ReGraph, ReGraphError, RateLimitError, AuthenticationError
-from .models import (
-    ChatCompletion,
-    ChatMessage,
-    Embedding,
-    ImageGeneration,
-    AudioSpeech,
-    TrainingJob,
-    BatchJob,
-    Model,
-    UsageStats,
-    Device,
-    PlatformStatus,
-)
+import importlib
+from typing import Any, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .client import ReGraph
+    from .errors import (
+        ReGraphError,
+        RateLimitError,
+        AuthenticationError,
+        RequestShedError,
+        RequestTimeoutError,
+        RequestCancelledError,
+        CassetteMissError,
+    )
+    from .analytics import UsageStore
+    from .batches import BatchOrchestrator
+    from .cassette import Cassette
+    from .journal import RequestJournal
+    from .limiter import AdaptiveLimiter
+    from .messages import MessageHistory
+    from .planner import CapacityPlanner, Workload
+    from .profiling import Profiler
+    from .scheduler import PriorityClass, RequestScheduler
+    from .semantic_cache import SemanticCache
+    from .telemetry import TelemetryAgent
+    from .timeouts import CancellationToken, Timeout
+    from .training import TrainingJobEvent
+    from .transport import HTTP2Transport, HTTPTransport, MockTransport, Transport
+    from .vectors import VectorIndex
+    from .models import (
+        ChatCompletion,
+        ChatMessage,
+        Embedding,
+        ImageGeneration,
+        AudioSpeech,
+        TrainingJob,
+        TrainingArtifact,
+        UploadedFile,
+        BatchJob,
+        Model,
+        UsageStats,
+        Device,
+        PlatformStatus,
+    )
 
 __version__ = "1.0.0"
 __all__ = [
@@ -25,15 +55,102 @@ __all__ = [
     "ReGraphError",
     "RateLimitError", 
     "AuthenticationError",
+    "RequestShedError",
+    "RequestTimeoutError",
+    "RequestCancelledError",
+    "CassetteMissError",
+    "Timeout",
+    "CancellationToken",
+    "RequestJournal",
+    "AdaptiveLimiter",
+    "MessageHistory",
+    "CapacityPlanner",
+    "Workload",
+    "Profiler",
+    "RequestScheduler",
+    "PriorityClass",
+    "UsageStore",
+    "BatchOrchestrator",
+    "SemanticCache",
+    "TelemetryAgent",
+    "VectorIndex",
+    "Transport",
+    "HTTPTransport",
+    "HTTP2Transport",
+    "MockTransport",
+    "Cassette",
     "ChatCompletion",
     "ChatMessage",
     "Embedding",
     "ImageGeneration",
     "AudioSpeech",
     "TrainingJob",
+    "TrainingArtifact",
+    "TrainingJobEvent",
+    "UploadedFile",
     "BatchJob",
     "Model",
     "UsageStats",
     "Device",
     "PlatformStatus",
 ]
+
+# Public names are imported from their submodules on first access (PEP 562),
+# so `import regraph` stays fast for short-lived processes.
+_LAZY_ATTRIBUTES = {
+    "ReGraph": ".client",
+    "ReGraphError": ".errors",
+    "RateLimitError": ".errors",
+    "AuthenticationError": ".errors",
+    "RequestShedError": ".errors",
+    "RequestTimeoutError": ".errors",
+    "RequestCancelledError": ".errors",
+    "CassetteMissError": ".errors",
+    "Timeout": ".timeouts",
+    "CancellationToken": ".timeouts",
+    "RequestJournal": ".journal",
+    "AdaptiveLimiter": ".limiter",
+    "MessageHistory": ".messages",
+    "CapacityPlanner": ".planner",
+    "Workload": ".planner",
+    "Profiler": ".profiling",
+    "RequestScheduler": ".scheduler",
+    "PriorityClass": ".scheduler",
+    "UsageStore": ".analytics",
+    "BatchOrchestrator": ".batches",
+    "SemanticCache": ".semantic_cache",
+    "TelemetryAgent": ".telemetry",
+    "VectorIndex": ".vectors",
+    "Transport": ".transport",
+    "HTTPTransport": ".transport",
+    "HTTP2Transport": ".transport",
+    "MockTransport": ".transport",
+    "Cassette": ".cassette",
+    "ChatCompletion": ".models",
+    "ChatMessage": ".models",
+    "Embedding": ".models",
+    "ImageGeneration": ".models",
+    "AudioSpeech": ".models",
+    "TrainingJob": ".models",
+    "TrainingArtifact": ".models",
+    "TrainingJobEvent": ".training",
+    "UploadedFile": ".models",
+    "BatchJob": ".models",
+    "Model": ".models",
+    "UsageStats": ".models",
+    "Device": ".models",
+    "PlatformStatus": ".models",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,9 @@
+"""
+ReGraph SDK - ``python -m regraph`` entry point
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,614 @@
+"""
+ReGraph SDK - HTTP/2 Connection Pool
+
+Multiplexes concurrent requests as streams over a few HTTP/2 connections,
+built on the ``h2`` protocol library (``pip install regraph[http2]``).
+
+Each connection has a reader thread that feeds incoming frames to ``h2`` and
+hands events to the waiting streams; request threads write under the
+connection lock. Stream concurrency follows the server's
+SETTINGS_MAX_CONCURRENT_STREAMS and request bodies are sent only as far as the
+peer's flow-control windows allow.
+"""
+
+import socket
+import ssl
+import threading
+import time
+import urllib.parse
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .errors import RequestCancelledError, RequestTimeoutError
+from .timeouts import CancellationToken, Timeout
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.errors
+    import h2.events
+    import h2.exceptions
+    import h2.settings
+except ImportError:  # pragma: no cover - exercised only without h2
+    h2 = None
+
+# Connection-specific headers are not allowed in HTTP/2.
+_HOP_BY_HOP_HEADERS = {"connection", "host", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"}
+
+
+class H2NotNegotiated(Exception):
+    """Raised when a TLS server does not offer HTTP/2 via ALPN."""
+
+
+class _Refused(ConnectionError):
+    """The server will not process a stream (GOAWAY or REFUSED_STREAM); safe to retry."""
+
+
+class _Stream:
+    __slots__ = ("id", "cond", "status", "headers", "chunks", "ended", "error", "streaming")
+
+    def __init__(self, stream_id: int, cond: threading.Condition, streaming: bool):
+        self.id = stream_id
+        self.cond = cond
+        self.status: Optional[int] = None
+        self.headers: Dict[str, str] = {}
+        self.chunks: List[Tuple[bytes, int]] = []  # (data, flow-controlled length)
+        self.ended = False
+        self.error: Optional[BaseException] = None
+        self.streaming = streaming
+
+
+def _wait(cond: threading.Condition, read: Optional[float], deadline: Optional[float]) -> None:
+    """Wait on a condition for at most the read timeout, capped by the deadline."""
+    limit = read
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise RequestTimeoutError("Request deadline exceeded")
+        limit = remaining if limit is None else min(limit, remaining)
+    if not cond.wait(limit):
+        raise RequestTimeoutError("Request timed out")
+
+
+class H2Connection:
+    """One HTTP/2 connection carrying many concurrent streams."""
+
+    def __init__(
+        self,
+        scheme: str,
+        host: str,
+        port: int,
+        timeout: Timeout,
+        window_size: int,
+        ssl_context: Optional[ssl.SSLContext],
+        deadline: Optional[float],
+    ):
+        connect_timeout = timeout.connect
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RequestTimeoutError("Request deadline exceeded")
+            connect_timeout = remaining if connect_timeout is None else min(connect_timeout, remaining)
+
+        sock = socket.create_connection((host, port), timeout=connect_timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if scheme == "https":
+            context = ssl_context or ssl.create_default_context()
+            context.set_alpn_protocols(["h2", "http/1.1"])
+            sock = context.wrap_socket(sock, server_hostname=host)
+            if sock.selected_alpn_protocol() != "h2":
+                sock.close()
+                raise H2NotNegotiated(f"{host} did not negotiate HTTP/2")
+        sock.settimeout(None)
+
+        self._sock = sock
+        self._lock = threading.Lock()
+        self._window_cond = threading.Condition(self._lock)
+        self._streams: Dict[int, _Stream] = {}
+        self._h2 = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=True, header_encoding="utf-8")
+        )
+        self._h2.local_settings = h2.settings.Settings(
+            client=True,
+            initial_values={
+                h2.settings.SettingCodes.ENABLE_PUSH: 0,
+                h2.settings.SettingCodes.INITIAL_WINDOW_SIZE: window_size,
+            },
+        )
+        self._h2.initiate_connection()
+        self._h2.increment_flow_control_window(max(0, window_size - 65535))
+
+        self.scheme = scheme
+        self.authority = host if port in (80, 443) else f"{host}:{port}"
+        self.active = 0  # Streams checked out by the pool (guarded by the pool's lock)
+        self.closed = False
+        self.streams_opened = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.flow_control_waits = 0
+        self.resets = 0
+        self.goaway = False
+        self.settings_received = False  # Until the server's SETTINGS arrive its stream limit is unknown
+        self.on_settings_changed: Optional[Any] = None
+
+        with self._lock:
+            self._flush()
+        self._reader = threading.Thread(target=self._read_loop, name="regraph-h2-reader", daemon=True)
+        self._reader.start()
+
+    @property
+    def max_concurrent_streams(self) -> int:
+        return self._h2.remote_settings.max_concurrent_streams
+
+    # ---------- I/O ----------
+
+    def _flush(self) -> None:
+        data = self._h2.data_to_send()
+        if data:
+            self._sock.sendall(data)
+            self.bytes_sent += len(data)
+
+    def _read_loop(self) -> None:
+        try:
+            while True:
+                data = self._sock.recv(65536)
+                if not data:
+                    raise ConnectionResetError("HTTP/2 connection closed by server")
+                settings_changed = False
+                with self._lock:
+                    self.bytes_received += len(data)
+                    for event in self._h2.receive_data(data):
+                        settings_changed |= self._handle(event)
+                    self._flush()
+                if settings_changed and self.on_settings_changed is not None:
+                    self.on_settings_changed()
+        except (OSError, h2.exceptions.ProtocolError) as e:
+            with self._lock:
+                self._fail(e if isinstance(e, OSError) else ConnectionError(f"HTTP/2 protocol error: {e}"))
+            if self.on_settings_changed is not None:
+                self.on_settings_changed()
+
+    def _handle(self, event: Any) -> bool:
+        """Apply one h2 event; returns True if the stream limit may have changed."""
+        stream = self._streams.get(getattr(event, "stream_id", 0) or 0)
+        if isinstance(event, h2.events.ResponseReceived) and stream is not None:
+            stream.headers = dict(event.headers)
+            stream.status = int(stream.headers.get(":status", 0))
+            stream.cond.notify()
+        elif isinstance(event, h2.events.DataReceived):
+            if stream is not None:
+                stream.chunks.append((event.data, event.flow_controlled_length))
+                stream.cond.notify()
+            if stream is None or not stream.streaming:
+                # Buffered responses are consumed as they arrive; streamed ones
+                # are acknowledged when the caller reads them.
+                self._h2.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+        elif isinstance(event, h2.events.StreamEnded) and stream is not None:
+            stream.ended = True
+            stream.cond.notify()
+        elif isinstance(event, h2.events.StreamReset) and stream is not None:
+            self.resets += 1
+            if event.error_code == h2.errors.ErrorCodes.REFUSED_STREAM:
+                stream.error = _Refused("HTTP/2 stream refused by server")
+            else:
+                stream.error = ConnectionResetError(f"HTTP/2 stream reset by server ({event.error_code!r})")
+            stream.cond.notify()
+        elif isinstance(event, h2.events.WindowUpdated):
+            self._window_cond.notify_all()
+        elif isinstance(event, h2.events.RemoteSettingsChanged):
+            self.settings_received = True
+            self._window_cond.notify_all()
+            return True
+        elif isinstance(event, h2.events.ConnectionTerminated):
+            self.goaway = True
+            self.closed = True
+            last = event.last_stream_id if event.last_stream_id is not None else 0
+            for sid, s in self._streams.items():
+                if sid > last and s.error is None:
+                    s.error = _Refused("HTTP/2 connection is going away")
+                    s.cond.notify()
+            return True
+        return False
+
+    def _fail(self, error: BaseException) -> None:
+        self.closed = True
+        for stream in self._streams.values():
+            if stream.error is None and not stream.ended:
+                stream.error = error
+                stream.cond.notify()
+        self._window_cond.notify_all()
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+    # ---------- Streams ----------
+
+    def _cancel_stream(self, stream: _Stream, error: BaseException) -> None:
+        """Reset a stream we no longer want (called with the lock held)."""
+        if stream.error is None:
+            stream.error = error
+        stream.cond.notify()
+        if not stream.ended and not self.closed:
+            try:
+                self._h2.reset_stream(stream.id, h2.errors.ErrorCodes.CANCEL)
+                self._flush()
+            except (OSError, h2.exceptions.ProtocolError):
+                pass
+
+    def open_stream(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+        timeout: Timeout,
+        deadline: Optional[float],
+        streaming: bool,
+        holder: List[Optional[_Stream]],
+    ) -> _Stream:
+        """
+        Send a request on a new stream and wait for the response headers.
+
+        The stream is published in ``holder`` as soon as it exists, so a
+        cancellation callback can reset it while this thread is waiting.
+        """
+        request_headers = [
+            (":method", method),
+            (":scheme", self.scheme),
+            (":authority", self.authority),
+            (":path", path),
+        ]
+        request_headers += [(k.lower(), v) for k, v in headers.items() if k.lower() not in _HOP_BY_HOP_HEADERS]
+        if body:
+            request_headers.append(("content-length", str(len(body))))
+
+        with self._lock:
+            if self.closed:
+                raise _Refused("HTTP/2 connection is closed")
+            try:
+                stream_id = self._h2.get_next_available_stream_id()
+                self._h2.send_headers(stream_id, request_headers, end_stream=not body)
+            except h2.exceptions.TooManyStreamsError:
+                # The server lowered its stream limit; nothing was sent, so retry elsewhere.
+                raise _Refused("HTTP/2 stream limit reached") from None
+            except h2.exceptions.ProtocolError as e:
+                raise ConnectionError(f"HTTP/2 protocol error: {e}") from None
+            stream = _Stream(stream_id, threading.Condition(self._lock), streaming)
+            self._streams[stream.id] = stream
+            holder[0] = stream
+            self.streams_opened += 1
+            self._flush()
+
+            # Send the body as the stream and connection windows allow.
+            offset = 0
+            while body and offset < len(body):
+                if stream.error is not None:
+                    raise stream.error
+                window = self._h2.local_flow_control_window(stream.id)
+                if window <= 0:
+                    self.flow_control_waits += 1
+                    _wait(self._window_cond, timeout.read, deadline)
+                    continue
+                size = min(window, self._h2.max_outbound_frame_size, len(body) - offset)
+                try:
+                    self._h2.send_data(stream.id, body[offset : offset + size], end_stream=offset + size == len(body))
+                except h2.exceptions.ProtocolError as e:
+                    raise stream.error or ConnectionError(f"HTTP/2 protocol error: {e}") from None
+                self._flush()
+                offset += size
+
+            while stream.status is None and stream.error is None:
+                _wait(stream.cond, timeout.read, deadline)
+            if stream.error is not None:
+                raise stream.error
+        return stream
+
+    def read_chunks(self, stream: _Stream, timeout: Timeout, deadline: Optional[float]) -> Iterator[bytes]:
+        """Yield response body chunks as they arrive."""
+        while True:
+            with self._lock:
+                while not stream.chunks and not stream.ended and stream.error is None:
+                    _wait(stream.cond, timeout.read, deadline)
+                if stream.chunks:
+                    chunks, stream.chunks = stream.chunks, []
+                elif stream.error is not None:
+                    raise stream.error
+                else:
+                    return
+                if stream.streaming and not self.closed:
+                    acknowledged = sum(length for _, length in chunks)
+                    self._h2.acknowledge_received_data(acknowledged, stream.id)
+                    self._flush()
+            for data, _ in chunks:
+                if data:
+                    yield data
+
+    def finish_stream(self, stream: _Stream, error: Optional[BaseException] = None) -> None:
+        """Forget a stream, resetting it first if it has not completed."""
+        with self._lock:
+            if error is not None or not stream.ended:
+                self._cancel_stream(stream, error or RequestCancelledError("Request was cancelled"))
+            self._streams.pop(stream.id, None)
+            # Unread data of a streamed response still holds connection window;
+            # give it back, or every abandoned stream shrinks it for good.
+            unread = sum(length for _, length in stream.chunks)
+            stream.chunks = []
+            if unread and stream.streaming and not self.closed:
+                try:
+                    self._h2.acknowledge_received_data(unread, stream.id)
+                    self._flush()
+                except (OSError, h2.exceptions.ProtocolError):
+                    pass
+
+    def cancel(self, stream_holder: List[Optional[_Stream]]) -> None:
+        """Cancellation callback: abort the stream currently held, if any."""
+        with self._lock:
+            stream = stream_holder[0]
+            if stream is not None:
+                self._cancel_stream(stream, RequestCancelledError("Request was cancelled"))
+            else:
+                # Cancelled before the stream was opened; wake the request thread.
+                self._window_cond.notify_all()
+
+    def close(self) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            try:
+                self._h2.close_connection()
+                self._flush()
+            except (OSError, h2.exceptions.ProtocolError):
+                pass
+            self._fail(ConnectionResetError("HTTP/2 connection closed"))
+
+
+class H2ConnectionPool:
+    """
+    Spreads concurrent requests over up to ``max_connections`` HTTP/2 connections.
+
+    A new connection is opened only when every existing one is carrying as many
+    streams as its server allows (or ``max_streams_per_connection``). A
+    connection carries a single stream until the server's SETTINGS arrive.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int = 2,
+        max_streams_per_connection: int = 256,
+        timeout: Optional[Timeout] = None,
+        window_size: int = 4 * 1024 * 1024,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        if h2 is None:
+            raise ImportError("HTTP/2 support requires the h2 package: pip install regraph[http2]")
+        parsed = urllib.parse.urlsplit(base_url)
+        if parsed.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {parsed.scheme!r}")
+
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname or ""
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.base_path = parsed.path.rstrip("/")
+        self.max_connections = max_connections
+        self.max_streams_per_connection = max_streams_per_connection
+        self.timeout = timeout or Timeout()
+        self.window_size = window_size
+        self.ssl_context = ssl_context
+
+        self._connections: List[H2Connection] = []
+        self._connecting = 0
+        self._cond = threading.Condition()
+        self._connections_opened = 0
+        self._streams_retired = 0
+        self._peak_active = 0
+        self._slot_waits = 0
+
+    # ---------- Connection management ----------
+
+    def _limit(self, conn: H2Connection) -> int:
+        if not conn.settings_received:
+            # h2 assumes no limit until the server's first SETTINGS frame, which
+            # would let a burst open more streams than the server then allows.
+            return 1
+        return min(self.max_streams_per_connection, conn.max_concurrent_streams)
+
+    def _wake(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+    def _retire(self, conn: H2Connection) -> None:
+        """Drop a closed connection from the pool (called with the pool lock held)."""
+        if conn in self._connections:
+            self._connections.remove(conn)
+            self._streams_retired += conn.streams_opened
+
+    def _acquire(
+        self, timeout: Timeout, deadline: Optional[float], cancel: Optional[CancellationToken]
+    ) -> H2Connection:
+        with self._cond:
+            while True:
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+                for conn in list(self._connections):
+                    if conn.closed:
+                        self._retire(conn)
+                candidates = [c for c in self._connections if c.active < self._limit(c)]
+                if candidates:
+                    conn = min(candidates, key=lambda c: c.active)
+                    conn.active += 1
+                    self._peak_active = max(self._peak_active, sum(c.active for c in self._connections))
+                    return conn
+                if len(self._connections) + self._connecting < self.max_connections:
+                    self._connecting += 1
+                    break
+                self._slot_waits += 1
+                _wait(self._cond, None, deadline)
+
+        try:
+            conn = H2Connection(
+                self.scheme, self.host, self.port, timeout, self.window_size, self.ssl_context, deadline
+            )
+        except socket.timeout:
+            raise RequestTimeoutError("Request timed out") from None
+        finally:
+            with self._cond:
+                self._connecting -= 1
+                self._cond.notify_all()
+        conn.on_settings_changed = self._wake
+        with self._cond:
+            self._connections.append(conn)
+            self._connections_opened += 1
+            conn.active += 1
+            self._cond.notify_all()  # SETTINGS may have arrived before on_settings_changed was set
+            self._peak_active = max(self._peak_active, sum(c.active for c in self._connections))
+        return conn
+
+    def _release(self, conn: H2Connection) -> None:
+        with self._cond:
+            conn.active -= 1
+            if conn.closed and conn.active == 0:
+                self._retire(conn)
+            self._cond.notify()
+
+    # ---------- Requests ----------
+
+    def stream(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Timeout] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional[CancellationToken] = None,
+        buffered: bool = False,
+    ) -> Tuple[int, Iterator[bytes]]:
+        """
+        Send a request and return its status and an iterator over body chunks.
+
+        A stream refused by the server (GOAWAY or REFUSED_STREAM) was never
+        processed, so it is retried once on another connection.
+        """
+        timeout = timeout or self.timeout
+        url = f"{self.base_path}{path}"
+        for attempt in (0, 1):
+            wake = cancel.register(self._wake) if cancel is not None else None
+            try:
+                conn = self._acquire(timeout, deadline, cancel)
+            finally:
+                if wake is not None:
+                    cancel.unregister(wake)
+            holder: List[Optional[_Stream]] = [None]
+            handle = cancel.register(lambda: conn.cancel(holder)) if cancel is not None else None
+            try:
+                stream = conn.open_stream(
+                    method, url, body, headers or {}, timeout, deadline, not buffered, holder
+                )
+                if cancel is not None and cancel.cancelled:
+                    raise RequestCancelledError("Request was cancelled")
+            except _Refused:
+                self._finish(conn, holder, handle, cancel, None)
+                if attempt:
+                    raise
+                continue
+            except BaseException as e:
+                self._finish(conn, holder, handle, cancel, e)
+                raise
+            return stream.status or 0, self._body(conn, stream, holder, handle, timeout, deadline, cancel)
+        raise AssertionError("unreachable")
+
+    def _body(
+        self,
+        conn: H2Connection,
+        stream: _Stream,
+        holder: List[Optional[_Stream]],
+        handle: Optional[int],
+        timeout: Timeout,
+        deadline: Optional[float],
+        cancel: Optional[CancellationToken],
+    ) -> Iterator[bytes]:
+        error: Optional[BaseException] = None
+        try:
+            yield from conn.read_chunks(stream, timeout, deadline)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._finish(conn, holder, handle, cancel, error)
+
+    def _finish(
+        self,
+        conn: H2Connection,
+        holder: List[Optional[_Stream]],
+        handle: Optional[int],
+        cancel: Optional[CancellationToken],
+        error: Optional[BaseException],
+    ) -> None:
+        if handle is not None:
+            cancel.unregister(handle)
+        if holder[0] is not None:
+            conn.finish_stream(holder[0], error)
+        self._release(conn)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Timeout] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional[CancellationToken] = None,
+    ) -> Tuple[int, bytes]:
+        """Send a request and read the full response; see ConnectionPool.request."""
+        status, chunks = self.stream(method, path, body, headers, timeout, deadline, cancel, buffered=True)
+        return status, b"".join(chunks)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot connection-level statistics.
+
+        Returns:
+            Dict with open connections, active streams, peak concurrent streams,
+            streams opened, bytes sent/received, flow-control and slot waits,
+            stream resets and GOAWAYs, plus per-connection details
+        """
+        with self._cond:
+            connections = list(self._connections)
+            retired = self._streams_retired
+            opened = self._connections_opened
+            peak = self._peak_active
+            slot_waits = self._slot_waits
+        per_connection = [
+            {
+                "active_streams": c.active,
+                "max_concurrent_streams": self._limit(c),
+                "streams_opened": c.streams_opened,
+                "bytes_sent": c.bytes_sent,
+                "bytes_received": c.bytes_received,
+                "flow_control_waits": c.flow_control_waits,
+                "resets": c.resets,
+                "goaway": c.goaway,
+            }
+            for c in connections
+        ]
+        return {
+            "connections": len(connections),
+            "connections_opened": opened,
+            "active_streams": sum(c["active_streams"] for c in per_connection),
+            "peak_active_streams": peak,
+            "streams_opened": retired + sum(c["streams_opened"] for c in per_connection),
+            "bytes_sent": sum(c["bytes_sent"] for c in per_connection),
+            "bytes_received": sum(c["bytes_received"] for c in per_connection),
+            "flow_control_waits": sum(c["flow_control_waits"] for c in per_connection),
+            "slot_waits": slot_waits,
+            "per_connection": per_connection,
+        }
+
+    def close(self) -> None:
+        """Close all connections."""
+        with self._cond:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
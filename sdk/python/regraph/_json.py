@@ -0,0 +1,32 @@
+"""
+ReGraph SDK - JSON Encoding
+
+Request bodies and responses are encoded with orjson when it is installed
+(``pip install regraph[speedups]``) and with the standard library otherwise.
+Both produce compact UTF-8 JSON, so bodies are interchangeable.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass  # Integers beyond 64 bits, lone surrogates: the standard library copes
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,335 @@
+"""
+ReGraph SDK - HTTP Connection Pool
+
+Keep-alive connection reuse for the ReGraph client, built on http.client.
+"""
+
+import http.client
+import socket
+import threading
+import time
+import urllib.parse
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .errors import RequestCancelledError, RequestTimeoutError
+from .profiling import _Timeline, current as current_timeline
+from .timeouts import CancellationToken, Timeout
+
+
+# Errors that mean a reused keep-alive connection was closed by the server
+# before it saw our request; those are safe to retry once on a new socket.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of persistent HTTP(S) connections to a single host.
+
+    Connections are checked out for the duration of one request and returned
+    afterwards, so at most ``maxsize`` idle sockets are kept open. Requests
+    beyond that still succeed; their connections are simply closed when done.
+    """
+
+    def __init__(self, base_url: str, maxsize: int = 10, timeout: Optional[Timeout] = None):
+        parsed = urllib.parse.urlsplit(base_url)
+        if parsed.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {parsed.scheme!r}")
+
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname or ""
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip("/")
+        self.maxsize = maxsize
+        self.timeout = timeout or Timeout()
+
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port)
+        return http.client.HTTPConnection(self.host, self.port)
+
+    def _checkout(self) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._new_connection(), False
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Timeout] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional[CancellationToken] = None,
+    ) -> Tuple[int, bytes]:
+        """
+        Send a request and read the full response.
+
+        Args:
+            method: HTTP method
+            path: Request path relative to the pool's base URL, including query
+            body: Encoded request body
+            headers: Request headers
+            timeout: Connect/read limits (default: the pool's timeout)
+            deadline: Absolute time.monotonic() time the response must be read by
+            cancel: Token whose cancellation aborts the connection
+
+        Returns:
+            Tuple of (status code, response body)
+
+        Raises:
+            RequestTimeoutError: If a timeout or the deadline is exceeded
+            RequestCancelledError: If the token is cancelled
+            OSError: On connection failures
+            http.client.HTTPException: On malformed responses
+        """
+        timeout = timeout or self.timeout
+        url = f"{self.base_path}{path}"
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+
+        conn, reused = self._checkout()
+        # The socket in use, so another thread can abort it on cancellation.
+        current: List[Optional[socket.socket]] = [None]
+        handle = cancel.register(lambda: _abort(current[0])) if cancel is not None else None
+        try:
+            try:
+                status, payload, keep = self._exchange(
+                    conn, method, url, body, headers, timeout, deadline, cancel, current
+                )
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not reused or (cancel is not None and cancel.cancelled):
+                    raise
+                conn = self._new_connection()
+                status, payload, keep = self._exchange(
+                    conn, method, url, body, headers, timeout, deadline, cancel, current
+                )
+        except BaseException as e:
+            conn.close()
+            failure = _failure(e, cancel)
+            if failure is e:
+                raise
+            raise failure from None
+        finally:
+            if handle is not None:
+                cancel.unregister(handle)
+
+        if cancel is not None and cancel.cancelled:
+            conn.close()
+            raise RequestCancelledError("Request was cancelled")
+        if keep:
+            self._checkin(conn)
+        else:
+            conn.close()
+        return status, payload
+
+    def stream(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Timeout] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional[CancellationToken] = None,
+    ) -> Tuple[int, Iterator[bytes]]:
+        """
+        Send a request and return its status and an iterator over body chunks.
+
+        The connection stays checked out, and cancellable, until the body has
+        been read or the iterator is closed; close it when stopping early.
+        Arguments and errors are as for request().
+        """
+        timeout = timeout or self.timeout
+        url = f"{self.base_path}{path}"
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+
+        conn, reused = self._checkout()
+        current: List[Optional[socket.socket]] = [None]
+        handle = cancel.register(lambda: _abort(current[0])) if cancel is not None else None
+        try:
+            try:
+                response = self._open(conn, method, url, body, headers, timeout, deadline, cancel, current)
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not reused or (cancel is not None and cancel.cancelled):
+                    raise
+                conn = self._new_connection()
+                response = self._open(conn, method, url, body, headers, timeout, deadline, cancel, current)
+            if cancel is not None and cancel.cancelled:
+                raise RequestCancelledError("Request was cancelled")
+        except BaseException as e:
+            conn.close()
+            if handle is not None:
+                cancel.unregister(handle)
+            failure = _failure(e, cancel)
+            if failure is e:
+                raise
+            raise failure from None
+        return response.status, self._body(conn, response, current[0], handle, timeout, deadline, cancel)
+
+    def _body(
+        self,
+        conn: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+        sock: socket.socket,
+        handle: Optional[int],
+        timeout: Timeout,
+        deadline: Optional[float],
+        cancel: Optional[CancellationToken],
+    ) -> Iterator[bytes]:
+        finished = False
+        try:
+            yield from _read(response, sock, timeout, deadline)
+            # An aborted socket can read as a clean end of the body.
+            if cancel is not None and cancel.cancelled:
+                raise RequestCancelledError("Request was cancelled")
+            finished = True
+        except BaseException as e:
+            failure = _failure(e, cancel)
+            if failure is e:
+                raise
+            raise failure from None
+        finally:
+            if handle is not None:
+                cancel.unregister(handle)
+            if finished and not response.will_close and not (cancel is not None and cancel.cancelled):
+                self._checkin(conn)
+            else:
+                # Stopped early: the rest of the body is still on the socket.
+                response.close()
+                conn.close()
+
+    def _open(
+        self,
+        conn: http.client.HTTPConnection,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Optional[Dict[str, str]],
+        timeout: Timeout,
+        deadline: Optional[float],
+        cancel: Optional[CancellationToken],
+        current: List[Optional[socket.socket]],
+    ) -> http.client.HTTPResponse:
+        """Send a request and read the response headers."""
+        profile = current_timeline()
+        if conn.sock is None:
+            conn.timeout = _limit(timeout.connect, deadline)
+            _connect(conn, profile)
+        sock = current[0] = conn.sock
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        sock.settimeout(_limit(timeout.read, deadline))
+        conn.request(method, url, body=body, headers=headers or {})
+        if profile is not None:
+            profile.lap("upload")
+        response = conn.getresponse()
+        if profile is not None:
+            profile.lap("wait")
+        return response
+
+    def _exchange(
+        self,
+        conn: http.client.HTTPConnection,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Optional[Dict[str, str]],
+        timeout: Timeout,
+        deadline: Optional[float],
+        cancel: Optional[CancellationToken],
+        current: List[Optional[socket.socket]],
+    ) -> Tuple[int, bytes, bool]:
+        response = self._open(conn, method, url, body, headers, timeout, deadline, cancel, current)
+        payload = b"".join(_read(response, current[0], timeout, deadline))
+        profile = current_timeline()
+        if profile is not None:
+            profile.lap("download")
+        return response.status, payload, not response.will_close
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+def _connect(conn: http.client.HTTPConnection, profile: Optional[_Timeline]) -> None:
+    """Open a connection, timing the TCP connect and TLS handshake separately when profiling."""
+    if profile is None:
+        conn.connect()
+        return
+    if isinstance(conn, http.client.HTTPSConnection) and not conn._tunnel_host:
+        # What HTTPSConnection.connect() does, split so each step gets its own phase.
+        http.client.HTTPConnection.connect(conn)
+        profile.lap("connect")
+        conn.sock = conn._context.wrap_socket(conn.sock, server_hostname=conn.host)
+        profile.lap("tls")
+        return
+    conn.connect()
+    profile.lap("connect")
+
+
+def _limit(limit: Optional[float], deadline: Optional[float]) -> Optional[float]:
+    """Return the socket timeout for one operation, capped by the time left to the deadline."""
+    if deadline is None:
+        return limit
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise RequestTimeoutError("Request deadline exceeded")
+    return remaining if limit is None else min(limit, remaining)
+
+
+def _read(
+    response: http.client.HTTPResponse, sock: socket.socket, timeout: Timeout, deadline: Optional[float]
+) -> Iterator[bytes]:
+    """Yield a response body one socket chunk at a time, then close the response."""
+    # A slowly trickling body is still bounded by the deadline, not just by
+    # the per-read timeout.
+    while True:
+        sock.settimeout(_limit(timeout.read, deadline))
+        chunk = response.read1(65536)
+        if not chunk:
+            break
+        yield chunk
+    # read1() does not mark the response finished; close it so the
+    # connection can send its next request.
+    response.close()
+
+
+def _failure(error: BaseException, cancel: Optional[CancellationToken]) -> BaseException:
+    """Return the error to raise for one that interrupted a request."""
+    if isinstance(error, socket.timeout):
+        return RequestTimeoutError("Request timed out")
+    if cancel is not None and cancel.cancelled and isinstance(error, (OSError, http.client.HTTPException)):
+        return RequestCancelledError("Request was cancelled")
+    return error
+
+
+def _abort(sock: Optional[socket.socket]) -> None:
+    """Interrupt any blocking I/O on a socket from another thread."""
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
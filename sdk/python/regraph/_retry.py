@@ -0,0 +1,25 @@
+"""
+ReGraph SDK - Retry Helpers
+
+Shared by the bulk helpers (corpus embedding, transfers) that retry individual
+pieces of a large job rather than failing the whole job.
+"""
+
+import random
+
+from .errors import ReGraphError, RateLimitError, RequestCancelledError, RequestShedError, RequestTimeoutError
+
+
+def retryable(error: ReGraphError) -> bool:
+    """Whether a failed call may succeed if sent again."""
+    if isinstance(error, (RequestCancelledError, RequestShedError)):
+        return False
+    if isinstance(error, (RateLimitError, RequestTimeoutError)):
+        return True
+    # No status code means the request never got a response (connection error).
+    return error.status_code is None or error.status_code >= 500
+
+
+def backoff(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Jittered exponential delay before retry number ``attempt`` (0-based)."""
+    return min(cap, base * 2 ** attempt) * (0.5 + random.random())
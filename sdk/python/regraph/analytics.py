@@ -0,0 +1,389 @@
+"""
+ReGraph SDK - Usage Analytics
+
+Local, incrementally synced store of usage history. Server-side daily totals
+from ``client.usage.get`` and per-request ``Usage`` recorded by the client are
+kept in compact array-backed columns, so dashboards can aggregate by day,
+model and cost without downloading history they already have.
+
+On disk a store is a directory holding one binary file per column plus a small
+``meta.json``; per-request columns are only ever appended to. Daily columns are
+rewritten as a new generation that ``meta.json`` switches to in one replace, so
+an interrupted save leaves the previous state intact.
+"""
+
+import json
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from .models import Usage, UsageDay
+
+if TYPE_CHECKING:
+    from .client import ReGraph
+
+
+# Column name -> array typecode
+_DAILY_COLUMNS = {"day": "l", "total_cost": "d", "total_tokens": "q", "request_count": "q"}
+_REQUEST_COLUMNS = {
+    "day": "l",
+    "timestamp": "d",
+    "model": "l",
+    "prompt_tokens": "q",
+    "completion_tokens": "q",
+    "cost": "d",
+}
+
+
+def _ordinal(value: str) -> int:
+    return date.fromisoformat(value).toordinal()
+
+
+def _isoformat(ordinal: int) -> str:
+    return date.fromordinal(ordinal).isoformat()
+
+
+class UsageStore:
+    """
+    Columnar store of daily usage and client-recorded per-request usage.
+
+    Example:
+        >>> store = UsageStore("usage-store")
+        >>> client = ReGraph(api_key="your-api-key", usage_store=store)
+        >>> store.sync(client)            # fetches only days since the last sync
+        >>> store.by_model("2025-01-01")  # aggregates locally recorded requests
+        >>> store.save()
+    """
+
+    def __init__(self, path: Optional[str] = None, prices: Optional[Dict[str, float]] = None):
+        """
+        Open (or create) a usage store.
+
+        Args:
+            path: Directory to persist the store in, or None to keep it in memory
+            prices: Price per 1K tokens by model, used to estimate the cost of
+                recorded requests
+        """
+        self.path = path
+        self.prices: Dict[str, float] = dict(prices or {})
+        self.watermark: Optional[str] = None
+        self._daily = {name: array(code) for name, code in _DAILY_COLUMNS.items()}
+        self._requests = {name: array(code) for name, code in _REQUEST_COLUMNS.items()}
+        self._models: List[str] = []
+        self._model_ids: Dict[str, int] = {}
+        self._saved_requests = 0
+        self._daily_generation: Optional[int] = None  # None: files from before generations were used
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(os.path.join(path, "meta.json")):
+            self._load()
+
+    # ---------- Persistence ----------
+
+    def _column_path(self, table: str, column: str, generation: Optional[int] = None) -> str:
+        assert self.path is not None
+        if generation is None:
+            return os.path.join(self.path, f"{table}.{column}.bin")
+        return os.path.join(self.path, f"{table}.{generation}.{column}.bin")
+
+    def _load(self) -> None:
+        assert self.path is not None
+        with open(os.path.join(self.path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.watermark = meta.get("watermark")
+        self._models = meta.get("models", [])
+        self._model_ids = {m: i for i, m in enumerate(self._models)}
+        self.prices = {**meta.get("prices", {}), **self.prices}
+        self._daily_generation = meta.get("daily_generation")
+
+        for table, columns, rows, generation in (
+            ("daily", self._daily, meta.get("daily_rows", 0), self._daily_generation),
+            ("requests", self._requests, meta.get("request_rows", 0), None),
+        ):
+            for name, column in columns.items():
+                with open(self._column_path(table, name, generation), "rb") as f:
+                    # Columns may hold a partial append from an interrupted save;
+                    # the row count in meta.json is authoritative.
+                    column.frombytes(f.read(rows * column.itemsize))
+        self._saved_requests = len(self._requests["day"])
+
+    def save(self) -> None:
+        """Persist the store to its directory."""
+        if self.path is None:
+            raise ValueError("UsageStore was created without a path")
+        os.makedirs(self.path, exist_ok=True)
+
+        with self._lock:
+            # An inserted day shifts every daily column, so they are written as a
+            # new generation that only becomes current when meta.json names it.
+            previous = self._daily_generation
+            generation = (previous or 0) + 1
+            for name, column in self._daily.items():
+                with open(self._column_path("daily", name, generation), "wb") as f:
+                    column.tofile(f)
+
+            start = self._saved_requests
+            rows = len(self._requests["day"])
+            for name, column in self._requests.items():
+                with open(self._column_path("requests", name), "r+b" if start else "wb") as f:
+                    f.seek(start * column.itemsize)
+                    f.truncate()
+                    column[start:rows].tofile(f)
+
+            meta = {
+                "watermark": self.watermark,
+                "models": self._models,
+                "prices": self.prices,
+                "daily_rows": len(self._daily["day"]),
+                "daily_generation": generation,
+                "request_rows": rows,
+            }
+            tmp_path = os.path.join(self.path, "meta.json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, os.path.join(self.path, "meta.json"))
+            self._saved_requests = rows
+            self._daily_generation = generation
+
+            for name in self._daily:
+                old_path = self._column_path("daily", name, previous)
+                if os.path.exists(old_path):
+                    os.remove(old_path)
+
+    # ---------- Ingestion ----------
+
+    def sync(
+        self,
+        client: "ReGraph",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> int:
+        """
+        Fetch daily usage newer than the watermark and merge it in.
+
+        The watermark day itself is fetched again, since it may have been
+        incomplete (e.g. "today") when it was last synced.
+
+        Args:
+            client: ReGraph client to fetch with
+            start_date: First day to fetch when the store is empty (YYYY-MM-DD)
+            end_date: Last day to fetch (default: today, UTC)
+
+        Returns:
+            Number of days merged
+        """
+        start = self.watermark or start_date
+        end = end_date or datetime.now(timezone.utc).date().isoformat()
+        stats = client.usage.get(start_date=start, end_date=end)
+        self.merge_days(stats.daily)
+        return len(stats.daily)
+
+    def merge_days(self, days: List[UsageDay]) -> None:
+        """
+        Insert or replace daily rows and advance the watermark.
+
+        Args:
+            days: UsageDay rows, in any order
+        """
+        with self._lock:
+            columns = self._daily
+            for day in days:
+                ordinal = _ordinal(day.date)
+                i = bisect_left(columns["day"], ordinal)
+                if i < len(columns["day"]) and columns["day"][i] == ordinal:
+                    columns["total_cost"][i] = day.total_cost
+                    columns["total_tokens"][i] = day.total_tokens
+                    columns["request_count"][i] = day.request_count
+                else:
+                    columns["day"].insert(i, ordinal)
+                    columns["total_cost"].insert(i, day.total_cost)
+                    columns["total_tokens"].insert(i, day.total_tokens)
+                    columns["request_count"].insert(i, day.request_count)
+            if columns["day"]:
+                self.watermark = _isoformat(columns["day"][-1])
+
+    def record(
+        self,
+        model: str,
+        usage: Usage,
+        cost: Optional[float] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Record the usage of one request made by this client.
+
+        Args:
+            model: Model ID the request ran on
+            usage: Token usage from the response
+            cost: Request cost in USD (default: estimated from ``prices``)
+            timestamp: Unix time of the request (default: now)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        if cost is None:
+            cost = usage.total_tokens / 1000 * self.prices.get(model, 0.0)
+        day = datetime.fromtimestamp(timestamp, timezone.utc).date().toordinal()
+
+        with self._lock:
+            model_id = self._model_ids.get(model)
+            if model_id is None:
+                model_id = self._model_ids[model] = len(self._models)
+                self._models.append(model)
+            columns = self._requests
+            columns["day"].append(day)
+            columns["timestamp"].append(timestamp)
+            columns["model"].append(model_id)
+            columns["prompt_tokens"].append(usage.prompt_tokens)
+            columns["completion_tokens"].append(usage.completion_tokens)
+            columns["cost"].append(cost)
+
+    # ---------- Aggregation ----------
+
+    def _day_slice(self, column: "array[int]", start: Optional[str], end: Optional[str]) -> slice:
+        lo = bisect_left(column, _ordinal(start)) if start else 0
+        hi = bisect_right(column, _ordinal(end)) if end else len(column)
+        return slice(lo, hi)
+
+    def _request_rows(self, start: Optional[str], end: Optional[str]) -> List[int]:
+        days = self._requests["day"]
+        if start is None and end is None:
+            return list(range(len(days)))
+        lo = _ordinal(start) if start else 0
+        hi = _ordinal(end) if end else date.max.toordinal()
+        return [i for i, d in enumerate(days) if lo <= d <= hi]
+
+    def daily(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[UsageDay]:
+        """
+        Return stored server-side daily usage.
+
+        Args:
+            start_date: First day (YYYY-MM-DD, inclusive)
+            end_date: Last day (YYYY-MM-DD, inclusive)
+
+        Returns:
+            UsageDay rows in date order
+        """
+        with self._lock:
+            c = self._daily
+            s = self._day_slice(c["day"], start_date, end_date)
+            return [
+                UsageDay(
+                    date=_isoformat(d),
+                    total_cost=cost,
+                    total_tokens=tokens,
+                    request_count=count,
+                )
+                for d, cost, tokens, count in zip(
+                    c["day"][s], c["total_cost"][s], c["total_tokens"][s], c["request_count"][s]
+                )
+            ]
+
+    def totals(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Sum server-side daily usage over a date range.
+
+        Returns:
+            Dict with total_cost, total_tokens, total_requests and days
+        """
+        with self._lock:
+            c = self._daily
+            s = self._day_slice(c["day"], start_date, end_date)
+            return {
+                "total_cost": sum(c["total_cost"][s]),
+                "total_tokens": sum(c["total_tokens"][s]),
+                "total_requests": sum(c["request_count"][s]),
+                "days": s.stop - s.start,
+            }
+
+    def by_model(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate locally recorded requests by model.
+
+        Returns:
+            Dict mapping model ID to requests, prompt/completion/total tokens and cost
+        """
+        with self._lock:
+            c = self._requests
+            result: Dict[str, Dict[str, Any]] = {}
+            for i in self._request_rows(start_date, end_date):
+                model = self._models[c["model"][i]]
+                row = result.get(model)
+                if row is None:
+                    row = result[model] = {
+                        "requests": 0,
+                        "prompt_tokens": 0,
+                        "completion_tokens": 0,
+                        "total_tokens": 0,
+                        "cost": 0.0,
+                    }
+                row["requests"] += 1
+                row["prompt_tokens"] += c["prompt_tokens"][i]
+                row["completion_tokens"] += c["completion_tokens"][i]
+                row["cost"] += c["cost"][i]
+            for row in result.values():
+                row["total_tokens"] = row["prompt_tokens"] + row["completion_tokens"]
+            return result
+
+    def by_day(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Combine server-side daily totals with locally recorded requests per day.
+
+        Returns:
+            One dict per day (date order) with the server's total_cost,
+            total_tokens and request_count alongside local_requests,
+            local_tokens and local_cost from this client's own records
+        """
+        rows: Dict[int, Dict[str, Any]] = {}
+
+        def row_for(ordinal: int) -> Dict[str, Any]:
+            row = rows.get(ordinal)
+            if row is None:
+                row = rows[ordinal] = {
+                    "date": _isoformat(ordinal),
+                    "total_cost": 0.0,
+                    "total_tokens": 0,
+                    "request_count": 0,
+                    "local_requests": 0,
+                    "local_tokens": 0,
+                    "local_cost": 0.0,
+                }
+            return row
+
+        with self._lock:
+            c = self._daily
+            s = self._day_slice(c["day"], start_date, end_date)
+            for d, cost, tokens, count in zip(
+                c["day"][s], c["total_cost"][s], c["total_tokens"][s], c["request_count"][s]
+            ):
+                row = row_for(d)
+                row["total_cost"] = cost
+                row["total_tokens"] = tokens
+                row["request_count"] = count
+
+            r = self._requests
+            for i in self._request_rows(start_date, end_date):
+                row = row_for(r["day"][i])
+                row["local_requests"] += 1
+                row["local_tokens"] += r["prompt_tokens"][i] + r["completion_tokens"][i]
+                row["local_cost"] += r["cost"][i]
+
+        return [rows[d] for d in sorted(rows)]
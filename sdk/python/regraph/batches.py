@@ -0,0 +1,284 @@
+"""
+ReGraph SDK - Sharded Batch Orchestration
+
+Runs workloads larger than one batch job: requests are split into shards, each
+shard is submitted as its own server batch (concurrently), all batches are
+tracked by a single poller, items that fail are resubmitted on their own, and
+results are merged back into the order of the original requests.
+"""
+
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from ._retry import retryable
+from .errors import ReGraphError
+
+if TYPE_CHECKING:
+    from .client import ReGraph
+    from .models import BatchJob, BatchRequest
+    from .timeouts import CancellationToken
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled", "expired")
+_FAILED_ITEM_STATUSES = ("failed", "error", "cancelled", "expired")
+
+
+@dataclass
+class BatchRunProgress:
+    """Snapshot of a sharded batch run."""
+    total: int
+    succeeded: int
+    failed: int  # Items that exhausted their attempts
+    retrying: int  # Failed items queued for resubmission
+    active_batches: int
+    batches_submitted: int
+    elapsed: float
+
+
+@dataclass
+class BatchRunResult:
+    """Outcome of a sharded batch run, in the order of the original requests."""
+    results: List[Optional[Dict[str, Any]]]
+    errors: Dict[int, Any] = field(default_factory=dict)  # Request index -> last failed result or exception
+    batch_ids: List[str] = field(default_factory=list)
+    resubmitted: int = 0  # Items sent again after failing
+    elapsed: float = 0.0
+
+    @property
+    def failed_indices(self) -> List[int]:
+        return sorted(self.errors)
+
+
+def _item_failed(result: Dict[str, Any]) -> bool:
+    return bool(result.get("error")) or result.get("status") in _FAILED_ITEM_STATUSES
+
+
+class BatchOrchestrator:
+    """
+    Splits a workload across many batch jobs and tracks them together.
+
+    Example:
+        >>> orchestrator = BatchOrchestrator(client, shard_size=500, max_concurrency=8)
+        >>> run = orchestrator.run(requests)
+        >>> run.results[0], run.failed_indices
+    """
+
+    def __init__(
+        self,
+        client: "ReGraph",
+        shard_size: int = 1000,
+        max_concurrency: int = 8,
+        max_active_batches: Optional[int] = None,
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0,
+        max_attempts: int = 3,
+        webhook_url: Optional[str] = None,
+        progress: Optional[Callable[[BatchRunProgress], None]] = None,
+    ):
+        """
+        Create an orchestrator.
+
+        Args:
+            client: ReGraph client to submit and poll with
+            shard_size: Requests per server batch
+            max_concurrency: Parallel create/get calls
+            max_active_batches: Batches allowed in flight at once (default: unlimited)
+            poll_interval: Initial seconds between status rounds
+            max_poll_interval: Upper bound as the interval backs off while
+                nothing changes
+            max_attempts: Submissions per item, including the first
+            webhook_url: Webhook URL passed to every batch
+            progress: Callback receiving a BatchRunProgress after each poll round
+        """
+        if shard_size < 1 or max_concurrency < 1 or max_attempts < 1:
+            raise ValueError("shard_size, max_concurrency and max_attempts must be at least 1")
+        self.client = client
+        self.shard_size = shard_size
+        self.max_concurrency = max_concurrency
+        self.max_active_batches = max_active_batches
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.max_attempts = max_attempts
+        self.webhook_url = webhook_url
+        self.progress = progress
+
+    def run(
+        self,
+        requests: List[Union[Dict[str, Any], "BatchRequest"]],
+        cancel_token: Optional["CancellationToken"] = None,
+    ) -> BatchRunResult:
+        """
+        Run all requests to completion.
+
+        Args:
+            requests: Batch requests, in the order results should be returned
+            cancel_token: CancellationToken that stops submitting and polling;
+                batches already created keep running on the server
+
+        Returns:
+            BatchRunResult; ``results[i]`` is the result for ``requests[i]``, or
+            None if it failed on every attempt (see ``errors``)
+        """
+        started = time.monotonic()
+        outcome = BatchRunResult(results=[None] * len(requests))
+        attempts = [0] * len(requests)
+        # Shards waiting to be submitted, each with the Idempotency-Key it is sent under.
+        queue: Deque[Tuple[List[int], str]] = deque(self._keyed(list(range(len(requests)))))
+        retry: List[int] = []  # Failed items waiting to be re-sharded
+
+        wake = threading.Event()
+        handle = cancel_token.register(wake.set) if cancel_token is not None else None
+
+        def settle_failure(index: int, error: Any) -> None:
+            if attempts[index] < self.max_attempts:
+                retry.append(index)
+            else:
+                outcome.errors[index] = error
+
+        submitting: Dict[Future, Tuple[List[int], str]] = {}
+        active: Dict[str, List[int]] = {}  # batch_id -> request indices, by position in the batch
+        counters: Dict[str, Tuple[int, int, str]] = {}
+        interval = self.poll_interval
+        next_poll = time.monotonic() + interval
+
+        try:
+            with ThreadPoolExecutor(self.max_concurrency, thread_name_prefix="regraph-batch") as executor:
+                while queue or retry or submitting or active:
+                    if cancel_token is not None:
+                        cancel_token.raise_if_cancelled()
+
+                    if retry:
+                        outcome.resubmitted += len(retry)
+                        queue.extend(self._keyed(sorted(retry)))
+                        retry.clear()
+
+                    # Submit queued shards, within the active-batch limit.
+                    while queue and (
+                        self.max_active_batches is None
+                        or len(active) + len(submitting) < self.max_active_batches
+                    ):
+                        shard, key = queue.popleft()
+                        for index in shard:
+                            attempts[index] += 1
+                        payload = [requests[i] for i in shard]
+                        future = executor.submit(
+                            self.client.batch.create,
+                            payload,
+                            self.webhook_url,
+                            cancel_token=cancel_token,
+                            idempotency_key=key,
+                        )
+                        submitting[future] = (shard, key)
+
+                    # Wait for a submission to finish or for the next poll round.
+                    timeout = max(0.0, next_poll - time.monotonic()) if active else None
+                    if submitting:
+                        done, _ = wait(list(submitting), timeout=timeout, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            shard, key = submitting.pop(future)
+                            try:
+                                job = future.result()
+                            except ReGraphError as e:
+                                if retryable(e) and all(attempts[i] < self.max_attempts for i in shard):
+                                    # The batch may exist on the server already; only the
+                                    # same key lets the server match it to this shard.
+                                    queue.append((shard, key))
+                                    continue
+                                for index in shard:
+                                    settle_failure(index, e)
+                                continue
+                            active[job.batch_id] = shard
+                            outcome.batch_ids.append(job.batch_id)
+                    elif timeout:
+                        wake.wait(timeout)
+
+                    if not active or time.monotonic() < next_poll:
+                        continue
+
+                    # One poll round over every active batch.
+                    changed = False
+                    batch_ids = list(active)
+                    jobs = executor.map(lambda batch_id: self._get(batch_id, cancel_token), batch_ids)
+                    for batch_id, job in zip(batch_ids, jobs):
+                        if job is None:
+                            continue
+                        state = (job.completed_requests, job.failed_requests, job.status)
+                        changed |= counters.get(batch_id) != state
+                        counters[batch_id] = state
+                        if job.status in TERMINAL_STATUSES:
+                            self._collect(job, active.pop(batch_id), outcome, settle_failure)
+                            counters.pop(batch_id, None)
+
+                    interval = self.poll_interval if changed else min(interval * 1.5, self.max_poll_interval)
+                    next_poll = time.monotonic() + interval
+                    if self.progress is not None:
+                        self.progress(self._progress(outcome, retry, active, started))
+        finally:
+            if handle is not None:
+                cancel_token.unregister(handle)
+
+        outcome.elapsed = time.monotonic() - started
+        return outcome
+
+    def _shards(self, indices: List[int]) -> List[List[int]]:
+        return [indices[i : i + self.shard_size] for i in range(0, len(indices), self.shard_size)]
+
+    def _keyed(self, indices: List[int]) -> List[Tuple[List[int], str]]:
+        """Shard indices, giving each shard a new key: it is a new batch for the server."""
+        return [(shard, str(uuid.uuid4())) for shard in self._shards(indices)]
+
+    def _get(self, batch_id: str, cancel_token: Optional["CancellationToken"]) -> Optional["BatchJob"]:
+        try:
+            return self.client.batch.get(batch_id, cancel_token=cancel_token)
+        except ReGraphError as e:
+            # Transient polling errors are retried on the next round; others end the run.
+            if not retryable(e):
+                raise
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            return None
+
+    def _collect(
+        self,
+        job: "BatchJob",
+        shard: List[int],
+        outcome: BatchRunResult,
+        settle_failure: Callable[[int, Any], None],
+    ) -> None:
+        """Merge a finished batch's results and queue its failed items."""
+        seen = set()
+        for position, result in enumerate(job.results or []):
+            position = result.get("index", position)
+            if not 0 <= position < len(shard) or position in seen:
+                continue
+            seen.add(position)
+            index = shard[position]
+            if _item_failed(result):
+                settle_failure(index, result)
+            else:
+                outcome.results[index] = result
+        # Items the batch returned nothing for (e.g. the whole batch failed).
+        for position, index in enumerate(shard):
+            if position not in seen:
+                settle_failure(index, {"status": job.status, "batch_id": job.batch_id})
+
+    def _progress(
+        self,
+        outcome: BatchRunResult,
+        retry: List[int],
+        active: Dict[str, List[int]],
+        started: float,
+    ) -> BatchRunProgress:
+        return BatchRunProgress(
+            total=len(outcome.results),
+            succeeded=sum(r is not None for r in outcome.results),
+            failed=len(outcome.errors),
+            retrying=len(retry),
+            active_batches=len(active),
+            batches_submitted=len(outcome.batch_ids),
+            elapsed=time.monotonic() - started,
+        )
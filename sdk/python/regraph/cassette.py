@@ -0,0 +1,446 @@
+"""
+ReGraph SDK - Record and Replay
+
+Captures the client's traffic to a compact on-disk cassette and serves it back
+later without a network, for deterministic load tests of code that depends on
+ReGraph:
+
+    # Record real responses once
+    with Cassette("chat.cassette", mode="record") as cassette:
+        client = ReGraph(api_key="your-api-key", cassette=cassette)
+        ...
+
+    # Replay them at twice the original speed
+    client = ReGraph(api_key="test", cassette=Cassette("chat.cassette", speed=2.0))
+
+Requests are matched by a hash of their canonical form (method, path with
+sorted query and JSON body with sorted keys; headers are ignored). A cassette
+is two files: ``<path>`` holds the records back to back, ``<path>.idx`` is an
+open-addressing hash table over them that is memory-mapped on replay, so
+opening and looking up a cassette with millions of entries costs the same as
+one with ten.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import urllib.parse
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from .errors import CassetteMissError, RequestTimeoutError
+from .transport import Transport
+
+if TYPE_CHECKING:
+    from .timeouts import CancellationToken, Timeout
+
+_DATA_MAGIC = b"RGCASS1\n"
+_INDEX_MAGIC = b"RGCIDX1\n"
+# key, previous record with the same key (offset + 1, 0 for none), meta length, body length
+_RECORD = struct.Struct("<16sQII")
+# magic, capacity, count, data length covered
+_INDEX_HEADER = struct.Struct("<8sQQQ")
+# key, record offset (0 marks an empty slot; records never start at 0)
+_SLOT = struct.Struct("<16sQ")
+
+# Bodies larger than this are stored zlib-compressed.
+_COMPRESS_ABOVE = 1024
+
+
+def request_key(method: str, path: str, body: Optional[bytes]) -> bytes:
+    """
+    Hash a request to its 16-byte cassette key.
+
+    The query string is sorted and JSON bodies are re-encoded with sorted
+    keys, so semantically identical requests share a key.
+    """
+    split = urllib.parse.urlsplit(path)
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(split.query, keep_blank_values=True)))
+    canonical = body or b""
+    if canonical:
+        try:
+            canonical = json.dumps(json.loads(canonical), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        except ValueError:
+            pass
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{method.upper()} {split.path}?{query}\n".encode("utf-8"))
+    digest.update(canonical)
+    return digest.digest()
+
+
+class Cassette:
+    """
+    On-disk store of recorded requests and responses.
+
+    Modes:
+        "replay": serve recorded responses (the default)
+        "record": start a new cassette, replacing any existing one
+        "append": add recordings to an existing cassette
+    """
+
+    def __init__(self, path: str, mode: str = "replay", speed: Optional[float] = 1.0):
+        """
+        Open a cassette.
+
+        Args:
+            path: Cassette file (the index is kept next to it as ``<path>.idx``)
+            mode: "replay", "record" or "append"
+            speed: Replay timing factor: 1.0 reproduces recorded latencies,
+                2.0 halves them, 0 or None replays instantly
+        """
+        if mode not in ("replay", "record", "append"):
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._latest: Dict[bytes, int] = {}  # key -> offset of its newest record (record modes)
+        self._queues: Dict[bytes, List[int]] = {}  # key -> offsets, oldest first (replay)
+        self._served: Dict[bytes, int] = {}
+        self._closed = False
+
+        if mode == "record" or not os.path.exists(path):
+            if mode == "replay":
+                raise FileNotFoundError(path)
+            with open(path, "wb") as f:
+                f.write(_DATA_MAGIC)
+        elif not self._index_current():
+            self._write_index(self._scan())
+
+        if mode == "replay":
+            self._file = open(path, "rb")
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index_file = open(path + ".idx", "rb")
+            self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            _, self._capacity, self._count, _ = _INDEX_HEADER.unpack_from(self._index, 0)
+        else:
+            if mode == "append":
+                self._latest = self._read_index()
+            self._file = open(path, "ab")
+
+    def __len__(self) -> int:
+        if self.mode == "replay":
+            return self._count
+        return len(self._latest)
+
+    # ---------- Index ----------
+
+    def _index_current(self) -> bool:
+        try:
+            with open(self.path + ".idx", "rb") as f:
+                magic, _, _, covered = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+        except (OSError, struct.error):
+            return False
+        return magic == _INDEX_MAGIC and covered == os.path.getsize(self.path)
+
+    def _scan(self) -> Dict[bytes, int]:
+        """Rebuild the key -> newest offset map from the data file, dropping a torn tail."""
+        latest: Dict[bytes, int] = {}
+        with open(self.path, "r+b") as f:
+            size = os.fstat(f.fileno()).st_size
+            if f.read(len(_DATA_MAGIC)) != _DATA_MAGIC:
+                raise ValueError(f"{self.path} is not a ReGraph cassette")
+            offset = len(_DATA_MAGIC)
+            if size > offset:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    while offset + _RECORD.size <= size:
+                        key, _, meta_len, body_len = _RECORD.unpack_from(data, offset)
+                        end = offset + _RECORD.size + meta_len + body_len
+                        if end > size:
+                            break
+                        latest[key] = offset
+                        offset = end
+            if offset != size:
+                f.truncate(offset)
+        return latest
+
+    def _read_index(self) -> Dict[bytes, int]:
+        with open(self.path + ".idx", "rb") as f:
+            table = f.read()
+        _, capacity, _, _ = _INDEX_HEADER.unpack_from(table, 0)
+        latest = {}
+        for i in range(capacity):
+            key, offset = _SLOT.unpack_from(table, _INDEX_HEADER.size + i * _SLOT.size)
+            if offset:
+                latest[key] = offset
+        return latest
+
+    def _write_index(self, latest: Dict[bytes, int]) -> None:
+        capacity = 16
+        while capacity < 2 * len(latest):
+            capacity *= 2
+        table = bytearray(_INDEX_HEADER.size + capacity * _SLOT.size)
+        mask = capacity - 1
+        for key, offset in latest.items():
+            slot = int.from_bytes(key[:8], "little") & mask
+            while _SLOT.unpack_from(table, _INDEX_HEADER.size + slot * _SLOT.size)[1]:
+                slot = (slot + 1) & mask
+            _SLOT.pack_into(table, _INDEX_HEADER.size + slot * _SLOT.size, key, offset)
+        _INDEX_HEADER.pack_into(table, 0, _INDEX_MAGIC, capacity, len(latest), os.path.getsize(self.path))
+
+        tmp_path = self.path + ".idx.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(table)
+        os.replace(tmp_path, self.path + ".idx")
+
+    def _lookup(self, key: bytes) -> int:
+        """Return the offset of the newest record for a key, or 0."""
+        mask = self._capacity - 1
+        slot = int.from_bytes(key[:8], "little") & mask
+        while True:
+            found, offset = _SLOT.unpack_from(self._index, _INDEX_HEADER.size + slot * _SLOT.size)
+            if not offset or found == key:
+                return offset
+            slot = (slot + 1) & mask
+
+    # ---------- Records ----------
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes],
+        status: int,
+        chunks: List[Tuple[float, bytes]],
+    ) -> None:
+        """
+        Append one exchange.
+
+        Args:
+            method: HTTP method
+            path: Request path including query
+            body: Request body
+            status: Response status code
+            chunks: (seconds since the request was sent, data) per response
+                chunk; one chunk for non-streamed responses
+        """
+        if self.mode == "replay":
+            raise ValueError("Cassette was opened for replay")
+        key = request_key(method, path, body)
+        payload = b"".join(data for _, data in chunks)
+        meta: Dict[str, Any] = {
+            "method": method,
+            "path": path,
+            "status": status,
+            "times": [round(t, 6) for t, _ in chunks],
+            "sizes": [len(data) for _, data in chunks],
+        }
+        if len(payload) > _COMPRESS_ABOVE:
+            compressed = zlib.compress(payload, 6)
+            if len(compressed) < len(payload):
+                payload = compressed
+                meta["z"] = 1
+        meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+
+        with self._lock:
+            offset = self._file.tell()
+            previous = self._latest.get(key, -1) + 1
+            self._file.write(_RECORD.pack(key, previous, len(meta_bytes), len(payload)))
+            self._file.write(meta_bytes)
+            self._file.write(payload)
+            self._latest[key] = offset
+
+    def _read(self, offset: int) -> Tuple[int, Dict[str, Any], List[Tuple[float, bytes]]]:
+        """Return (previous offset + 1, meta, timed chunks) of the record at offset."""
+        _, previous, meta_len, body_len = _RECORD.unpack_from(self._data, offset)
+        start = offset + _RECORD.size
+        meta = json.loads(self._data[start : start + meta_len])
+        payload = self._data[start + meta_len : start + meta_len + body_len]
+        if meta.get("z"):
+            payload = zlib.decompress(payload)
+        chunks, position = [], 0
+        for t, size in zip(meta["times"], meta["sizes"]):
+            chunks.append((t, payload[position : position + size]))
+            position += size
+        return previous, meta, chunks
+
+    def match(self, method: str, path: str, body: Optional[bytes]) -> Tuple[int, List[Tuple[float, bytes]]]:
+        """
+        Find the recorded response for a request.
+
+        Repeated identical requests are answered with their recordings in the
+        order they were recorded; after the last one it is served again.
+
+        Returns:
+            Tuple of (status, timed chunks)
+
+        Raises:
+            CassetteMissError: If the request was never recorded
+        """
+        key = request_key(method, path, body)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is None:
+                offset = self._lookup(key)
+                if not offset:
+                    raise CassetteMissError(f"No recording for {method} {path}")
+                # Records with the same key are chained newest to oldest.
+                queue = []
+                while offset:
+                    queue.append(offset)
+                    offset = max(_RECORD.unpack_from(self._data, offset)[1] - 1, 0)
+                queue.reverse()
+                self._queues[key] = queue
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            offset = queue[min(served, len(queue) - 1)]
+        _, meta, chunks = self._read(offset)
+        return meta["status"], chunks
+
+    def close(self) -> None:
+        """Flush recordings and write the index."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self.mode == "replay":
+                self._index.close()
+                self._index_file.close()
+                self._data.close()
+                self._file.close()
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._write_index(self._latest)
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _sleep_until(
+    start: float, at: float, deadline: Optional[float], cancel: Optional["CancellationToken"]
+) -> None:
+    """Sleep until ``start + at`` (monotonic), honouring deadline and cancellation."""
+    target = start + at
+    if deadline is not None and deadline < target:
+        _pause(deadline - time.monotonic(), cancel)
+        raise RequestTimeoutError("Request deadline exceeded")
+    _pause(target - time.monotonic(), cancel)
+
+
+def _pause(seconds: float, cancel: Optional["CancellationToken"]) -> None:
+    if seconds > 0:
+        if cancel is not None:
+            cancelled = threading.Event()
+            handle = cancel.register(cancelled.set)
+            try:
+                cancelled.wait(seconds)
+            finally:
+                cancel.unregister(handle)
+        else:
+            time.sleep(seconds)
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+
+
+class RecordingTransport(Transport):
+    """Transport that forwards to another transport and records every exchange."""
+
+    def __init__(self, transport: Transport, cassette: Cassette):
+        self.transport = transport
+        self.cassette = cassette
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional["Timeout"] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional["CancellationToken"] = None,
+    ) -> Tuple[int, bytes]:
+        start = time.monotonic()
+        status, payload = self.transport.request(method, path, body, headers, timeout, deadline, cancel)
+        self.cassette.record(method, path, body, status, [(time.monotonic() - start, payload)])
+        return status, payload
+
+    def stream(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional["Timeout"] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional["CancellationToken"] = None,
+    ) -> Tuple[int, Iterator[bytes]]:
+        start = time.monotonic()
+        status, chunks = self.transport.stream(method, path, body, headers, timeout, deadline, cancel)
+
+        def capture() -> Iterator[bytes]:
+            timed = []
+            for chunk in chunks:
+                timed.append((time.monotonic() - start, chunk))
+                yield chunk
+            # Only complete responses are recorded.
+            self.cassette.record(method, path, body, status, timed)
+
+        return status, capture()
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """Transport that answers from a cassette, reproducing recorded timing."""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def _scale(self, chunks: List[Tuple[float, bytes]]) -> List[Tuple[float, bytes]]:
+        speed = self.cassette.speed
+        if not speed:
+            return [(0.0, data) for _, data in chunks]
+        return [(t / speed, data) for t, data in chunks]
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional["Timeout"] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional["CancellationToken"] = None,
+    ) -> Tuple[int, bytes]:
+        start = time.monotonic()
+        status, chunks = self.cassette.match(method, path, body)
+        chunks = self._scale(chunks)
+        if chunks:
+            _sleep_until(start, chunks[-1][0], deadline, cancel)
+        return status, b"".join(data for _, data in chunks)
+
+    def stream(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional["Timeout"] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional["CancellationToken"] = None,
+    ) -> Tuple[int, Iterator[bytes]]:
+        start = time.monotonic()
+        status, chunks = self.cassette.match(method, path, body)
+        chunks = self._scale(chunks)
+        if chunks:
+            _sleep_until(start, chunks[0][0], deadline, cancel)
+
+        def replay() -> Iterator[bytes]:
+            for at, data in chunks:
+                _sleep_until(start, at, deadline, cancel)
+                yield data
+
+        return status, replay()
+
+    def close(self) -> None:
+        self.cassette.close()
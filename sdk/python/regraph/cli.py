@@ -0,0 +1,405 @@
+"""
+ReGraph SDK - Command-Line Interface
+
+Offline batch inference over large JSONL/CSV files:
+
+    regraph run requests.jsonl -o results.jsonl --workers 8 --concurrency 64
+
+Each input line is one chat or embeddings request. Lines are streamed to a pool
+of worker processes, each running its own client with pooled connections and a
+thread pool sized to its share of ``--concurrency``. Results are appended to the
+output file as they complete; rerunning the same command resumes from the lines
+already answered there. Lines that cannot be parsed are written as error
+records rather than stopping the run.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Set, TextIO, Tuple, Union
+
+from .client import ReGraph, ReGraphError
+
+
+# Per-process state for pool workers, set up once by _init_worker.
+_worker_client: Optional[ReGraph] = None
+_worker_threads: Optional[ThreadPoolExecutor] = None
+
+
+# ========== Input ==========
+
+# A parsed request, or the reason its line could not be parsed.
+Parsed = Union[Dict[str, Any], ValueError]
+
+
+def _read_jsonl(path: str) -> Iterator[Tuple[int, Parsed]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                yield lineno, ValueError(f"Invalid JSON: {e}")
+                continue
+            if not isinstance(request, dict):
+                yield lineno, ValueError("Expected a JSON object")
+                continue
+            yield lineno, request
+
+
+def _read_csv(path: str) -> Iterator[Tuple[int, Parsed]]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for lineno, row in enumerate(csv.DictReader(f), 1):
+            request: Dict[str, Any] = {k: v for k, v in row.items() if v not in (None, "")}
+            try:
+                if "messages" in request:
+                    request["messages"] = json.loads(request["messages"])
+                for key in ("temperature", "top_p"):
+                    if key in request:
+                        request[key] = float(request[key])
+                if "max_tokens" in request:
+                    request["max_tokens"] = int(request["max_tokens"])
+            except ValueError as e:
+                yield lineno, ValueError(f"Invalid row: {e}")
+                continue
+            yield lineno, request
+
+
+def read_requests(path: str) -> Iterator[Tuple[int, Parsed]]:
+    """
+    Stream requests from a JSONL or CSV file.
+
+    CSV files are recognised by extension. A ``messages`` column is parsed as
+    JSON; a ``prompt`` column becomes a single user message.
+
+    Args:
+        path: Input file path
+
+    Yields:
+        Tuples of (line number, request dict), or (line number, ValueError)
+        for a line that could not be parsed
+    """
+    reader = _read_csv if path.lower().endswith(".csv") else _read_jsonl
+    for lineno, request in reader(path):
+        if isinstance(request, ValueError):
+            yield lineno, request
+            continue
+        if "prompt" in request and "messages" not in request and "input" not in request:
+            request["messages"] = [{"role": "user", "content": request.pop("prompt")}]
+        yield lineno, request
+
+
+def load_checkpoint(path: str) -> Set[int]:
+    """
+    Collect line numbers already answered successfully in an output file.
+
+    A partially written trailing record (from an interrupted run) is truncated
+    so that appending resumes on a clean line boundary.
+
+    Args:
+        path: Output file path
+
+    Returns:
+        Set of completed input line numbers
+    """
+    done: Set[int] = set()
+    if not os.path.exists(path):
+        return done
+
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+
+    for line in data[:end].splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if "response" in record:
+            done.add(record["line"])
+    return done
+
+
+# ========== Workers ==========
+
+def _init_worker(api_key: str, base_url: Optional[str], timeout: int, concurrency: int) -> None:
+    global _worker_client, _worker_threads
+    _worker_client = ReGraph(
+        api_key=api_key,
+        base_url=base_url,
+        timeout=timeout,
+        max_connections=concurrency,
+    )
+    _worker_threads = ThreadPoolExecutor(max_workers=concurrency)
+
+
+def _run_one(item: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+    lineno, request = item
+    assert _worker_client is not None
+    request = dict(request)
+    record: Dict[str, Any] = {"line": lineno}
+    if "id" in request:
+        record["id"] = request.pop("id")
+
+    start = time.perf_counter()
+    try:
+        if "input" in request:
+            response = asdict(_worker_client.embeddings.create(**request))
+        else:
+            response = asdict(_worker_client.chat.completions.create(**request))
+        record["response"] = response
+    except ReGraphError as e:
+        record["error"] = str(e)
+        record["status_code"] = e.status_code
+    except (TypeError, KeyError, ValueError) as e:
+        record["error"] = f"Invalid request: {e}"
+    except Exception as e:
+        # Whatever goes wrong with one line is that line's result, not the run's.
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return record
+
+
+def _run_chunk(chunk: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    assert _worker_threads is not None
+    return list(_worker_threads.map(_run_one, chunk))
+
+
+# ========== Progress ==========
+
+class _Progress:
+    """Live throughput, latency and cost counters for a run."""
+
+    def __init__(
+        self,
+        prices: Dict[str, float],
+        stream: TextIO,
+        flat_price: Optional[float] = None,
+        interval: float = 0.5,
+    ):
+        self.prices = prices
+        self.flat_price = flat_price
+        self.stream = stream
+        self.interval = interval
+        self.started = time.monotonic()
+        self.succeeded = 0
+        self.failed = 0
+        self.tokens = 0
+        self.cost = 0.0
+        self.latencies: Deque[float] = deque(maxlen=10000)
+        self._last_render = 0.0
+
+    def add(self, record: Dict[str, Any]) -> None:
+        if "latency_ms" in record:  # Lines that were never sent have none
+            self.latencies.append(record["latency_ms"])
+        response = record.get("response")
+        if response is None:
+            self.failed += 1
+            return
+        self.succeeded += 1
+        tokens = response.get("usage", {}).get("total_tokens", 0)
+        self.tokens += tokens
+        price = self.flat_price or self.prices.get(response.get("model", ""))
+        if price:
+            self.cost += tokens / 1000 * price
+
+    def _percentile(self, ordered: List[float], q: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        done = self.succeeded + self.failed
+        ordered = sorted(self.latencies)
+        return (
+            f"{done} done ({self.failed} failed) | {done / elapsed:.1f} req/s | "
+            f"p50 {self._percentile(ordered, 0.5):.0f}ms p95 {self._percentile(ordered, 0.95):.0f}ms | "
+            f"{self.tokens} tokens | ${self.cost:.4f}"
+        )
+
+    def render(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_render < self.interval:
+            return
+        self._last_render = now
+        self.stream.write(f"\r{self.line()}\033[K")
+        self.stream.flush()
+
+
+def _fetch_prices(client: ReGraph) -> Dict[str, float]:
+    try:
+        result = client.models.list(limit=1000)
+    except ReGraphError:
+        return {}
+    return {m.id: m.price_per_1k_tokens for m in result["models"] if m.price_per_1k_tokens}
+
+
+# ========== Commands ==========
+
+def _chunked(
+    items: Iterator[Tuple[int, Parsed]],
+    size: int,
+    skip: Set[int],
+    invalid: Callable[[int, ValueError], None],
+) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+    for lineno, request in items:
+        if lineno in skip:
+            continue
+        if isinstance(request, ValueError):
+            invalid(lineno, request)
+            continue
+        chunk.append((lineno, request))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(args: argparse.Namespace) -> int:
+    """Execute the ``run`` command."""
+    api_key = args.api_key or os.environ.get("REGRAPH_API_KEY")
+    if not api_key:
+        print("error: an API key is required (--api-key or REGRAPH_API_KEY)", file=sys.stderr)
+        return 2
+
+    output = args.output or f"{os.path.splitext(args.input)[0]}.out.jsonl"
+    done = load_checkpoint(output)
+    if done:
+        print(f"Resuming: {len(done)} lines already completed in {output}", file=sys.stderr)
+
+    prices: Dict[str, float] = {}
+    if args.price_per_1k is None:
+        with ReGraph(api_key=api_key, base_url=args.base_url, timeout=args.timeout) as client:
+            prices = _fetch_prices(client)
+
+    workers = max(1, args.workers)
+    per_worker = max(1, math.ceil(args.concurrency / workers))
+    chunk_size = args.chunk_size or per_worker * 2
+    max_pending = workers * 2
+
+    requests = read_requests(args.input)
+    if args.model:
+        requests = ((n, r if isinstance(r, ValueError) else {"model": args.model, **r}) for n, r in requests)
+
+    progress = _Progress(prices, sys.stderr, flat_price=args.price_per_1k)
+    pending: Set["Future[List[Dict[str, Any]]]"] = set()
+    finished: Set["Future[List[Dict[str, Any]]]"] = set()
+    stopped: Optional[BaseException] = None
+    with open(output, "a", encoding="utf-8") as out:
+
+        def write(records: List[Dict[str, Any]]) -> None:
+            for record in records:
+                out.write(json.dumps(record) + "\n")
+                progress.add(record)
+            out.flush()
+
+        def invalid(lineno: int, error: ValueError) -> None:
+            write([{"line": lineno, "error": str(error)}])
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(api_key, args.base_url, args.timeout, per_worker),
+        ) as pool:
+            try:
+                chunks = _chunked(requests, chunk_size, done, invalid)
+                exhausted = False
+                while pending or not exhausted:
+                    # Bounded submission keeps memory flat regardless of input size.
+                    while not exhausted and len(pending) < max_pending:
+                        chunk = next(chunks, None)
+                        if chunk is None:
+                            exhausted = True
+                            break
+                        pending.add(pool.submit(_run_chunk, chunk))
+                    if not pending:
+                        break
+
+                    finished, pending = wait(pending, timeout=progress.interval, return_when=FIRST_COMPLETED)
+                    while finished:
+                        write(finished.pop().result())
+                    progress.render()
+            except (KeyboardInterrupt, BrokenProcessPool) as e:
+                stopped = e
+                for future in pending:
+                    future.cancel()
+
+        if stopped is not None:
+            # Leaving the pool waited for the chunks already running; keep every
+            # one that finished, so a rerun does not send its lines again.
+            for future in finished | pending:
+                if not future.cancelled() and future.exception() is None:
+                    write(future.result())
+
+    if stopped is not None:
+        progress.render(force=True)
+        if isinstance(stopped, KeyboardInterrupt):
+            print(f"\nInterrupted; rerun the same command to resume into {output}", file=sys.stderr)
+            return 130
+        print(
+            f"\nA worker process exited unexpectedly ({stopped}); "
+            f"rerun the same command to resume into {output}",
+            file=sys.stderr,
+        )
+        return 1
+
+    progress.render(force=True)
+    print(file=sys.stderr)
+    return 1 if progress.failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the ``regraph`` command."""
+    parser = argparse.ArgumentParser(prog="regraph", description="ReGraph command-line tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run",
+        help="Run chat/embedding requests from a JSONL or CSV file",
+        description=(
+            "Run chat/embedding requests from a JSONL or CSV file. Lines with an "
+            "'input' field are embeddings requests; lines with 'messages' or "
+            "'prompt' are chat completions. Rerunning resumes from the output file."
+        ),
+    )
+    run_parser.add_argument("input", help="Input .jsonl or .csv file")
+    run_parser.add_argument("-o", "--output", help="Output JSONL file (default: <input>.out.jsonl)")
+    run_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    run_parser.add_argument("--concurrency", type=int, default=16, help="Total in-flight requests")
+    run_parser.add_argument("--chunk-size", type=int, help="Lines sent to a worker at a time")
+    run_parser.add_argument("--model", help="Default model for lines that do not set one")
+    run_parser.add_argument("--api-key", help="API key (default: $REGRAPH_API_KEY)")
+    run_parser.add_argument("--base-url", help="API base URL")
+    run_parser.add_argument("--timeout", type=int, default=60, help="Request timeout in seconds")
+    run_parser.add_argument(
+        "--price-per-1k",
+        type=float,
+        help="Cost per 1K tokens for the live estimate (default: fetched from /models)",
+    )
+    run_parser.set_defaults(func=run)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for the ``regraph`` console script."""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,46 +4,53 @@ ReGraph Python SDK - Main Client
 OpenAI-compatible API client for the ReGraph decentralized AI compute marketplace.
 """
 
-import json
-import urllib.request
-import urllib.error
-from typing import List, Dict, Any, Optional, Generator, Union
-from dataclasses import asdict
-
-from .models import (
-    ChatCompletion,
-    ChatMessage,
-    Embedding,
-    ImageGeneration,
-    AudioSpeech,
-    TrainingJob,
-    TrainingConfig,
-    BatchJob,
-    BatchRequest,
-    Model,
-    UsageStats,
-    Device,
-    PlatformStatus,
-)
+from __future__ import annotations
 
+import copy
+import json
+import time
+from functools import cached_property
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional, Tuple, Union, TYPE_CHECKING
 
-class ReGraphError(Exception):
-    """Base exception for ReGraph API errors."""
-    
-    def __init__(self, message: str, status_code: Optional[int] = None, response: Optional[Dict] = None):
-        super().__init__(message)
-        self.status_code = status_code
-        self.response = response
-
-
-class AuthenticationError(ReGraphError):
-    """Raised when API key is invalid or missing."""
-    pass
-
+from .errors import AuthenticationError, RateLimitError, ReGraphError
 
-class RateLimitError(ReGraphError):
-    """Raised when rate limit is exceeded."""
-    pass
+# Models, connection handling and optional features are imported where they are
+# first used, so that importing the SDK and constructing a client stay cheap.
+if TYPE_CHECKING:
+    from .models import (
+        ChatCompletion,
+        ChatMessage,
+        Embedding,
+        ImageGeneration,
+        AudioSpeech,
+        TrainingJob,
+        TrainingConfig,
+        TrainingArtifact,
+        UploadedFile,
+        BatchJob,
+        BatchRequest,
+        Model,
+        UsageStats,
+        Device,
+        PlatformStatus,
+    )
+    from .analytics import UsageStore
+    from .batches import BatchRunProgress, BatchRunResult
+    from .cassette import Cassette
+    from .corpus import CorpusProgress
+    from .downloads import DownloadProgress
+    from .journal import JournalEntry, RequestJournal
+    from .limiter import AdaptiveLimiter
+    from .messages import MessageHistory
+    from .planner import CapacityPlanner
+    from .profiling import Profiler
+    from .scheduler import RequestScheduler
+    from .semantic_cache import SemanticCache
+    from .telemetry import TelemetryAgent
+    from .timeouts import CancellationToken, Timeout
+    from .training import TrainingJobEvent
+    from .uploads import UploadProgress
+    from .transport import Transport
 
 
 class ReGraph:
@@ -66,7 +73,17 @@ class ReGraph:
         self,
         api_key: str,
         base_url: Optional[str] = None,
-        timeout: int = 60,
+        timeout: Union[float, Timeout] = 60,
+        max_connections: int = 10,
+        journal: Optional[RequestJournal] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        usage_store: Optional[UsageStore] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        transport: Optional[Transport] = None,
+        http2: bool = False,
+        cassette: Optional[Cassette] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        profile: Union[bool, Profiler] = False,
     ):
         """
         Initialize the ReGraph client.
@@ -74,7 +91,32 @@ class ReGraph:
         Args:
             api_key: Your ReGraph API key
             base_url: API base URL (default: https://api.regraph.tech/v1)
-            timeout: Request timeout in seconds (default: 60)
+            timeout: Seconds allowed for connecting and for each read (default: 60),
+                or a Timeout with separate connect/read/total limits
+            max_connections: Maximum idle keep-alive connections to reuse (default: 10)
+            journal: Optional RequestJournal recording calls that create billable
+                work (batches, training jobs, deployments, rentals) so they can
+                be retried after a crash without being submitted twice
+            scheduler: Optional RequestScheduler applying priority classes and
+                admission control to every request made through this client
+            usage_store: Optional UsageStore that records the token usage of every
+                chat and embeddings response for local analytics
+            semantic_cache: Optional SemanticCache that answers chat completions
+                whose prompts closely match earlier ones without calling the model
+            transport: Transport used to send requests (default: an HTTPTransport
+                with ``max_connections`` keep-alive connections); pass a
+                MockTransport to run without a network
+            http2: Multiplex concurrent requests over HTTP/2 connections instead
+                of opening one connection per concurrent request (requires
+                ``pip install regraph[http2]``)
+            cassette: Optional Cassette; in record mode every exchange is saved
+                to it, in replay mode responses are served from it instead of
+                the network
+            limiter: Optional AdaptiveLimiter that adapts how many requests per
+                model are in flight to the latency and rate limits observed
+            profile: True, or a Profiler, to time every phase of each request
+                (encoding, connecting, server wait, download, decoding, parsing);
+                read the results from ``client.profiler``
         """
         if not api_key:
             raise AuthenticationError("API key is required")
@@ -82,20 +124,149 @@ class ReGraph:
         self.api_key = api_key
         self.base_url = (base_url or self.DEFAULT_BASE_URL).rstrip("/")
         self.timeout = timeout
+        self.max_connections = max_connections
+        self.journal = journal
+        self.scheduler = scheduler
+        self.usage_store = usage_store
+        self.semantic_cache = semantic_cache
+        self.transport = transport
+        self.http2 = http2
+        self.cassette = cassette
+        self.limiter = limiter
+        self.profiler: Optional[Profiler] = None
+        if profile is True:
+            from .profiling import Profiler
+            
+            self.profiler = Profiler()
+        elif profile:
+            self.profiler = profile
+        self._priority: Optional[str] = None
+        self._deadline: Optional[float] = None
+    
+    @cached_property
+    def _timeout(self) -> Timeout:
+        from .timeouts import Timeout
+        
+        return Timeout.coerce(self.timeout)
+    
+    @cached_property
+    def _transport(self) -> Transport:
+        if self.cassette is not None:
+            from .cassette import RecordingTransport, ReplayTransport
+            
+            if self.cassette.mode == "replay":
+                return ReplayTransport(self.cassette)
+            return RecordingTransport(self._network_transport(), self.cassette)
+        return self._network_transport()
+    
+    def _network_transport(self) -> Transport:
+        if self.transport is not None:
+            return self.transport
+        
+        from .transport import HTTP2Transport, HTTPTransport
         
-        # OpenAI-compatible namespaces
-        self.chat = self._ChatNamespace(self)
-        self.embeddings = self._EmbeddingsNamespace(self)
-        self.images = self._ImagesNamespace(self)
-        self.audio = self._AudioNamespace(self)
-        self.models = self._ModelsNamespace(self)
-        self.training = self._TrainingNamespace(self)
-        self.batch = self._BatchNamespace(self)
-        self.usage = self._UsageNamespace(self)
-        self.devices = self._DevicesNamespace(self)
-        self.status = self._StatusNamespace(self)
-        self.provider = self._ProviderNamespace(self)
-        self.hardware = self._HardwareNamespace(self)
+        if self.http2:
+            return HTTP2Transport(self.base_url, timeout=self._timeout)
+        return HTTPTransport(self.base_url, max_connections=self.max_connections, timeout=self._timeout)
+    
+    # OpenAI-compatible namespaces, created on first access
+    
+    @cached_property
+    def chat(self) -> ReGraph._ChatNamespace:
+        return self._ChatNamespace(self)
+    
+    @cached_property
+    def embeddings(self) -> ReGraph._EmbeddingsNamespace:
+        return self._EmbeddingsNamespace(self)
+    
+    @cached_property
+    def images(self) -> ReGraph._ImagesNamespace:
+        return self._ImagesNamespace(self)
+    
+    @cached_property
+    def audio(self) -> ReGraph._AudioNamespace:
+        return self._AudioNamespace(self)
+    
+    @cached_property
+    def models(self) -> ReGraph._ModelsNamespace:
+        return self._ModelsNamespace(self)
+    
+    @cached_property
+    def training(self) -> ReGraph._TrainingNamespace:
+        return self._TrainingNamespace(self)
+    
+    @cached_property
+    def files(self) -> ReGraph._FilesNamespace:
+        return self._FilesNamespace(self)
+    
+    @cached_property
+    def batch(self) -> ReGraph._BatchNamespace:
+        return self._BatchNamespace(self)
+    
+    @cached_property
+    def usage(self) -> ReGraph._UsageNamespace:
+        return self._UsageNamespace(self)
+    
+    @cached_property
+    def devices(self) -> ReGraph._DevicesNamespace:
+        return self._DevicesNamespace(self)
+    
+    @cached_property
+    def status(self) -> ReGraph._StatusNamespace:
+        return self._StatusNamespace(self)
+    
+    @cached_property
+    def provider(self) -> ReGraph._ProviderNamespace:
+        return self._ProviderNamespace(self)
+    
+    @cached_property
+    def hardware(self) -> ReGraph._HardwareNamespace:
+        return self._HardwareNamespace(self)
+    
+    _NAMESPACES = (
+        "chat",
+        "embeddings",
+        "images",
+        "audio",
+        "models",
+        "training",
+        "files",
+        "batch",
+        "usage",
+        "devices",
+        "status",
+        "provider",
+        "hardware",
+    )
+    
+    def with_options(
+        self,
+        priority: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> ReGraph:
+        """
+        Return a view of this client that tags its requests for the scheduler.
+        
+        The view shares connections, journal and scheduler with this client.
+        
+        Args:
+            priority: Scheduler priority class (e.g., "interactive", "background")
+            deadline: Absolute time.monotonic() time by which requests must finish;
+                requests that cannot make it are shed with RequestShedError
+            
+        Returns:
+            ReGraph client view
+        """
+        # Create the transport first so the view shares it rather than opening its own.
+        self._transport
+        view = copy.copy(self)
+        if priority is not None:
+            view._priority = priority
+        if deadline is not None:
+            view._deadline = deadline
+        for name in self._NAMESPACES:
+            view.__dict__.pop(name, None)
+        return view
     
     def _request(
         self,
@@ -103,48 +274,223 @@ class ReGraph:
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Union[float, Timeout]] = None,
+        deadline: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        body: Optional[bytes] = None,
     ) -> Dict[str, Any]:
-        """Make an HTTP request to the API."""
-        url = f"{self.base_url}{endpoint}"
+        """Make an HTTP request to the API; ``body`` is sent instead of encoding ``data``."""
+        from ._json import dumps, loads
+        
+        path = endpoint
         
         if params:
             query_string = "&".join(f"{k}={v}" for k, v in params.items())
-            url = f"{url}?{query_string}"
+            path = f"{path}?{query_string}"
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
+        request_headers = {
             "Content-Type": "application/json",
+            **(headers or {}),
         }
         
-        body = json.dumps(data).encode("utf-8") if data else None
+        profile = None
+        if self.profiler is not None:
+            profile = self.profiler._begin("request", {"method": method, "endpoint": endpoint})
+        try:
+            if body is None and data:
+                body = dumps(data)
+            if profile is not None:
+                profile.lap("encode")
+            
+            model = data.get("model") if self.limiter is not None and data else None
+            if model is None:
+                _, payload = self._send(method, path, body, request_headers, timeout, deadline, cancel_token)
+            else:
+                # Time spent waiting for a slot counts against the call's total timeout.
+                deadline = self._call_deadline(self._call_timeout(timeout), deadline)
+                with self.limiter.slot(model, deadline):
+                    if profile is not None:
+                        profile.lap("limiter")
+                    _, payload = self._send(method, path, body, request_headers, timeout, deadline, cancel_token)
+            
+            response = loads(payload) if payload else {}
+            if profile is not None:
+                profile.lap("decode")
+            return response
+        finally:
+            if profile is not None:
+                profile.pop()
+    
+    def _send(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Union[float, Timeout]] = None,
+        deadline: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Tuple[int, bytes]:
+        """Send an encoded request through the transport; returns (status, body) or raises for errors."""
+        call_timeout = self._call_timeout(timeout)
+        deadline = self._call_deadline(call_timeout, deadline)
         
-        request = urllib.request.Request(
-            url,
-            data=body,
-            headers=headers,
-            method=method,
-        )
+        request_headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            **(headers or {}),
+        }
+        
+        from http.client import HTTPException
         
+        profile = self.profiler._begin("send") if self.profiler is not None else None
         try:
-            with urllib.request.urlopen(request, timeout=self.timeout) as response:
-                response_data = response.read().decode("utf-8")
-                return json.loads(response_data) if response_data else {}
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8")
-            try:
-                error_data = json.loads(error_body)
-                error_message = error_data.get("error", {}).get("message", str(e))
-            except json.JSONDecodeError:
-                error_message = error_body or str(e)
-            
-            if e.code == 401:
-                raise AuthenticationError(error_message, status_code=e.code)
-            elif e.code == 429:
-                raise RateLimitError(error_message, status_code=e.code)
+            if self.scheduler is None:
+                status, payload = self._transport.request(
+                    method, path, body, request_headers, call_timeout, deadline, cancel_token
+                )
             else:
-                raise ReGraphError(error_message, status_code=e.code)
-        except urllib.error.URLError as e:
-            raise ReGraphError(f"Connection error: {e.reason}")
+                with self.scheduler.slot(self._priority, deadline):
+                    if profile is not None:
+                        profile.lap("scheduler")
+                    status, payload = self._transport.request(
+                        method, path, body, request_headers, call_timeout, deadline, cancel_token
+                    )
+        except (OSError, HTTPException) as e:
+            raise ReGraphError(f"Connection error: {e}")
+        finally:
+            if profile is not None:
+                profile.lap("transport")  # What the transport's own phases did not cover
+                profile.pop()
+        
+        if status >= 400:
+            self._raise_for_status(status, payload)
+        return status, payload
+    
+    @staticmethod
+    def _raise_for_status(status: int, payload: bytes) -> None:
+        """Raise the error matching an HTTP error response."""
+        response_data = payload.decode("utf-8", errors="replace")
+        try:
+            error_data = json.loads(response_data)
+            error_message = error_data.get("error", {}).get("message", f"HTTP Error {status}")
+        except json.JSONDecodeError:
+            error_message = response_data or f"HTTP Error {status}"
+        
+        if status == 401:
+            raise AuthenticationError(error_message, status_code=status)
+        elif status == 429:
+            raise RateLimitError(error_message, status_code=status)
+        else:
+            raise ReGraphError(error_message, status_code=status)
+    
+    def _parse(self, model: Any, data: Dict[str, Any]) -> Any:
+        """Build ``model`` from response data, timed as a parse phase when profiling."""
+        if self.profiler is None:
+            return model.from_dict(data)
+        profile = self.profiler._begin("parse")
+        try:
+            return model.from_dict(data)
+        finally:
+            profile.lap(model.__name__)
+            profile.pop()
+    
+    def _call_timeout(self, timeout: Optional[Union[float, Timeout]]) -> Timeout:
+        """Resolve a per-call timeout against the client's defaults."""
+        from .timeouts import Timeout
+        
+        if timeout is None:
+            return self._timeout
+        if isinstance(timeout, Timeout):
+            return Timeout(
+                connect=timeout.connect if timeout.connect is not None else self._timeout.connect,
+                read=timeout.read if timeout.read is not None else self._timeout.read,
+                total=timeout.total if timeout.total is not None else self._timeout.total,
+            )
+        return Timeout(connect=self._timeout.connect, read=self._timeout.read, total=timeout)
+    
+    def _call_deadline(self, timeout: Timeout, deadline: Optional[float]) -> Optional[float]:
+        """Return the earliest of the call, view and total-timeout deadlines."""
+        candidates = [d for d in (deadline, self._deadline) if d is not None]
+        if timeout.total is not None:
+            candidates.append(time.monotonic() + timeout.total)
+        return min(candidates) if candidates else None
+    
+    def _journaled_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Dict[str, Any],
+        timeout: Optional[Union[float, Timeout]] = None,
+        deadline: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Make a request that creates server-side work, via the journal if one is set."""
+        if self.journal is None:
+            return self._request(
+                method,
+                endpoint,
+                data,
+                headers={"Idempotency-Key": idempotency_key} if idempotency_key else None,
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
+        
+        entry = self.journal.begin(method, endpoint, data, key=idempotency_key)
+        if entry.status == "done":
+            return entry.response or {}
+        return self._send_journaled(
+            entry,
+            timeout=timeout,
+            deadline=deadline,
+            cancel_token=cancel_token,
+        )
+    
+    def _send_journaled(
+        self,
+        entry: JournalEntry,
+        timeout: Optional[Union[float, Timeout]] = None,
+        deadline: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Dict[str, Any]:
+        """Send a journaled call with its idempotency key and record the outcome."""
+        assert self.journal is not None
+        try:
+            response = self._request(
+                entry.method,
+                entry.endpoint,
+                entry.data,
+                headers={"Idempotency-Key": entry.key},
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
+        except ReGraphError as e:
+            # Only a definitive client error settles the call; anything else
+            # (network, 5xx, 409 in-progress, 429) may still be retried with the same key.
+            if (
+                e.status_code is not None
+                and 400 <= e.status_code < 500
+                and e.status_code not in (408, 409, 429)
+            ):
+                self.journal.fail(entry.key, str(e))
+            raise
+        
+        self.journal.complete(entry.key, response)
+        return response
+    
+    def close(self) -> None:
+        """Close connections held by this client's transport."""
+        if "_transport" in self.__dict__:
+            self._transport.close()
+    
+    def __enter__(self) -> ReGraph:
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
     
     # ========== Chat Completions ==========
     
@@ -160,7 +506,7 @@ class ReGraph:
             def create(
                 self,
                 model: str,
-                messages: List[Union[Dict[str, str], ChatMessage]],
+                messages: Union[List[Union[Dict[str, str], ChatMessage]], MessageHistory],
                 temperature: float = 0.7,
                 max_tokens: Optional[int] = None,
                 top_p: float = 1.0,
@@ -168,6 +514,9 @@ class ReGraph:
                 presence_penalty: float = 0.0,
                 stop: Optional[List[str]] = None,
                 stream: bool = False,
+                timeout: Optional[Union[float, Timeout]] = None,
+                deadline: Optional[float] = None,
+                cancel_token: Optional[CancellationToken] = None,
                 **kwargs,
             ) -> ChatCompletion:
                 """
@@ -175,7 +524,8 @@ class ReGraph:
                 
                 Args:
                     model: Model ID (e.g., "gpt-5", "claude-3-opus", "llama-3-70b")
-                    messages: List of messages in the conversation
+                    messages: List of messages in the conversation, or a MessageHistory
+                        whose encoded messages are reused across turns
                     temperature: Sampling temperature (0-2)
                     max_tokens: Maximum tokens to generate
                     top_p: Nucleus sampling parameter
@@ -183,24 +533,33 @@ class ReGraph:
                     presence_penalty: Presence penalty (-2 to 2)
                     stop: Stop sequences
                     stream: Enable streaming (not yet supported)
+                    timeout: Total seconds allowed for this call, or a Timeout
+                    deadline: Absolute time.monotonic() time by which the call must finish
+                    cancel_token: CancellationToken that aborts the call when cancelled
                     
                 Returns:
                     ChatCompletion object
                 """
+                from .messages import MessageHistory, encode_chat_body
+                from .models import ChatCompletion, ChatMessage
+                
                 if stream:
                     raise NotImplementedError("Streaming is not yet supported in the Python SDK")
                 
-                # Convert ChatMessage objects to dicts
-                formatted_messages = []
-                for msg in messages:
-                    if isinstance(msg, ChatMessage):
-                        formatted_messages.append({
-                            "role": msg.role,
-                            "content": msg.content,
-                            **({"name": msg.name} if msg.name else {}),
-                        })
-                    else:
-                        formatted_messages.append(msg)
+                if isinstance(messages, MessageHistory):
+                    # Already encoded; the body is assembled from the cached bytes below.
+                    formatted_messages = messages
+                else:
+                    # Convert ChatMessage objects to dicts
+                    formatted_messages = []
+                    for msg in messages:
+                        if isinstance(msg, ChatMessage):
+                            fields = {"role": msg.role, "content": msg.content}
+                            if msg.name:
+                                fields["name"] = msg.name
+                            formatted_messages.append(fields)
+                        else:
+                            formatted_messages.append(msg)
                 
                 data = {
                     "model": model,
@@ -217,8 +576,33 @@ class ReGraph:
                 if stop is not None:
                     data["stop"] = stop
                 
-                response = self._client._request("POST", "/inference", data)
-                return ChatCompletion.from_dict(response)
+                cache = self._client.semantic_cache
+                if cache is not None:
+                    cached, probe = cache.lookup(
+                        self._client, data, deadline=deadline, cancel_token=cancel_token
+                    )
+                    if cached is not None:
+                        return cached
+                
+                body = None
+                if isinstance(messages, MessageHistory):
+                    body = encode_chat_body(data, messages)
+                
+                response = self._client._request(
+                    "POST",
+                    "/inference",
+                    data,
+                    timeout=timeout,
+                    deadline=deadline,
+                    cancel_token=cancel_token,
+                    body=body,
+                )
+                completion = self._client._parse(ChatCompletion, response)
+                if self._client.usage_store is not None:
+                    self._client.usage_store.record(completion.model or model, completion.usage)
+                if cache is not None and probe is not None:
+                    cache.add(probe, completion)
+                return completion
     
     # ========== Embeddings ==========
     
@@ -230,6 +614,9 @@ class ReGraph:
             self,
             model: str,
             input: Union[str, List[str]],
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
             **kwargs,
         ) -> Embedding:
             """
@@ -238,10 +625,15 @@ class ReGraph:
             Args:
                 model: Embedding model ID (e.g., "text-embedding-3-large")
                 input: Text or list of texts to embed
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
                 
             Returns:
                 Embedding object
             """
+            from .models import Embedding
+            
             data = {
                 "model": model,
                 "input": input,
@@ -249,8 +641,77 @@ class ReGraph:
                 **kwargs,
             }
             
-            response = self._client._request("POST", "/inference", data)
-            return Embedding.from_dict(response)
+            response = self._client._request(
+                "POST",
+                "/inference",
+                data,
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
+            embedding = self._client._parse(Embedding, response)
+            if self._client.usage_store is not None:
+                self._client.usage_store.record(embedding.model or model, embedding.usage)
+            return embedding
+        
+        def embed_corpus(
+            self,
+            corpus: Iterable[str],
+            path: str,
+            model: str,
+            batch_size: int = 256,
+            concurrency: int = 8,
+            max_pending: Optional[int] = None,
+            normalize: bool = True,
+            resume: bool = True,
+            max_retries: int = 5,
+            checkpoint_interval: float = 5.0,
+            progress: Optional[Callable[[CorpusProgress], None]] = None,
+            cancel_token: Optional[CancellationToken] = None,
+        ) -> CorpusProgress:
+            """
+            Embed a large collection of texts into a float32 matrix on disk.
+            
+            Reading and batching, concurrent requests, decoding and writing are
+            pipelined; at most ``max_pending`` batches are held in memory at once.
+            The result can be opened with ``VectorIndex.load(path)``; row i is the
+            embedding of the i-th text. Re-running with the same arguments after an
+            interruption skips batches that were already written.
+            
+            Args:
+                corpus: Texts to embed, in order (any iterable, read lazily)
+                path: Output directory
+                model: Embedding model ID
+                batch_size: Texts per request
+                concurrency: Requests in flight at once
+                max_pending: Batches read ahead of the writer (default: 2 x concurrency)
+                normalize: Store unit-length vectors
+                resume: Continue from an existing checkpoint in ``path``
+                max_retries: Retries per batch on rate limits, timeouts and 5xx errors
+                checkpoint_interval: Seconds between checkpoint writes
+                progress: Callback receiving a CorpusProgress after each batch
+                cancel_token: CancellationToken that stops the run
+                
+            Returns:
+                CorpusProgress with the final counts and throughput
+            """
+            from .corpus import embed_corpus
+            
+            return embed_corpus(
+                self._client,
+                corpus,
+                path,
+                model,
+                batch_size=batch_size,
+                concurrency=concurrency,
+                max_pending=max_pending,
+                normalize=normalize,
+                resume=resume,
+                max_retries=max_retries,
+                checkpoint_interval=checkpoint_interval,
+                progress=progress,
+                cancel_token=cancel_token,
+            )
     
     # ========== Images ==========
     
@@ -266,6 +727,9 @@ class ReGraph:
             size: str = "1024x1024",
             quality: str = "standard",
             style: str = "natural",
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
             **kwargs,
         ) -> ImageGeneration:
             """
@@ -278,10 +742,15 @@ class ReGraph:
                 size: Image size (e.g., "1024x1024")
                 quality: Image quality ("standard" or "hd")
                 style: Image style ("natural" or "vivid")
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
                 
             Returns:
                 ImageGeneration object
             """
+            from .models import ImageGeneration
+            
             data = {
                 "model": model,
                 "prompt": prompt,
@@ -293,8 +762,15 @@ class ReGraph:
                 **kwargs,
             }
             
-            response = self._client._request("POST", "/inference", data)
-            return ImageGeneration.from_dict(response)
+            response = self._client._request(
+                "POST",
+                "/inference",
+                data,
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
+            return self._client._parse(ImageGeneration, response)
     
     # ========== Audio ==========
     
@@ -309,6 +785,9 @@ class ReGraph:
             voice: str = "alloy",
             response_format: str = "mp3",
             speed: float = 1.0,
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
             **kwargs,
         ) -> AudioSpeech:
             """
@@ -320,10 +799,15 @@ class ReGraph:
                 voice: Voice ID
                 response_format: Audio format ("mp3", "opus", "aac", "flac")
                 speed: Speaking speed (0.25 to 4.0)
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
                 
             Returns:
                 AudioSpeech object with base64-encoded audio
             """
+            from .models import AudioSpeech
+            
             data = {
                 "model": model,
                 "input": input,
@@ -333,8 +817,15 @@ class ReGraph:
                 **kwargs,
             }
             
-            response = self._client._request("POST", "/audio/speech", data)
-            return AudioSpeech.from_dict(response)
+            response = self._client._request(
+                "POST",
+                "/audio/speech",
+                data,
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
+            return self._client._parse(AudioSpeech, response)
     
     # ========== Models ==========
     
@@ -349,6 +840,9 @@ class ReGraph:
             search: Optional[str] = None,
             page: int = 1,
             limit: int = 50,
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
         ) -> Dict[str, Any]:
             """
             List available models.
@@ -359,10 +853,15 @@ class ReGraph:
                 search: Search query
                 page: Page number
                 limit: Results per page
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
                 
             Returns:
                 Dict with models list and pagination info
             """
+            from .models import Model
+            
             params = {"page": str(page), "limit": str(limit)}
             if category:
                 params["category"] = category
@@ -371,8 +870,15 @@ class ReGraph:
             if search:
                 params["search"] = search
             
-            response = self._client._request("GET", "/models", params=params)
-            response["models"] = [Model.from_dict(m) for m in response.get("models", [])]
+            response = self._client._request(
+                "GET",
+                "/models",
+                params=params,
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
+            response["models"] = [self._client._parse(Model, m) for m in response.get("models", [])]
             return response
         
         def deploy(
@@ -382,6 +888,10 @@ class ReGraph:
             model_type: str = "lora",
             weights_url: Optional[str] = None,
             config: Optional[Dict[str, Any]] = None,
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
+            idempotency_key: Optional[str] = None,
         ) -> Dict[str, Any]:
             """
             Deploy a custom model.
@@ -392,6 +902,11 @@ class ReGraph:
                 model_type: Type of model ("lora", "full", "quantized")
                 weights_url: URL to model weights
                 config: Additional configuration
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
+                idempotency_key: Key that makes repeated calls return the first call's
+                    result (default: a new key per call)
                 
             Returns:
                 Deployment status
@@ -406,7 +921,15 @@ class ReGraph:
             if config:
                 data["config"] = config
             
-            return self._client._request("POST", "/models/deploy", data)
+            return self._client._journaled_request(
+                "POST",
+                "/models/deploy",
+                data,
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+                idempotency_key=idempotency_key,
+            )
     
     # ========== Training ==========
     
@@ -425,6 +948,10 @@ class ReGraph:
                 dataset: str,
                 config: Optional[Union[Dict[str, Any], TrainingConfig]] = None,
                 callback_url: Optional[str] = None,
+                timeout: Optional[Union[float, Timeout]] = None,
+                deadline: Optional[float] = None,
+                cancel_token: Optional[CancellationToken] = None,
+                idempotency_key: Optional[str] = None,
             ) -> TrainingJob:
                 """
                 Create a new training job.
@@ -434,10 +961,18 @@ class ReGraph:
                     dataset: URL to training dataset
                     config: Training configuration
                     callback_url: Webhook URL for status updates
+                    timeout: Total seconds allowed for this call, or a Timeout
+                    deadline: Absolute time.monotonic() time by which the call must finish
+                    cancel_token: CancellationToken that aborts the call when cancelled
+                    idempotency_key: Key that makes repeated calls return the first call's
+                        result (default: a new key per call)
                     
                 Returns:
                     TrainingJob object
                 """
+                from dataclasses import asdict
+                from .models import TrainingJob, TrainingConfig
+                
                 if isinstance(config, TrainingConfig):
                     config_dict = asdict(config)
                 else:
@@ -451,43 +986,281 @@ class ReGraph:
                 if callback_url:
                     data["callback_url"] = callback_url
                 
-                response = self._client._request("POST", "/training/jobs", data)
-                return TrainingJob.from_dict(response)
+                response = self._client._journaled_request(
+                    "POST",
+                    "/training/jobs",
+                    data,
+                    timeout=timeout,
+                    deadline=deadline,
+                    cancel_token=cancel_token,
+                    idempotency_key=idempotency_key,
+                )
+                return self._client._parse(TrainingJob, response)
             
-            def get(self, job_id: str) -> TrainingJob:
+            def get(
+                self,
+                job_id: str,
+                timeout: Optional[Union[float, Timeout]] = None,
+                deadline: Optional[float] = None,
+                cancel_token: Optional[CancellationToken] = None,
+            ) -> TrainingJob:
                 """
                 Get training job status.
                 
                 Args:
                     job_id: Training job ID
+                    timeout: Total seconds allowed for this call, or a Timeout
+                    deadline: Absolute time.monotonic() time by which the call must finish
+                    cancel_token: CancellationToken that aborts the call when cancelled
                     
                 Returns:
                     TrainingJob object
                 """
-                response = self._client._request("GET", f"/training/jobs/{job_id}")
-                return TrainingJob.from_dict(response)
+                from .models import TrainingJob
+                
+                response = self._client._request(
+                    "GET",
+                    f"/training/jobs/{job_id}",
+                    timeout=timeout,
+                    deadline=deadline,
+                    cancel_token=cancel_token,
+                )
+                return self._client._parse(TrainingJob, response)
             
-            def list(self) -> List[TrainingJob]:
+            def list(
+                self,
+                timeout: Optional[Union[float, Timeout]] = None,
+                deadline: Optional[float] = None,
+                cancel_token: Optional[CancellationToken] = None,
+            ) -> List[TrainingJob]:
                 """
                 List all training jobs.
                 
+                Args:
+                    timeout: Total seconds allowed for this call, or a Timeout
+                    deadline: Absolute time.monotonic() time by which the call must finish
+                    cancel_token: CancellationToken that aborts the call when cancelled
+                
                 Returns:
                     List of TrainingJob objects
                 """
-                response = self._client._request("GET", "/training/jobs")
-                return [TrainingJob.from_dict(j) for j in response.get("jobs", [])]
+                from .models import TrainingJob
+                
+                response = self._client._request(
+                    "GET",
+                    "/training/jobs",
+                    timeout=timeout,
+                    deadline=deadline,
+                    cancel_token=cancel_token,
+                )
+                return [self._client._parse(TrainingJob, j) for j in response.get("jobs", [])]
             
-            def cancel(self, job_id: str) -> Dict[str, Any]:
+            def cancel(
+                self,
+                job_id: str,
+                timeout: Optional[Union[float, Timeout]] = None,
+                deadline: Optional[float] = None,
+                cancel_token: Optional[CancellationToken] = None,
+            ) -> Dict[str, Any]:
                 """
                 Cancel a training job.
                 
                 Args:
                     job_id: Training job ID
+                    timeout: Total seconds allowed for this call, or a Timeout
+                    deadline: Absolute time.monotonic() time by which the call must finish
+                    cancel_token: CancellationToken that aborts the call when cancelled
                     
                 Returns:
                     Cancellation status
                 """
-                return self._client._request("DELETE", f"/training/jobs/{job_id}")
+                return self._client._request(
+                    "DELETE",
+                    f"/training/jobs/{job_id}",
+                    timeout=timeout,
+                    deadline=deadline,
+                    cancel_token=cancel_token,
+                )
+            
+            def watch(
+                self,
+                job_ids: Iterable[str],
+                poll_interval: float = 5.0,
+                max_poll_interval: float = 60.0,
+                until_done: bool = True,
+                cancel_token: Optional[CancellationToken] = None,
+            ) -> Iterator[TrainingJobEvent]:
+                """
+                Follow several training jobs, yielding only changes.
+                
+                All jobs are polled from one loop; an event is yielded the first
+                time each job is seen and whenever its status, progress or ETA
+                changes. Polling backs off while nothing changes.
+                
+                Args:
+                    job_ids: Training job IDs to watch
+                    poll_interval: Seconds between polls while jobs are changing
+                    max_poll_interval: Upper bound as polling backs off
+                    until_done: Stop watching each job once it completes, fails
+                        or is cancelled; the iterator ends when all have
+                    cancel_token: CancellationToken that stops watching
+                    
+                Returns:
+                    Iterator of TrainingJobEvent objects
+                """
+                from .training import watch_jobs
+                
+                return watch_jobs(
+                    self._client,
+                    job_ids,
+                    poll_interval=poll_interval,
+                    max_poll_interval=max_poll_interval,
+                    until_done=until_done,
+                    cancel_token=cancel_token,
+                )
+            
+            def artifacts(
+                self,
+                job_id: str,
+                timeout: Optional[Union[float, Timeout]] = None,
+                deadline: Optional[float] = None,
+                cancel_token: Optional[CancellationToken] = None,
+            ) -> List[TrainingArtifact]:
+                """
+                List the files produced by a training job.
+                
+                Args:
+                    job_id: Training job ID
+                    timeout: Total seconds allowed for this call, or a Timeout
+                    deadline: Absolute time.monotonic() time by which the call must finish
+                    cancel_token: CancellationToken that aborts the call when cancelled
+                    
+                Returns:
+                    List of TrainingArtifact objects
+                """
+                from .models import TrainingArtifact
+                
+                response = self._client._request(
+                    "GET",
+                    f"/training/jobs/{job_id}/artifacts",
+                    timeout=timeout,
+                    deadline=deadline,
+                    cancel_token=cancel_token,
+                )
+                return [self._client._parse(TrainingArtifact, a) for a in response.get("artifacts", [])]
+            
+            def download(
+                self,
+                job_id: str,
+                directory: str,
+                names: Optional[List[str]] = None,
+                concurrency: int = 8,
+                part_size: int = 8 * 1024 * 1024,
+                resume: bool = True,
+                progress: Optional[Callable[[str, DownloadProgress], None]] = None,
+                cancel_token: Optional[CancellationToken] = None,
+            ) -> List[str]:
+                """
+                Download a training job's artifacts with parallel range requests.
+                
+                Each file is fetched in parts, resumes from where an interrupted
+                download stopped, and is verified against its SHA-256.
+                
+                Args:
+                    job_id: Training job ID
+                    directory: Directory to write the artifacts to
+                    names: Artifact names to download (default: all)
+                    concurrency: Parallel range requests per file
+                    part_size: Bytes per range request
+                    resume: Continue interrupted downloads
+                    progress: Callback receiving (artifact name, DownloadProgress)
+                    cancel_token: CancellationToken that aborts the download
+                    
+                Returns:
+                    Paths of the downloaded files
+                """
+                import os
+                from .downloads import download_file
+                
+                paths = []
+                for artifact in self.artifacts(job_id, cancel_token=cancel_token):
+                    if names is not None and artifact.name not in names:
+                        continue
+                    path = os.path.join(directory, artifact.name)
+                    download_file(
+                        self._client,
+                        artifact.url,
+                        path,
+                        size=artifact.size_bytes,
+                        sha256=artifact.sha256,
+                        part_size=part_size,
+                        concurrency=concurrency,
+                        resume=resume,
+                        progress=(lambda p, name=artifact.name: progress(name, p)) if progress else None,
+                        cancel_token=cancel_token,
+                    )
+                    paths.append(path)
+                return paths
+    
+    # ========== Files ==========
+    
+    class _FilesNamespace:
+        def __init__(self, client: "ReGraph"):
+            self._client = client
+        
+        def upload(
+            self,
+            path: str,
+            purpose: str = "dataset",
+            filename: Optional[str] = None,
+            part_size: int = 16 * 1024 * 1024,
+            concurrency: int = 4,
+            resume: bool = True,
+            max_retries: int = 5,
+            manifest_path: Optional[str] = None,
+            progress: Optional[Callable[[UploadProgress], None]] = None,
+            cancel_token: Optional[CancellationToken] = None,
+        ) -> UploadedFile:
+            """
+            Upload a local file in parallel chunks.
+            
+            The file is memory-mapped and sent as parts, ``concurrency`` at a
+            time, each retried on rate limits, timeouts and server errors.
+            Completed parts are recorded in a manifest (``<path>.upload.json``
+            by default), so calling upload() again after an interruption only
+            sends the missing parts.
+            
+            Args:
+                path: Local file to upload
+                purpose: What the file is for ("dataset" or "weights")
+                filename: Name to store the file under (default: the file's name)
+                part_size: Bytes per part
+                concurrency: Parts in flight at once
+                resume: Continue an interrupted upload of the same, unchanged file
+                max_retries: Retries per part
+                manifest_path: Where to keep the resume manifest
+                progress: Callback receiving an UploadProgress after each part
+                cancel_token: CancellationToken that aborts the upload (it can be resumed)
+                
+            Returns:
+                UploadedFile whose ``url`` can be passed as ``dataset`` to
+                training.jobs.create or as ``weights_url`` to models.deploy
+            """
+            from .uploads import upload_file
+            
+            return upload_file(
+                self._client,
+                path,
+                purpose=purpose,
+                filename=filename,
+                part_size=part_size,
+                concurrency=concurrency,
+                resume=resume,
+                max_retries=max_retries,
+                manifest_path=manifest_path,
+                progress=progress,
+                cancel_token=cancel_token,
+            )
     
     # ========== Batch Processing ==========
     
@@ -499,6 +1272,10 @@ class ReGraph:
             self,
             requests: List[Union[Dict[str, Any], BatchRequest]],
             webhook_url: Optional[str] = None,
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
+            idempotency_key: Optional[str] = None,
         ) -> BatchJob:
             """
             Create a batch processing job.
@@ -506,10 +1283,18 @@ class ReGraph:
             Args:
                 requests: List of inference requests
                 webhook_url: Webhook URL for completion notification
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
+                idempotency_key: Key that makes repeated calls return the first call's
+                    result (default: a new key per call)
                 
             Returns:
                 BatchJob object
             """
+            from dataclasses import asdict
+            from .models import BatchJob, BatchRequest
+            
             formatted_requests = []
             for req in requests:
                 if isinstance(req, BatchRequest):
@@ -521,21 +1306,96 @@ class ReGraph:
             if webhook_url:
                 data["webhook_url"] = webhook_url
             
-            response = self._client._request("POST", "/batch", data)
-            return BatchJob.from_dict(response)
+            response = self._client._journaled_request(
+                "POST",
+                "/batch",
+                data,
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+                idempotency_key=idempotency_key,
+            )
+            return self._client._parse(BatchJob, response)
         
-        def get(self, batch_id: str) -> BatchJob:
+        def get(
+            self,
+            batch_id: str,
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
+        ) -> BatchJob:
             """
             Get batch job status.
             
             Args:
                 batch_id: Batch job ID
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
                 
             Returns:
                 BatchJob object
             """
-            response = self._client._request("GET", f"/batch/{batch_id}")
-            return BatchJob.from_dict(response)
+            from .models import BatchJob
+            
+            response = self._client._request(
+                "GET",
+                f"/batch/{batch_id}",
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
+            return self._client._parse(BatchJob, response)
+        
+        def run(
+            self,
+            requests: List[Union[Dict[str, Any], BatchRequest]],
+            shard_size: int = 1000,
+            max_concurrency: int = 8,
+            max_active_batches: Optional[int] = None,
+            poll_interval: float = 5.0,
+            max_poll_interval: float = 60.0,
+            max_attempts: int = 3,
+            webhook_url: Optional[str] = None,
+            progress: Optional[Callable[[BatchRunProgress], None]] = None,
+            cancel_token: Optional[CancellationToken] = None,
+        ) -> BatchRunResult:
+            """
+            Run a workload of any size as many sharded batch jobs.
+            
+            Shards are submitted concurrently, tracked by one poller, failed
+            items are resubmitted on their own, and results come back in the
+            order of ``requests``.
+            
+            Args:
+                requests: List of inference requests
+                shard_size: Requests per server batch
+                max_concurrency: Parallel create/get calls
+                max_active_batches: Batches allowed in flight at once (default: unlimited)
+                poll_interval: Initial seconds between status rounds
+                max_poll_interval: Upper bound as polling backs off while nothing changes
+                max_attempts: Submissions per item, including the first
+                webhook_url: Webhook URL passed to every batch
+                progress: Callback receiving a BatchRunProgress after each poll round
+                cancel_token: CancellationToken that stops submitting and polling
+                
+            Returns:
+                BatchRunResult with per-request results and errors
+            """
+            from .batches import BatchOrchestrator
+            
+            orchestrator = BatchOrchestrator(
+                self._client,
+                shard_size=shard_size,
+                max_concurrency=max_concurrency,
+                max_active_batches=max_active_batches,
+                poll_interval=poll_interval,
+                max_poll_interval=max_poll_interval,
+                max_attempts=max_attempts,
+                webhook_url=webhook_url,
+                progress=progress,
+            )
+            return orchestrator.run(requests, cancel_token=cancel_token)
     
     # ========== Usage ==========
     
@@ -547,6 +1407,9 @@ class ReGraph:
             self,
             start_date: Optional[str] = None,
             end_date: Optional[str] = None,
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
         ) -> UsageStats:
             """
             Get usage statistics.
@@ -554,18 +1417,30 @@ class ReGraph:
             Args:
                 start_date: Start date (YYYY-MM-DD)
                 end_date: End date (YYYY-MM-DD)
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
                 
             Returns:
                 UsageStats object
             """
+            from .models import UsageStats
+            
             params = {}
             if start_date:
                 params["start_date"] = start_date
             if end_date:
                 params["end_date"] = end_date
             
-            response = self._client._request("GET", "/usage", params=params if params else None)
-            return UsageStats.from_dict(response)
+            response = self._client._request(
+                "GET",
+                "/usage",
+                params=params if params else None,
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
+            return self._client._parse(UsageStats, response)
     
     # ========== Devices ==========
     
@@ -573,15 +1448,33 @@ class ReGraph:
         def __init__(self, client: "ReGraph"):
             self._client = client
         
-        def list(self) -> List[Device]:
+        def list(
+            self,
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
+        ) -> List[Device]:
             """
             List provider devices.
             
+            Args:
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
+            
             Returns:
                 List of Device objects
             """
-            response = self._client._request("GET", "/devices")
-            return [Device.from_dict(d) for d in response.get("devices", [])]
+            from .models import Device
+            
+            response = self._client._request(
+                "GET",
+                "/devices",
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
+            return [self._client._parse(Device, d) for d in response.get("devices", [])]
     
     # ========== Status ==========
     
@@ -589,15 +1482,33 @@ class ReGraph:
         def __init__(self, client: "ReGraph"):
             self._client = client
         
-        def get(self) -> PlatformStatus:
+        def get(
+            self,
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
+        ) -> PlatformStatus:
             """
             Get platform status.
             
+            Args:
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
+            
             Returns:
                 PlatformStatus object
             """
-            response = self._client._request("GET", "/status")
-            return PlatformStatus.from_dict(response)
+            from .models import PlatformStatus
+            
+            response = self._client._request(
+                "GET",
+                "/status",
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
+            return self._client._parse(PlatformStatus, response)
     
     # ========== Provider ==========
     
@@ -611,6 +1522,9 @@ class ReGraph:
             hardware_type: str,
             compute_units: int,
             location: Optional[str] = None,
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
         ) -> Dict[str, Any]:
             """
             Register as a hardware provider.
@@ -620,6 +1534,9 @@ class ReGraph:
                 hardware_type: Type of hardware (e.g., "gpu", "tpu", "npu")
                 compute_units: Number of compute units
                 location: Geographic location
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
                 
             Returns:
                 Registration status
@@ -632,12 +1549,22 @@ class ReGraph:
             if location:
                 data["location"] = location
             
-            return self._client._request("POST", "/provider/register", data)
+            return self._client._request(
+                "POST",
+                "/provider/register",
+                data,
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
         
         def earnings(
             self,
             start_date: Optional[str] = None,
             end_date: Optional[str] = None,
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
         ) -> Dict[str, Any]:
             """
             Get provider earnings.
@@ -645,6 +1572,9 @@ class ReGraph:
             Args:
                 start_date: Start date (YYYY-MM-DD)
                 end_date: End date (YYYY-MM-DD)
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
                 
             Returns:
                 Earnings data
@@ -655,7 +1585,59 @@ class ReGraph:
             if end_date:
                 params["end_date"] = end_date
             
-            return self._client._request("GET", "/provider/earnings", params=params if params else None)
+            return self._client._request(
+                "GET",
+                "/provider/earnings",
+                params=params if params else None,
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
+        
+        def telemetry(
+            self,
+            device_id: str,
+            sample_interval: float = 1.0,
+            push_interval: float = 15.0,
+            capacity: int = 3600,
+            gpu_interval: float = 5.0,
+            samplers: Optional[List[Callable[[], Dict[str, float]]]] = None,
+            start: bool = True,
+        ) -> TelemetryAgent:
+            """
+            Report this device's load and health in the background.
+            
+            CPU, memory and GPU metrics are sampled every ``sample_interval``
+            seconds into ring buffers and pushed in batches every
+            ``push_interval`` seconds; samples that fail to push are retried
+            with the next batch.
+            
+            Args:
+                device_id: Device ID returned by register()
+                sample_interval: Seconds between samples
+                push_interval: Seconds between pushes
+                capacity: Samples kept per metric while pushes are failing
+                gpu_interval: Seconds between nvidia-smi samples
+                samplers: Callables returning metric name -> value, replacing
+                    the built-in system and GPU samplers
+                start: Start the agent's background thread immediately
+                
+            Returns:
+                TelemetryAgent; stop() it (or use it as a context manager) to
+                push the remaining samples and stop
+            """
+            from .telemetry import TelemetryAgent
+            
+            agent = TelemetryAgent(
+                self._client,
+                device_id,
+                sample_interval=sample_interval,
+                push_interval=push_interval,
+                capacity=capacity,
+                gpu_interval=gpu_interval,
+                samplers=samplers,
+            )
+            return agent.start() if start else agent
     
     # ========== Hardware Rental ==========
     
@@ -668,6 +1650,10 @@ class ReGraph:
             gpu_type: str,
             gpu_count: int = 1,
             duration_hours: int = 1,
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
+            idempotency_key: Optional[str] = None,
         ) -> Dict[str, Any]:
             """
             Rent hardware resources.
@@ -676,6 +1662,11 @@ class ReGraph:
                 gpu_type: Type of GPU (e.g., "a100", "h100", "rtx-4090")
                 gpu_count: Number of GPUs
                 duration_hours: Rental duration in hours
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
+                idempotency_key: Key that makes repeated calls return the first call's
+                    result (default: a new key per call)
                 
             Returns:
                 Rental confirmation
@@ -686,4 +1677,100 @@ class ReGraph:
                 "duration_hours": duration_hours,
             }
             
-            return self._client._request("POST", "/hardware/rent", data)
+            return self._client._journaled_request(
+                "POST",
+                "/hardware/rent",
+                data,
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+                idempotency_key=idempotency_key,
+            )
+        
+        def quote(
+            self,
+            gpu_type: str,
+            gpu_count: int = 1,
+            duration_hours: int = 1,
+            timeout: Optional[Union[float, Timeout]] = None,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None,
+        ) -> Dict[str, Any]:
+            """
+            Price a rental without booking it.
+            
+            Not every deployment serves this endpoint; where it does not, the
+            call raises ReGraphError with status 404 and the rental prices are
+            those in ``regraph.planner.DEFAULT_PRICES``.
+            
+            Args:
+                gpu_type: Type of GPU (e.g., "A100", "H100", "RTX 4090")
+                gpu_count: Number of GPUs
+                duration_hours: Rental duration in hours
+                timeout: Total seconds allowed for this call, or a Timeout
+                deadline: Absolute time.monotonic() time by which the call must finish
+                cancel_token: CancellationToken that aborts the call when cancelled
+                
+            Returns:
+                Quote with price_per_hour, total_cost_usd and available
+            """
+            data = {
+                "gpu_type": gpu_type,
+                "gpu_count": gpu_count,
+                "duration_hours": duration_hours,
+            }
+            
+            return self._client._request(
+                "POST",
+                "/hardware/quote",
+                data,
+                timeout=timeout,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
+        
+        def planner(
+            self,
+            gpu_types: Optional[List[str]] = None,
+            gpu_counts: Iterable[int] = (1, 2, 4, 8),
+            throughput: Optional[Dict[str, float]] = None,
+            scaling_efficiency: float = 0.9,
+            slots_per_gpu: int = 16,
+            quote_ttl: float = 300.0,
+            prices: Optional[Union[Dict[str, float], Callable[[str, int], Tuple[float, bool]]]] = None,
+        ) -> CapacityPlanner:
+            """
+            Create a capacity planner over a grid of GPU types and counts.
+            
+            The planner quotes every configuration (caching quotes for
+            ``quote_ttl`` seconds), scores them against a workload and
+            recommends the cheapest one that meets a deadline. If the API
+            does not serve quotes it uses the list prices in
+            ``regraph.planner.DEFAULT_PRICES``.
+            
+            Args:
+                gpu_types: GPU types to consider (default: all with known throughput)
+                gpu_counts: GPU counts to consider for each type
+                throughput: Tokens/s per GPU by type, replacing the built-in estimates
+                scaling_efficiency: Throughput kept each time the GPU count doubles
+                slots_per_gpu: Requests one GPU serves concurrently
+                quote_ttl: Seconds a quote is reused
+                prices: USD per GPU-hour by type, or a function returning
+                    (price per hour, available) for a GPU type and count,
+                    used instead of quotes
+                
+            Returns:
+                CapacityPlanner
+            """
+            from .planner import CapacityPlanner
+            
+            return CapacityPlanner(
+                self._client,
+                gpu_types=gpu_types,
+                gpu_counts=tuple(gpu_counts),
+                throughput=throughput,
+                scaling_efficiency=scaling_efficiency,
+                slots_per_gpu=slots_per_gpu,
+                quote_ttl=quote_ttl,
+                prices=prices,
+            )
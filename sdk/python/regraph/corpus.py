@@ -0,0 +1,298 @@
+"""
+ReGraph SDK - Corpus Embedding
+
+Pipelined embedding of large text collections. Documents are read and batched
+on the calling thread, batches are embedded concurrently, and each response is
+decoded to float32 and written straight to its position in the output file.
+The number of batches in flight is bounded, so memory use does not grow with
+the size of the corpus.
+
+The output directory uses the ``regraph.vectors`` layout (``vectors.f32`` plus
+``meta.json``) and can be opened with ``VectorIndex.load``. A ``checkpoint.json``
+records completed batches while the run is in progress, so an interrupted run
+resumes where it stopped.
+"""
+
+import json
+import os
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from ._retry import backoff, retryable
+from .errors import ReGraphError
+from .vectors import FORMAT_VERSION, META_FILE, VECTORS_FILE
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+if TYPE_CHECKING:
+    from .client import ReGraph
+    from .timeouts import CancellationToken
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+@dataclass
+class CorpusProgress:
+    """Throughput snapshot of an embed_corpus() run."""
+    documents: int  # Documents embedded so far in this run
+    skipped: int  # Documents already embedded by an earlier run
+    batches: int
+    tokens: int
+    retries: int
+    elapsed: float  # Seconds since the run started
+    in_flight: int  # Batches submitted but not yet written
+
+    @property
+    def documents_per_second(self) -> float:
+        return self.documents / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _batches(corpus: Iterable[str], batch_size: int) -> Iterator[List[str]]:
+    batch: List[str] = []
+    for text in corpus:
+        batch.append(text)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _decode(vectors: List[List[float]], normalize: bool) -> Tuple[bytes, int]:
+    """Convert embedding lists to raw float32 bytes; returns (bytes, dim)."""
+    if np is not None:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if normalize:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix /= norms
+        return matrix.tobytes(), matrix.shape[1]
+
+    dim = len(vectors[0])
+    out = array("f")
+    for vector in vectors:
+        if len(vector) != dim:
+            raise ValueError("Embeddings in one response have different dimensions")
+        if normalize:
+            norm = sum(x * x for x in vector) ** 0.5 or 1.0
+            vector = [x / norm for x in vector]
+        out.extend(vector)
+    return out.tobytes(), dim
+
+
+class _CorpusWriter:
+    """Positional writer for the output matrix plus its checkpoint."""
+
+    def __init__(self, path: str, model: str, batch_size: int, normalize: bool, resume: bool):
+        self.path = path
+        self.model = model
+        self.batch_size = batch_size
+        self.normalize = normalize
+        self.dim: Optional[int] = None
+        self.count = 0
+        self.done: Set[int] = set()
+        self._lock = threading.Lock()
+        self._last_checkpoint = time.monotonic()
+
+        os.makedirs(path, exist_ok=True)
+        checkpoint_path = os.path.join(path, CHECKPOINT_FILE)
+        meta_path = os.path.join(path, META_FILE)
+        if resume and os.path.exists(checkpoint_path):
+            with open(checkpoint_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self._check_compatible(state)
+            self.dim = state["dim"]
+            self.count = state["count"]
+            self.done = set(range(state["through"])) | set(state["done"])
+        elif resume and os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self._check_compatible(meta)
+            self.dim = meta["dim"]
+            self.count = meta["count"]
+            self.done = set(range(-(-self.count // batch_size)))
+        else:
+            for name in (CHECKPOINT_FILE, META_FILE):
+                if os.path.exists(os.path.join(path, name)):
+                    os.remove(os.path.join(path, name))
+            open(os.path.join(path, VECTORS_FILE), "wb").close()
+
+        self._file = open(os.path.join(path, VECTORS_FILE), "r+b")
+
+    def _check_compatible(self, state: dict) -> None:
+        expected = {"model": self.model, "batch_size": self.batch_size, "normalized": self.normalize}
+        for key, value in expected.items():
+            if key in state and state[key] != value:
+                raise ValueError(
+                    f"Cannot resume {self.path}: it was written with {key}={state[key]!r}, not {value!r}"
+                )
+
+    def write(self, batch_index: int, size: int, payload: bytes, dim: int) -> None:
+        with self._lock:
+            if self.dim is None:
+                self.dim = dim
+            elif dim != self.dim:
+                raise ValueError(f"Expected embeddings of dimension {self.dim}, got {dim}")
+            row_bytes = self.dim * 4
+            self._file.seek(batch_index * self.batch_size * row_bytes)
+            self._file.write(payload)
+            self.done.add(batch_index)
+            self.count = max(self.count, batch_index * self.batch_size + size)
+
+    def checkpoint(self, interval: float = 0.0) -> None:
+        """Persist the set of completed batches once the data they refer to is on disk."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_checkpoint < interval:
+                return
+            self._last_checkpoint = now
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            # Completed batches are mostly a contiguous prefix; store that as a
+            # watermark and list only the out-of-order ones after it.
+            through = 0
+            while through in self.done:
+                through += 1
+            state = {
+                "model": self.model,
+                "batch_size": self.batch_size,
+                "normalized": self.normalize,
+                "dim": self.dim,
+                "count": self.count,
+                "through": through,
+                "done": sorted(i for i in self.done if i > through),
+            }
+            _write_json(os.path.join(self.path, CHECKPOINT_FILE), state)
+
+    def finish(self) -> None:
+        with self._lock:
+            self._file.flush()
+            if self.dim is not None:
+                self._file.truncate(self.count * self.dim * 4)
+            os.fsync(self._file.fileno())
+            self._file.close()
+            meta = {
+                "version": FORMAT_VERSION,
+                "dim": self.dim or 0,
+                "count": self.count,
+                "normalized": self.normalize,
+                "ids": False,
+                "model": self.model,
+                "batch_size": self.batch_size,
+            }
+            _write_json(os.path.join(self.path, META_FILE), meta)
+            checkpoint_path = os.path.join(self.path, CHECKPOINT_FILE)
+            if os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+def _write_json(path: str, obj: dict) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(obj, f)
+    os.replace(tmp_path, path)
+
+
+def embed_corpus(
+    client: "ReGraph",
+    corpus: Iterable[str],
+    path: str,
+    model: str,
+    batch_size: int = 256,
+    concurrency: int = 8,
+    max_pending: Optional[int] = None,
+    normalize: bool = True,
+    resume: bool = True,
+    max_retries: int = 5,
+    checkpoint_interval: float = 5.0,
+    progress: Optional[Callable[[CorpusProgress], None]] = None,
+    cancel_token: Optional["CancellationToken"] = None,
+) -> CorpusProgress:
+    """Implementation of ``client.embeddings.embed_corpus``; see its docstring."""
+    if batch_size < 1 or concurrency < 1:
+        raise ValueError("batch_size and concurrency must be at least 1")
+    max_pending = max_pending or 2 * concurrency
+
+    writer = _CorpusWriter(path, model, batch_size, normalize, resume)
+    slots = threading.BoundedSemaphore(max_pending)
+    stats_lock = threading.Lock()
+    stats = CorpusProgress(documents=0, skipped=0, batches=0, tokens=0, retries=0, elapsed=0.0, in_flight=0)
+    errors: List[BaseException] = []
+    started = time.monotonic()
+
+    def embed(batch_index: int, texts: List[str]) -> None:
+        try:
+            for attempt in range(max_retries + 1):
+                try:
+                    response = client.embeddings.create(model=model, input=texts, cancel_token=cancel_token)
+                    break
+                except ReGraphError as e:
+                    if attempt == max_retries or not retryable(e) or errors:
+                        raise
+                    with stats_lock:
+                        stats.retries += 1
+                    time.sleep(backoff(attempt))
+
+            data = sorted(response.data, key=lambda e: e.index)
+            if len(data) != len(texts):
+                raise ReGraphError(f"Expected {len(texts)} embeddings, got {len(data)}")
+            payload, dim = _decode([e.embedding for e in data], normalize)
+            writer.write(batch_index, len(texts), payload, dim)
+
+            with stats_lock:
+                stats.documents += len(texts)
+                stats.batches += 1
+                stats.tokens += response.usage.total_tokens
+                stats.in_flight -= 1
+                stats.elapsed = time.monotonic() - started
+                snapshot = CorpusProgress(**vars(stats))
+            writer.checkpoint(checkpoint_interval)
+            if progress is not None:
+                progress(snapshot)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            slots.release()
+
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="regraph-embed")
+    try:
+        for batch_index, texts in enumerate(_batches(corpus, batch_size)):
+            if batch_index in writer.done:
+                stats.skipped += len(texts)
+                continue
+            # Blocks while max_pending batches are in flight (backpressure).
+            slots.acquire()
+            if errors:
+                slots.release()
+                break
+            with stats_lock:
+                stats.in_flight += 1
+            executor.submit(embed, batch_index, texts)
+        executor.shutdown(wait=True)
+        if errors:
+            raise errors[0]
+    except BaseException:
+        # Keep whatever finished so a later run can resume from it.
+        executor.shutdown(wait=True)
+        writer.checkpoint()
+        writer.close()
+        raise
+
+    writer.finish()
+    stats.elapsed = time.monotonic() - started
+    return stats
@@ -0,0 +1,352 @@
+"""
+ReGraph SDK - Parallel Downloads
+
+Downloads large files (training artifacts, model weights) as concurrent HTTP
+range requests written straight to their offsets in a ``.part`` file. A
+``.download.json`` manifest next to it records completed parts, so an
+interrupted download resumes with only the missing parts. The finished file is
+checked against its SHA-256 before it is moved into place. A server that
+ignores the Range header answers with the whole file instead; that response is
+streamed to disk and the other part requests are cancelled.
+
+URLs under the client's base URL are fetched through the client (with its
+credentials, transport and scheduler); other URLs, such as pre-signed storage
+links, get their own connection pool and no API key.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Callable, ContextManager, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from ._retry import backoff, retryable
+from .errors import RateLimitError, ReGraphError
+
+if TYPE_CHECKING:
+    from .client import ReGraph
+    from .timeouts import CancellationToken
+    from .transport import Transport
+
+PART_SUFFIX = ".part"
+MANIFEST_SUFFIX = ".download.json"
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class DownloadProgress:
+    """Progress of one file download."""
+    bytes_done: int  # Including parts completed by an earlier, interrupted run
+    bytes_total: int
+    parts_done: int
+    parts_total: int
+    retries: int
+    elapsed: float
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_done / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class _Manifest:
+    """Completed parts of a download, persisted next to the .part file."""
+
+    def __init__(self, path: str, url: str, size: int, sha256: Optional[str], part_size: int, resume: bool):
+        self.path = path + MANIFEST_SUFFIX
+        self.part_path = path + PART_SUFFIX
+        # Pre-signed URLs change between listings; identify the file by its content when possible.
+        self.identity = {"size": size, "sha256": sha256, "part_size": part_size}
+        if sha256 is None:
+            self.identity["url"] = url
+        self.done: Set[int] = set()
+        self._lock = threading.Lock()
+        self._last_checkpoint = time.monotonic()
+
+        state = None
+        if resume and os.path.exists(self.path) and os.path.exists(self.part_path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        if state is not None and all(state.get(k) == v for k, v in self.identity.items()):
+            self.done = set(state["done"])
+        else:
+            with open(self.part_path, "wb") as f:
+                f.truncate(size)
+        self._file = open(self.part_path, "r+b")
+
+    def write(self, part: Optional[int], offset: int, payload: bytes) -> None:
+        with self._lock:
+            self._file.seek(offset)
+            self._file.write(payload)
+            if part is not None:
+                self.done.add(part)
+
+    def checkpoint(self, interval: float = 0.0) -> None:
+        """Persist completed parts once their data is on disk."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_checkpoint < interval:
+                return
+            self._last_checkpoint = now
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({**self.identity, "done": sorted(self.done)}, f)
+            os.replace(tmp_path, self.path)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def discard(self) -> None:
+        self.close()
+        for name in (self.path, self.part_path):
+            if os.path.exists(name):
+                os.remove(name)
+
+
+def _route(client: "ReGraph", url: str) -> Tuple[Optional["Transport"], str]:
+    """Return (transport for a foreign host or None for the API, request path)."""
+    if not url.startswith(("http://", "https://")):
+        return None, url
+    if url.startswith(client.base_url + "/"):
+        return None, url[len(client.base_url) :]
+    from .transport import HTTPTransport
+
+    parsed = urllib.parse.urlsplit(url)
+    path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+    return HTTPTransport(f"{parsed.scheme}://{parsed.netloc}", timeout=client._timeout), path
+
+
+def _close(chunks: Iterator[bytes]) -> None:
+    """Release the connection behind a response body that is not read to the end."""
+    close = getattr(chunks, "close", None)
+    if close is not None:
+        close()
+
+
+def file_sha256(path: str, block_size: int = 1024 * 1024) -> str:
+    """Hex SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def download_file(
+    client: "ReGraph",
+    url: str,
+    path: str,
+    size: int,
+    sha256: Optional[str] = None,
+    part_size: int = DEFAULT_PART_SIZE,
+    concurrency: int = 8,
+    resume: bool = True,
+    max_retries: int = 5,
+    checkpoint_interval: float = 2.0,
+    progress: Optional[Callable[[DownloadProgress], None]] = None,
+    cancel_token: Optional["CancellationToken"] = None,
+) -> DownloadProgress:
+    """
+    Download ``url`` to ``path`` using parallel range requests.
+
+    Args:
+        client: ReGraph client (used for API URLs and default timeouts)
+        url: Absolute URL, or a path relative to the API base URL
+        path: Destination file
+        size: Expected size in bytes
+        sha256: Expected hex SHA-256; the file is verified when given
+        part_size: Bytes per range request
+        concurrency: Parallel range requests
+        resume: Continue an interrupted download of the same file
+        max_retries: Retries per part for rate limits, timeouts and 5xx errors
+        checkpoint_interval: Minimum seconds between manifest writes
+        progress: Callback receiving a DownloadProgress after each part
+        cancel_token: CancellationToken that aborts the download (it can be resumed)
+
+    Returns:
+        DownloadProgress with the final counts
+
+    Raises:
+        ReGraphError: If a part keeps failing, the server returns the wrong
+            range, or the checksum does not match (the partial file is discarded)
+    """
+    if part_size < 1 or concurrency < 1:
+        raise ValueError("part_size and concurrency must be at least 1")
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    parts = [(i, offset, min(part_size, size - offset)) for i, offset in enumerate(range(0, size, part_size))]
+    manifest = _Manifest(path, url, size, sha256, part_size, resume)
+    own_transport, request_path = _route(client, url)
+    transport = own_transport or client._transport
+    stats_lock = threading.Lock()
+    started = time.monotonic()
+    stats = DownloadProgress(
+        bytes_done=sum(length for i, _, length in parts if i in manifest.done),
+        bytes_total=size,
+        parts_done=len(manifest.done),
+        parts_total=len(parts),
+        retries=0,
+        elapsed=0.0,
+    )
+    errors: List[BaseException] = []
+    # Set once a server that ignores Range has answered with the whole file;
+    # requests still in flight are cancelled through their tokens.
+    whole_file = threading.Event()
+    in_flight: Set["CancellationToken"] = set()
+
+    def fetch(offset: int, length: int, token: "CancellationToken") -> Tuple[int, Iterator[bytes]]:
+        """Open a range request; the caller reads (or closes) the body."""
+        from http.client import HTTPException
+
+        headers = {"Range": f"bytes={offset}-{offset + length - 1}"}
+        if own_transport is None:
+            headers["Authorization"] = f"Bearer {client.api_key}"
+            timeout = client._call_timeout(None)
+            deadline = client._call_deadline(timeout, None)
+        else:
+            timeout, deadline = client._timeout, None
+        try:
+            status, chunks = transport.stream("GET", request_path, None, headers, timeout, deadline, token)
+            if status < 400:
+                return status, chunks
+            payload = b"".join(chunks)  # Error bodies are small
+        except (OSError, HTTPException) as e:
+            raise ReGraphError(f"Connection error: {e}")
+        if own_transport is None:
+            client._raise_for_status(status, payload)
+        if status == 429:
+            raise RateLimitError(f"HTTP Error {status}", status_code=status)
+        raise ReGraphError(f"HTTP Error {status}", status_code=status)
+
+    def read(chunks: Iterator[bytes]) -> Iterator[bytes]:
+        from http.client import HTTPException
+
+        try:
+            yield from chunks
+        except (OSError, HTTPException) as e:
+            raise ReGraphError(f"Connection error: {e}")
+        finally:
+            _close(chunks)
+
+    def report() -> None:
+        manifest.checkpoint(checkpoint_interval)
+        with stats_lock:
+            stats.parts_done = len(manifest.done)
+            stats.bytes_done = sum(n for i, _, n in parts if i in manifest.done)
+            stats.elapsed = time.monotonic() - started
+            snapshot = DownloadProgress(**stats.__dict__)
+        if progress is not None:
+            progress(snapshot)
+
+    def stream_whole_file(chunks: Iterator[bytes]) -> None:
+        """Write a 200 response to the .part file as it arrives, completing parts in order."""
+        written = 0
+        next_part = 0
+        for chunk in read(chunks):
+            if written + len(chunk) > size:
+                break
+            manifest.write(None, written, chunk)
+            written += len(chunk)
+            first = next_part
+            while next_part < len(parts) and sum(parts[next_part][1:]) <= written:
+                next_part += 1
+            if next_part > first:
+                manifest.done.update(range(first, next_part))
+                report()
+        if written != size:
+            raise ReGraphError(
+                f"Unexpected response to range request: status 200 with a body that is not {size} bytes",
+                status_code=200,
+            )
+
+    def scheduler_slot() -> ContextManager[None]:
+        if own_transport is None and client.scheduler is not None:
+            return client.scheduler.slot(client._priority, None)
+        return nullcontext()
+
+    def download(part: int, offset: int, length: int) -> None:
+        if errors or whole_file.is_set():
+            return
+        from .timeouts import CancellationToken
+
+        token = CancellationToken()
+        chained = cancel_token.register(token.cancel) if cancel_token is not None else None
+        with stats_lock:
+            in_flight.add(token)
+        owner = False
+        try:
+            for attempt in range(max_retries + 1):
+                try:
+                    with scheduler_slot():
+                        status, chunks = fetch(offset, length, token)
+                        if status == 200:
+                            with stats_lock:
+                                owner = not whole_file.is_set()
+                                whole_file.set()
+                                others = [t for t in in_flight if t is not token]
+                            if not owner:
+                                _close(chunks)
+                                return
+                            # The server ignored the Range header and is sending the
+                            # whole file: stop the other requests and keep this one.
+                            for other in others:
+                                other.cancel()
+                            stream_whole_file(chunks)
+                            return
+                        payload = b"".join(read(chunks))
+                    break
+                except ReGraphError as e:
+                    if attempt == max_retries or not retryable(e) or errors or whole_file.is_set():
+                        raise
+                    with stats_lock:
+                        stats.retries += 1
+                    time.sleep(backoff(attempt))
+
+            if status != 206 or len(payload) != length:
+                raise ReGraphError(
+                    f"Unexpected response to range request for bytes {offset}-{offset + length - 1}: "
+                    f"status {status}, {len(payload)} bytes",
+                    status_code=status,
+                )
+            manifest.write(part, offset, payload)
+            report()
+        except BaseException as e:
+            if owner or not whole_file.is_set():
+                errors.append(e)
+        finally:
+            with stats_lock:
+                in_flight.discard(token)
+            if chained is not None:
+                cancel_token.unregister(chained)
+
+    try:
+        with ThreadPoolExecutor(concurrency, thread_name_prefix="regraph-download") as executor:
+            for part, offset, length in parts:
+                if part not in manifest.done:
+                    executor.submit(download, part, offset, length)
+        manifest.checkpoint()
+    finally:
+        manifest.close()
+        if own_transport is not None:
+            own_transport.close()
+    if errors:
+        raise errors[0]
+
+    if sha256 is not None:
+        actual = file_sha256(manifest.part_path)
+        if actual != sha256.lower():
+            manifest.discard()
+            raise ReGraphError(f"Checksum mismatch for {path}: expected {sha256}, got {actual}")
+    os.replace(manifest.part_path, path)
+    os.remove(manifest.path)
+
+    stats.elapsed = time.monotonic() - started
+    return stats
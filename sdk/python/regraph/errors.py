@@ -0,0 +1,47 @@
+"""
+ReGraph SDK - Exceptions
+"""
+
+from typing import Dict, Optional
+
+
+class ReGraphError(Exception):
+    """Base exception for ReGraph API errors."""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None, response: Optional[Dict] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = response
+
+
+class AuthenticationError(ReGraphError):
+    """Raised when API key is invalid or missing."""
+    pass
+
+
+class RateLimitError(ReGraphError):
+    """Raised when rate limit is exceeded."""
+    pass
+
+
+class RequestShedError(ReGraphError):
+    """Raised when the client-side scheduler drops a request instead of sending it."""
+    
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason  # "queue_full" or "deadline"
+
+
+class RequestTimeoutError(ReGraphError):
+    """Raised when a request exceeds its timeout or deadline."""
+    pass
+
+
+class RequestCancelledError(ReGraphError):
+    """Raised when a request is aborted through its CancellationToken."""
+    pass
+
+
+class CassetteMissError(ReGraphError):
+    """Raised when a replayed request has no recording in the cassette."""
+    pass
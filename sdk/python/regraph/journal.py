@@ -0,0 +1,363 @@
+"""
+ReGraph SDK - Request Journal
+
+Write-ahead journal for calls that create billable server-side work
+(batches, training jobs, deployments, rentals), so a crashed process can find
+out which of them may have reached the server and retry them safely.
+
+Every journaled call is recorded before it is sent, together with an
+idempotency key that goes out as the ``Idempotency-Key`` header. The response
+is recorded when it arrives. Each call gets a fresh key, so repeating a call
+within a run really repeats it. A call identical to one a previous run made
+(whether it was left pending, completed, or finished by ``replay``) takes over
+that entry, so rerunning a crashed script does not create its work twice.
+Callers that pass their own key get the stored response back for any
+later call with the same key within the journal's TTL.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from .errors import ReGraphError
+
+if TYPE_CHECKING:
+    from .client import ReGraph
+
+
+@dataclass
+class JournalEntry:
+    """A journaled API call."""
+    key: str
+    fingerprint: str
+    method: str
+    endpoint: str
+    data: Optional[Dict[str, Any]]
+    created_at: float
+    status: str = "pending"  # "pending", "done", or "failed"
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def fingerprint(method: str, endpoint: str, data: Optional[Dict[str, Any]]) -> str:
+    """Return a stable hash identifying a request by method, endpoint and body."""
+    canonical = json.dumps([method, endpoint, data], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RequestJournal:
+    """
+    Append-only, crash-safe journal of non-idempotent API calls.
+
+    Records are appended as JSON lines. A call's ``begin`` record is fsynced
+    before the request is sent; concurrent callers share fsyncs (group commit),
+    so throughput scales with the number of threads rather than disk latency.
+    Completion records are written immediately but synced with the next batch,
+    since losing one only causes a harmless retry with the same key.
+
+    One journal file should be owned by a single process at a time.
+
+    Example:
+        >>> journal = RequestJournal("regraph.journal")
+        >>> client = ReGraph(api_key="your-api-key", journal=journal)
+        >>> journal.replay(client)  # finish anything a previous run left pending
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 24 * 3600,
+        sync_interval: float = 0.0,
+        durable: bool = True,
+    ):
+        """
+        Open (or create) a journal.
+
+        Args:
+            path: Journal file path
+            ttl: Seconds a completed entry is kept and its response reused for
+                calls with the same key (default: 24 hours)
+            sync_interval: Extra seconds an fsync leader waits to gather more
+                records into one batch (default: 0, batch only under contention)
+            durable: fsync begin records before sending (default: True)
+        """
+        self.path = path
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self.durable = durable
+
+        self._entries: Dict[str, JournalEntry] = {}
+        self._recovered: Dict[str, List[str]] = {}  # Fingerprint -> keys of calls made by a previous run
+        self._cond = threading.Condition()
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+
+        self._load()
+        self._compact()
+        for entry in self._entries.values():
+            if entry.status != "failed":
+                self._recovered.setdefault(entry.fingerprint, []).append(entry.key)
+        self._fd: Optional[int] = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+
+    # ---------- Persistence ----------
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final write from a crash; everything before it is intact.
+                    continue
+                self._apply(record)
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        op = record.get("op")
+        if op == "begin":
+            entry = JournalEntry(
+                key=record["key"],
+                fingerprint=record["fp"],
+                method=record["method"],
+                endpoint=record["endpoint"],
+                data=record.get("data"),
+                created_at=record["ts"],
+            )
+            self._entries[entry.key] = entry
+        elif op in ("done", "failed"):
+            entry = self._entries.get(record["key"])
+            if entry is not None:
+                entry.status = op
+                entry.response = record.get("response")
+                entry.error = record.get("error")
+
+    def _records(self, entry: JournalEntry) -> Iterator[Dict[str, Any]]:
+        yield {
+            "op": "begin",
+            "key": entry.key,
+            "fp": entry.fingerprint,
+            "method": entry.method,
+            "endpoint": entry.endpoint,
+            "data": entry.data,
+            "ts": entry.created_at,
+        }
+        if entry.status != "pending":
+            yield {
+                "op": entry.status,
+                "key": entry.key,
+                "response": entry.response,
+                "error": entry.error,
+            }
+
+    def _compact(self) -> None:
+        """Drop expired completed entries and rewrite the file atomically."""
+        cutoff = time.time() - self.ttl
+        expired = [
+            key
+            for key, entry in self._entries.items()
+            if entry.status != "pending" and entry.created_at < cutoff
+        ]
+        for key in expired:
+            del self._entries[key]
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            for entry in self._entries.values():
+                for record in self._records(entry):
+                    f.write(_encode(record))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _append(self, record: Dict[str, Any], durable: bool) -> None:
+        line = _encode(record)
+        with self._cond:
+            if self._fd is None:
+                raise ValueError("Journal is closed")
+            os.write(self._fd, line)
+            self._written += 1
+            target = self._written
+            if not (durable and self.durable):
+                return
+
+            while self._synced < target:
+                if self._syncing:
+                    self._cond.wait()
+                    continue
+
+                # Become the fsync leader for everything written so far.
+                self._syncing = True
+                synced = self._synced
+                self._cond.release()
+                try:
+                    if self.sync_interval:
+                        time.sleep(self.sync_interval)
+                    batch_end = self._written
+                    os.fsync(self._fd)
+                    synced = batch_end
+                finally:
+                    self._cond.acquire()
+                    self._syncing = False
+                    self._synced = max(self._synced, synced)
+                    self._cond.notify_all()
+
+    # ---------- Entries ----------
+
+    def begin(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        key: Optional[str] = None,
+    ) -> JournalEntry:
+        """
+        Record a call before it is sent.
+
+        Without ``key`` the call gets a fresh idempotency key, unless an
+        identical call was made by a previous run and is pending or completed
+        within the TTL: that entry is returned instead (each one to a single
+        call), so rerunning after a crash resumes or reuses it rather than
+        creating the work again. With ``key``, an entry with that key that is
+        pending, or completed within the TTL, is returned so its key or
+        response can be reused.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            data: Request body
+            key: Caller-chosen idempotency key (default: a new UUID)
+
+        Returns:
+            JournalEntry for the call
+        """
+        fp = fingerprint(method, endpoint, data)
+        with self._cond:
+            if key is not None:
+                existing = self._entries.get(key)
+                if existing is not None and self._reusable(existing):
+                    return existing
+            else:
+                recovered = self._recovered.get(fp)
+                while recovered:
+                    existing = self._entries.get(recovered.pop(0))
+                    if existing is not None and self._reusable(existing):
+                        return existing
+
+            entry = JournalEntry(
+                key=key or str(uuid.uuid4()),
+                fingerprint=fp,
+                method=method,
+                endpoint=endpoint,
+                data=data,
+                created_at=time.time(),
+            )
+            self._entries[entry.key] = entry
+
+        self._append(next(self._records(entry)), durable=True)
+        return entry
+
+    def _reusable(self, entry: JournalEntry) -> bool:
+        """Whether a later call may take over an entry's key or response."""
+        return entry.status == "pending" or (
+            entry.status == "done" and entry.created_at >= time.time() - self.ttl
+        )
+
+    def complete(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        Mark a call as completed with its response.
+
+        Args:
+            key: Idempotency key of the entry
+            response: Decoded response body
+        """
+        self._finish(key, "done", response=response)
+
+    def fail(self, key: str, error: str) -> None:
+        """
+        Mark a call as definitively rejected by the server.
+
+        Failed entries are not replayed and do not block a new attempt.
+
+        Args:
+            key: Idempotency key of the entry
+            error: Error message
+        """
+        self._finish(key, "failed", error=error)
+
+    def _finish(
+        self,
+        key: str,
+        status: str,
+        response: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._cond:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.status = status
+            entry.response = response
+            entry.error = error
+        self._append({"op": status, "key": key, "response": response, "error": error}, durable=False)
+
+    def pending(self) -> List[JournalEntry]:
+        """
+        List calls that were recorded but never completed.
+
+        Returns:
+            Pending JournalEntry objects, oldest first
+        """
+        with self._cond:
+            entries = [e for e in self._entries.values() if e.status == "pending"]
+        return sorted(entries, key=lambda e: e.created_at)
+
+    def replay(self, client: "ReGraph") -> List[Tuple[JournalEntry, Any]]:
+        """
+        Resend pending calls with their original idempotency keys.
+
+        The server deduplicates calls it already processed, so this either
+        returns the original result or performs the call for the first time.
+
+        Args:
+            client: ReGraph client to send the calls with
+
+        Returns:
+            List of (entry, response dict or raised ReGraphError) pairs
+        """
+        results: List[Tuple[JournalEntry, Any]] = []
+        for entry in self.pending():
+            try:
+                result: Any = client._send_journaled(entry)
+            except ReGraphError as e:
+                result = e
+            results.append((entry, result))
+        return results
+
+    def close(self) -> None:
+        """Sync and close the journal file."""
+        with self._cond:
+            while self._syncing:
+                self._cond.wait()
+            if self._fd is None:
+                return
+            if self.durable:
+                os.fsync(self._fd)
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "RequestJournal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
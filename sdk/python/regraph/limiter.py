@@ -0,0 +1,264 @@
+"""
+ReGraph SDK - Adaptive Concurrency Limits
+
+Per-model limits on requests in flight that find their own level instead of
+being configured. Each model's limit grows by one for every limit's worth of
+successful requests while latency stays close to its no-load baseline (additive
+increase), and is cut multiplicatively when the server pushes back with a 429
+or 503, a request times out, or latency inflates beyond a tolerance (the cut
+is proportional to the inflation, down to ``backoff``). Cuts are applied at
+most once per latency window, so a burst of rejections from one overload
+counts once.
+
+Requests beyond a model's limit wait in the client for a free slot, which
+keeps fan-outs with a generous ``max_concurrency`` from tripping rate limits.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
+
+from .errors import RateLimitError, ReGraphError, RequestShedError, RequestTimeoutError
+
+OVERLOAD_STATUSES = (429, 503)
+
+
+class _Waiter:
+    __slots__ = ("event", "granted")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.granted = False
+
+
+class _ModelLimit:
+    """Limit, in-flight count and latency estimates for one model."""
+
+    def __init__(self, limit: float, now: float):
+        self.limit = limit
+        self.in_flight = 0
+        self.queue: Deque[_Waiter] = deque()
+        self.baseline = 0.0  # No-load latency in seconds: the lowest seen recently
+        self.window_min = math.inf  # Lowest latency in the current baseline window
+        self.window_start = now
+        self.latency = 0.0  # Recent latency (EWMA) in seconds
+        self.last_decrease = 0.0
+        self.successes = 0
+        self.drops = 0
+        self.increases = 0
+        self.decreases = 0
+        self.shed = 0
+        self.peak = limit
+
+    @property
+    def slots(self) -> int:
+        return int(self.limit)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter keyed by model.
+
+    Example:
+        >>> limiter = AdaptiveLimiter(initial_limit=4, max_limit=128)
+        >>> client = ReGraph(api_key="your-api-key", limiter=limiter)
+        >>> with ThreadPoolExecutor(64) as pool:
+        ...     list(pool.map(lambda p: client.chat.completions.create(model="gpt-5", messages=p), prompts))
+        >>> limiter.limit("gpt-5"), limiter.metrics()["gpt-5"]
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        backoff: float = 0.5,
+        latency_tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        baseline_window: float = 60.0,
+        max_queue: int = 10000,
+    ):
+        """
+        Create a limiter.
+
+        Args:
+            initial_limit: Concurrency each model starts at
+            min_limit: Lowest limit a model can be cut to
+            max_limit: Highest limit a model can grow to
+            backoff: Factor the limit is multiplied by on a 429, 503 or timeout
+            latency_tolerance: Recent latency above this multiple of the
+                no-load latency counts as overload
+            smoothing: Weight of each new sample in the recent-latency average
+            baseline_window: Seconds after which the lowest latency seen is
+                forgotten, so the baseline follows a model that got slower
+            max_queue: Requests allowed to wait per model before new ones are
+                shed with RequestShedError
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.baseline_window = baseline_window
+        self.max_queue = max_queue
+        self._models: Dict[str, _ModelLimit] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, model: str) -> _ModelLimit:
+        state = self._models.get(model)
+        if state is None:
+            with self._lock:
+                state = self._models.get(model)
+                if state is None:
+                    state = _ModelLimit(float(self.initial_limit), time.monotonic())
+                    self._models[model] = state
+        return state
+
+    # ---------- Slots ----------
+
+    def _acquire(self, model: str, state: _ModelLimit, deadline: Optional[float]) -> None:
+        with self._lock:
+            if state.in_flight < state.slots and not state.queue:
+                state.in_flight += 1
+                return
+            if len(state.queue) >= self.max_queue:
+                state.shed += 1
+                raise RequestShedError(f"Queue for model '{model}' is full", reason="queue_full")
+            waiter = _Waiter()
+            state.queue.append(waiter)
+
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        waiter.event.wait(timeout)
+
+        with self._lock:
+            if waiter.granted:
+                return
+            state.queue.remove(waiter)
+            state.shed += 1
+        raise RequestShedError(f"No slot for model '{model}' before the deadline", reason="deadline")
+
+    def _dispatch(self, state: _ModelLimit) -> None:
+        """Hand free slots to waiters in arrival order. Caller holds the lock."""
+        while state.queue and state.in_flight < state.slots:
+            waiter = state.queue.popleft()
+            waiter.granted = True
+            state.in_flight += 1
+            waiter.event.set()
+
+    def _release(self, state: _ModelLimit, elapsed: float, error: Optional[BaseException]) -> None:
+        with self._lock:
+            busy = state.in_flight
+            state.in_flight -= 1
+            now = time.monotonic()
+            if error is None:
+                self._on_success(state, elapsed, busy, now)
+            elif isinstance(error, (RateLimitError, RequestTimeoutError)) or (
+                isinstance(error, ReGraphError) and error.status_code in OVERLOAD_STATUSES
+            ):
+                state.drops += 1
+                self._decrease(state, self.backoff, now)
+            # Other errors (bad requests, cancellations) say nothing about load.
+            self._dispatch(state)
+
+    def _on_success(self, state: _ModelLimit, elapsed: float, busy: int, now: float) -> None:
+        state.successes += 1
+        if state.latency == 0.0:
+            state.latency = elapsed
+        else:
+            state.latency += self.smoothing * (elapsed - state.latency)
+
+        # The baseline follows the lowest recent latency average, so one fast
+        # response does not set it.
+        state.window_min = min(state.window_min, state.latency)
+        if state.baseline == 0.0 or state.latency < state.baseline:
+            state.baseline = state.latency
+        elif busy == 1:
+            # Nothing else was in flight, so this is a no-load latency.
+            state.baseline += self.smoothing * (elapsed - state.baseline)
+        if now - state.window_start >= self.baseline_window:
+            state.baseline = state.window_min
+            state.window_min = math.inf
+            state.window_start = now
+
+        threshold = state.baseline * self.latency_tolerance
+        if state.latency > threshold:
+            self._decrease(state, max(self.backoff, threshold / state.latency), now)
+        elif busy * 2 >= state.slots:
+            # Only grow while the limit is actually being used.
+            before = state.slots
+            state.limit = min(float(self.max_limit), state.limit + 1.0 / state.limit)
+            if state.slots > before:
+                state.increases += 1
+                state.peak = max(state.peak, state.limit)
+
+    def _decrease(self, state: _ModelLimit, factor: float, now: float) -> None:
+        if now - state.last_decrease < state.latency:
+            return  # Already cut for this overload
+        state.limit = max(float(self.min_limit), state.limit * factor)
+        state.last_decrease = now
+        state.decreases += 1
+
+    @contextmanager
+    def slot(self, model: str, deadline: Optional[float] = None) -> Iterator[None]:
+        """
+        Hold one of ``model``'s slots for the duration of a request.
+
+        The request's outcome adjusts the limit: its latency on success, or a
+        cut on overload errors.
+
+        Args:
+            model: Model the request is for
+            deadline: Absolute ``time.monotonic()`` time after which waiting
+                for a slot gives up, or None to wait indefinitely
+
+        Raises:
+            RequestShedError: If the queue is full or no slot frees up in time
+        """
+        state = self._state(model)
+        self._acquire(model, state, deadline)
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self._release(state, time.monotonic() - start, e)
+            raise
+        self._release(state, time.monotonic() - start, None)
+
+    # ---------- Metrics ----------
+
+    def limit(self, model: str) -> int:
+        """Current concurrency limit for ``model``."""
+        return self._state(model).slots
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Snapshot the limit, load and latency estimates per model.
+
+        Returns:
+            Dict mapping model to its metrics
+        """
+        with self._lock:
+            return {
+                model: {
+                    "limit": s.slots,
+                    "peak_limit": int(s.peak),
+                    "in_flight": s.in_flight,
+                    "queued": len(s.queue),
+                    "latency_ms": s.latency * 1000,
+                    "baseline_ms": s.baseline * 1000,
+                    "successes": s.successes,
+                    "drops": s.drops,
+                    "increases": s.increases,
+                    "decreases": s.decreases,
+                    "shed": s.shed,
+                }
+                for model, s in self._models.items()
+            }
@@ -0,0 +1,112 @@
+"""
+ReGraph SDK - Message History
+
+A chat conversation that encodes each message to JSON once, when it is added.
+Multi-turn conversations resend their whole history every turn; with a
+MessageHistory the request body is assembled by concatenating the cached
+bytes, so a turn costs encoding one new message instead of the entire
+conversation.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union, overload, TYPE_CHECKING
+
+from ._json import dumps
+
+if TYPE_CHECKING:
+    from .models import ChatMessage
+
+Message = Union[Dict[str, Any], "ChatMessage"]
+
+
+class MessageHistory:
+    """
+    Append-only list of chat messages with their encoded JSON cached.
+
+    Messages are copied when added; later changes to the dict that was passed
+    in are not seen. Pass the history as ``messages`` to
+    ``chat.completions.create``.
+
+    Example:
+        >>> history = MessageHistory([{"role": "system", "content": "You are terse."}])
+        >>> history.add("user", "What is ReGraph?")
+        >>> reply = client.chat.completions.create(model="gpt-5", messages=history)
+        >>> history.append(reply.choices[0].message)
+    """
+
+    def __init__(self, messages: Optional[Iterable[Message]] = None):
+        self._messages: List[Dict[str, Any]] = []
+        self._encoded = bytearray(b"[")  # Opening bracket plus the comma-joined messages
+        self._ends: List[int] = []  # End offset of each message in _encoded
+        if messages is not None:
+            self.extend(messages)
+
+    def append(self, message: Message) -> None:
+        """Add a message dict or ChatMessage."""
+        if isinstance(message, dict):
+            fields = dict(message)
+        else:
+            fields = {"role": message.role, "content": message.content}
+            if message.name:
+                fields["name"] = message.name
+        encoded = dumps(fields)
+        if self._messages:
+            self._encoded += b","
+        self._encoded += encoded
+        self._messages.append(fields)
+        self._ends.append(len(self._encoded))
+
+    def add(self, role: str, content: str, name: Optional[str] = None) -> None:
+        """Add a message from its fields."""
+        message = {"role": role, "content": content}
+        if name:
+            message["name"] = name
+        self.append(message)
+
+    def extend(self, messages: Iterable[Message]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def pop(self) -> Dict[str, Any]:
+        """Remove and return the last message, e.g. to retry a turn."""
+        message = self._messages.pop()
+        self._ends.pop()
+        del self._encoded[self._ends[-1] if self._ends else 1 :]
+        return message
+
+    def clear(self) -> None:
+        self._messages.clear()
+        self._ends.clear()
+        del self._encoded[1:]
+
+    def encoded(self) -> bytes:
+        """The messages as a JSON array."""
+        return bytes(self._encoded) + b"]"
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self._messages)
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._messages)
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        return self._messages[index]
+
+    def __repr__(self) -> str:
+        return f"MessageHistory({len(self)} messages, {len(self._encoded) + 1} bytes)"
+
+
+def encode_chat_body(data: Dict[str, Any], messages: MessageHistory) -> bytes:
+    """Encode ``data`` with ``messages`` spliced in as its ``"messages"`` field."""
+    head = dumps({k: v for k, v in data.items() if k != "messages"})
+    # head is "{...}"; reopen it and append the cached array.
+    separator = b"," if len(head) > 2 else b""
+    return b"".join((head[:-1], separator, b'"messages":', messages._encoded, b"]}"))
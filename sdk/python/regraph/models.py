@@ -4,7 +4,6 @@ ReGraph SDK - Data Models
 
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
-from datetime import datetime
 
 
 @dataclass
@@ -187,7 +186,7 @@ class TrainingJob:
             lora_rank=config_data.get("lora_rank", 8),
         )
         return cls(
-            job_id=data.get("job_id", ""),
+            job_id=data.get("job_id", data.get("id", "")),
             status=data.get("status", ""),
             model=data.get("model", ""),
             dataset=data.get("dataset", ""),
@@ -199,6 +198,46 @@ class TrainingJob:
         )
 
 
+@dataclass
+class TrainingArtifact:
+    """A file produced by a training job (adapter, weights, logs)."""
+    name: str
+    url: str
+    size_bytes: int
+    sha256: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TrainingArtifact":
+        return cls(
+            name=data.get("name", ""),
+            url=data.get("url", ""),
+            size_bytes=data.get("size_bytes", 0),
+            sha256=data.get("sha256"),
+        )
+
+
+@dataclass
+class UploadedFile:
+    """A file uploaded to ReGraph, referenced by URL in training jobs and deployments."""
+    upload_id: str
+    url: str  # Pass as `dataset=` or `weights_url=`
+    filename: str
+    size_bytes: int
+    sha256: Optional[str] = None
+    purpose: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "UploadedFile":
+        return cls(
+            upload_id=data.get("upload_id", ""),
+            url=data.get("url", ""),
+            filename=data.get("filename", ""),
+            size_bytes=data.get("size_bytes", 0),
+            sha256=data.get("sha256"),
+            purpose=data.get("purpose"),
+        )
+
+
 @dataclass
 class BatchRequest:
     """Single request in a batch."""
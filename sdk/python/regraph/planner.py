@@ -0,0 +1,333 @@
+"""
+ReGraph SDK - Capacity Planning
+
+Evaluates hardware rental configurations for a queued workload before booking
+anything. Every (GPU type, GPU count) pair in the candidate grid is scored at
+once: throughput, the time the workload needs, the hours billed and the cost.
+The cheapest configuration that finishes by the deadline is recommended.
+
+Hourly prices come from ``hardware.quote`` and are cached for ``quote_ttl``
+seconds, so re-planning with a different workload or deadline costs no
+requests. Not every deployment serves the quote endpoint: when it answers 404
+the planner falls back to DEFAULT_PRICES, the list prices ``hardware.rent``
+charges, and treats every configuration as available (a rental the providers
+cannot fill is refused with a 503). A price table or function can be passed as
+``prices`` instead. The grid is evaluated with NumPy when it is installed and
+with plain Python otherwise.
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+
+from .errors import ReGraphError
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+if TYPE_CHECKING:
+    from .client import ReGraph
+
+# Rough decode throughput (tokens/s per GPU) for a 7-8B model with batching.
+# Pass measured numbers for your own models as ``throughput``.
+DEFAULT_THROUGHPUT = {
+    "H100": 3000.0,
+    "A100-80GB": 1800.0,
+    "A100": 1600.0,
+    "RTX 5090": 1400.0,
+    "L40S": 1200.0,
+    "RTX 4090": 1000.0,
+    "RTX 3090": 600.0,
+    "V100": 500.0,
+}
+REFERENCE_GPU = "A100"  # Workload.latency_ms is measured on this GPU
+
+# USD per GPU-hour that hardware.rent charges; other types are billed UNLISTED_PRICE.
+DEFAULT_PRICES = {
+    "A100": 2.00,
+    "A100-80GB": 2.50,
+    "H100": 3.50,
+    "RTX 4090": 0.50,
+    "RTX 5090": 0.75,
+    "RTX 3090": 0.35,
+    "L40S": 1.20,
+    "V100": 0.80,
+}
+UNLISTED_PRICE = 1.00
+
+# (gpu_type, gpu_count) -> (price per hour for all GPUs, available)
+PriceFunction = Callable[[str, int], Tuple[float, bool]]
+
+
+@dataclass
+class Workload:
+    """Queued work to plan capacity for."""
+    total_tokens: int
+    requests: int = 0
+    latency_ms: Optional[float] = None  # Per-request latency on the reference GPU, e.g. Model.latency_ms
+    target_tokens_per_second: Optional[float] = None  # Minimum sustained throughput
+
+    @classmethod
+    def from_token_counts(
+        cls,
+        token_counts: Iterable[int],
+        latency_ms: Optional[float] = None,
+        target_tokens_per_second: Optional[float] = None,
+    ) -> "Workload":
+        """Build a workload from the token count of each queued request."""
+        total = requests = 0
+        for count in token_counts:
+            total += count
+            requests += 1
+        return cls(total, requests, latency_ms, target_tokens_per_second)
+
+
+@dataclass
+class PlanOption:
+    """One evaluated configuration."""
+    gpu_type: str
+    gpu_count: int
+    price_per_hour: float
+    tokens_per_second: float
+    hours: float  # Time the workload needs
+    billed_hours: int  # Rentals are booked in whole hours
+    cost_usd: float
+    feasible: bool  # Finishes by the deadline, meets the throughput target and is available
+
+
+@dataclass
+class CapacityPlan:
+    """Result of CapacityPlanner.plan()."""
+    best: Optional[PlanOption]  # Cheapest feasible option, or None
+    options: List[PlanOption] = field(default_factory=list)  # Every option, cheapest first
+    deadline_hours: float = 0.0
+
+    @property
+    def feasible(self) -> List[PlanOption]:
+        return [o for o in self.options if o.feasible]
+
+
+class CapacityPlanner:
+    """
+    Finds the cheapest GPU rental that completes a workload in time.
+
+    Example:
+        >>> planner = client.hardware.planner(gpu_counts=(1, 2, 4, 8))
+        >>> plan = planner.plan(Workload(total_tokens=50_000_000), deadline_hours=6)
+        >>> plan.best.gpu_type, plan.best.gpu_count, plan.best.cost_usd
+        >>> planner.rent(plan)
+    """
+
+    def __init__(
+        self,
+        client: "ReGraph",
+        gpu_types: Optional[Sequence[str]] = None,
+        gpu_counts: Sequence[int] = (1, 2, 4, 8),
+        throughput: Optional[Dict[str, float]] = None,
+        scaling_efficiency: float = 0.9,
+        slots_per_gpu: int = 16,
+        quote_ttl: float = 300.0,
+        max_concurrency: int = 8,
+        prices: Optional[Union[Dict[str, float], PriceFunction]] = None,
+    ):
+        """
+        Create a planner.
+
+        Args:
+            client: ReGraph client used for quotes and rentals
+            gpu_types: GPU types to consider (default: all in ``throughput``)
+            gpu_counts: GPU counts to consider for each type
+            throughput: Tokens/s per GPU by type (default: DEFAULT_THROUGHPUT)
+            scaling_efficiency: Throughput kept each time the GPU count doubles
+            slots_per_gpu: Requests one GPU serves concurrently, for the
+                latency bound
+            quote_ttl: Seconds a quote is reused before being fetched again
+            max_concurrency: Parallel quote requests
+            prices: Where prices come from instead of ``hardware.quote``: a
+                dict of USD per GPU-hour by type (types it lacks count as
+                unavailable), or a function called as
+                ``prices(gpu_type, gpu_count)`` returning (price per hour,
+                available). By default quotes are requested, falling back to
+                DEFAULT_PRICES if the API does not serve them.
+        """
+        self.client = client
+        self.throughput = dict(throughput or DEFAULT_THROUGHPUT)
+        self.gpu_types = list(gpu_types or self.throughput)
+        missing = [t for t in self.gpu_types if t not in self.throughput]
+        if missing:
+            raise ValueError(f"No throughput figure for GPU types: {', '.join(missing)}")
+        self.gpu_counts = sorted(set(gpu_counts))
+        self.scaling_efficiency = scaling_efficiency
+        self.slots_per_gpu = slots_per_gpu
+        self.quote_ttl = quote_ttl
+        self.max_concurrency = max_concurrency
+        self.prices = prices
+        # None until the first quote request tells whether the API serves quotes.
+        self.quotes_supported: Optional[bool] = None
+        self._quotes: Dict[Tuple[str, int], Tuple[float, float, bool]] = {}  # key -> (expires, price, available)
+        self._lock = threading.Lock()
+        self.quote_requests = 0
+
+    # ---------- Quotes ----------
+
+    def quotes(self) -> Dict[Tuple[str, int], Tuple[float, bool]]:
+        """Hourly price and availability for every grid cell, fetching only stale quotes."""
+        now = time.monotonic()
+        keys = [(t, n) for t in self.gpu_types for n in self.gpu_counts]
+        with self._lock:
+            stale = [k for k in keys if k not in self._quotes or self._quotes[k][0] <= now]
+
+        def fetch(key: Tuple[str, int]) -> Tuple[Tuple[str, int], Tuple[float, bool]]:
+            return key, self._price(*key)
+
+        if stale:
+            with ThreadPoolExecutor(min(self.max_concurrency, len(stale))) as executor:
+                fetched = list(executor.map(fetch, stale))
+            with self._lock:
+                for key, (price, available) in fetched:
+                    self._quotes[key] = (now + self.quote_ttl, float(price), bool(available))
+        with self._lock:
+            return {k: self._quotes[k][1:] for k in keys}
+
+    def _price(self, gpu_type: str, gpu_count: int) -> Tuple[float, bool]:
+        """Hourly price and availability of one configuration from the configured source."""
+        if callable(self.prices):
+            return self.prices(gpu_type, gpu_count)
+        if self.prices is not None:
+            return self.prices.get(gpu_type, math.inf) * gpu_count, gpu_type in self.prices
+
+        if self.quotes_supported is not False:
+            with self._lock:
+                self.quote_requests += 1
+            try:
+                quote = self.client.hardware.quote(gpu_type, gpu_count, duration_hours=1)
+            except ReGraphError as e:
+                if e.status_code not in (404, 405):
+                    raise
+                self.quotes_supported = False
+            else:
+                self.quotes_supported = True
+                price = quote.get("price_per_hour")
+                if price is None:
+                    price = quote.get("total_cost_usd", math.inf)
+                return float(price), bool(quote.get("available", True))
+        return DEFAULT_PRICES.get(gpu_type, UNLISTED_PRICE) * gpu_count, True
+
+    def clear_quotes(self) -> None:
+        with self._lock:
+            self._quotes.clear()
+
+    # ---------- Planning ----------
+
+    def plan(self, workload: Workload, deadline_hours: float) -> CapacityPlan:
+        """
+        Score every configuration in the grid for ``workload``.
+
+        Args:
+            workload: Work to be done
+            deadline_hours: Hours from the start of the rental by which it must finish
+
+        Returns:
+            CapacityPlan with the cheapest feasible option as ``best``
+        """
+        quotes = self.quotes()
+        prices = [[quotes[(t, n)][0] for n in self.gpu_counts] for t in self.gpu_types]
+        available = [[quotes[(t, n)][1] for n in self.gpu_counts] for t in self.gpu_types]
+        per_gpu = [self.throughput[t] for t in self.gpu_types]
+        evaluate = self._evaluate_numpy if np is not None else self._evaluate_python
+        tps, hours, billed, cost, feasible = evaluate(workload, deadline_hours, per_gpu, prices, available)
+
+        options = [
+            PlanOption(
+                gpu_type=t,
+                gpu_count=n,
+                price_per_hour=prices[i][j],
+                tokens_per_second=float(tps[i][j]),
+                hours=float(hours[i][j]),
+                billed_hours=int(billed[i][j]),
+                cost_usd=round(float(cost[i][j]), 2),
+                feasible=bool(feasible[i][j]),
+            )
+            for i, t in enumerate(self.gpu_types)
+            for j, n in enumerate(self.gpu_counts)
+        ]
+        # Cheapest first; among equal costs, the faster option.
+        options.sort(key=lambda o: (o.cost_usd, o.hours))
+        best = next((o for o in options if o.feasible), None)
+        return CapacityPlan(best=best, options=options, deadline_hours=deadline_hours)
+
+    def _latency_factor(self, workload: Workload) -> float:
+        """Seconds per request on the reference GPU, spread over its concurrent slots."""
+        if not workload.latency_ms or not workload.requests:
+            return 0.0
+        return workload.requests * workload.latency_ms / 1000 / self.slots_per_gpu
+
+    def _evaluate_numpy(
+        self,
+        workload: Workload,
+        deadline_hours: float,
+        per_gpu: List[float],
+        prices: List[List[float]],
+        available: List[List[bool]],
+    ) -> Tuple[Any, ...]:
+        base = np.asarray(per_gpu, dtype=np.float64)[:, None]
+        counts = np.asarray(self.gpu_counts, dtype=np.float64)[None, :]
+        tps = base * counts * self.scaling_efficiency ** np.log2(counts)
+        seconds = workload.total_tokens / tps
+        latency = self._latency_factor(workload)
+        if latency:
+            # Slower GPUs take proportionally longer per request.
+            reference = self.throughput.get(REFERENCE_GPU, base.max())
+            seconds = np.maximum(seconds, latency * (reference / base) / counts)
+        hours = seconds / 3600
+        billed = np.maximum(1, np.ceil(hours - 1e-9))
+        cost = np.asarray(prices, dtype=np.float64) * billed
+        feasible = (hours <= deadline_hours) & np.asarray(available) & np.isfinite(cost)
+        if workload.target_tokens_per_second:
+            feasible &= tps >= workload.target_tokens_per_second
+        return tps, hours, billed, cost, feasible
+
+    def _evaluate_python(
+        self,
+        workload: Workload,
+        deadline_hours: float,
+        per_gpu: List[float],
+        prices: List[List[float]],
+        available: List[List[bool]],
+    ) -> Tuple[Any, ...]:
+        latency = self._latency_factor(workload)
+        reference = self.throughput.get(REFERENCE_GPU, max(per_gpu))
+        grids: Tuple[List[List[Any]], ...] = ([], [], [], [], [])
+        for i, base in enumerate(per_gpu):
+            rows: Tuple[List[Any], ...] = ([], [], [], [], [])
+            for j, count in enumerate(self.gpu_counts):
+                tps = base * count * self.scaling_efficiency ** math.log2(count)
+                seconds = workload.total_tokens / tps
+                if latency:
+                    seconds = max(seconds, latency * (reference / base) / count)
+                hours = seconds / 3600
+                billed = max(1, math.ceil(hours - 1e-9))
+                cost = prices[i][j] * billed
+                feasible = hours <= deadline_hours and available[i][j] and math.isfinite(cost)
+                if workload.target_tokens_per_second:
+                    feasible = feasible and tps >= workload.target_tokens_per_second
+                for row, value in zip(rows, (tps, hours, billed, cost, feasible)):
+                    row.append(value)
+            for grid, row in zip(grids, rows):
+                grid.append(row)
+        return grids
+
+    # ---------- Booking ----------
+
+    def rent(self, plan: CapacityPlan, **kwargs: Any) -> Dict[str, Any]:
+        """Rent the plan's best option; extra arguments go to hardware.rent."""
+        if plan.best is None:
+            raise ValueError(f"No configuration finishes within {plan.deadline_hours} hours")
+        return self.client.hardware.rent(
+            plan.best.gpu_type, plan.best.gpu_count, plan.best.billed_hours, **kwargs
+        )
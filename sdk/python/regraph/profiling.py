@@ -0,0 +1,350 @@
+"""
+ReGraph SDK - Profiling
+
+Opt-in timing of where a client's calls spend their time. With
+``ReGraph(profile=True)`` every request is broken into phases:
+
+    request
+      encode              JSON-encoding the body
+      limiter             waiting for an AdaptiveLimiter slot
+      send
+        scheduler         waiting for a RequestScheduler slot
+        connect, tls      opening a new connection (HTTPTransport only)
+        upload            writing the request
+        wait              server time until the response headers arrive
+        download          reading the response body
+        transport         the rest of the transport (all of it for other transports)
+      decode              JSON-decoding the response
+    parse
+      <Model>             building the result object with from_dict
+
+Each thread records into its own buffers without locking; the buffers are
+merged when a report is read. Durations go into log-bucketed histograms
+(8 buckets per power of two, so percentiles are within about 6%), and, unless
+``trace=False``, into a bounded list of events for a Chrome trace.
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_SUB_BUCKETS = 8  # Histogram buckets per power of two
+_SUB_BITS = 3
+_NO_MIN = 1 << 62
+
+_active = threading.local()  # The timeline whose frame is innermost on this thread
+
+
+def current() -> Optional["_Timeline"]:
+    """Timeline of the call in progress on this thread, for transports to add phases to."""
+    return getattr(_active, "timeline", None)
+
+
+class _Histogram:
+    """Log-bucketed histogram of durations in nanoseconds."""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.min = _NO_MIN
+        self.max = 0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, ns: int) -> None:
+        if ns < _SUB_BUCKETS:
+            index = max(ns, 0)
+        else:
+            # The top four bits select the bucket: the power of two and 1/8 steps within it.
+            shift = ns.bit_length() - _SUB_BITS - 1
+            index = (shift << _SUB_BITS) + (ns >> shift)
+        buckets = self.buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        if ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.count += 1
+        self.total += ns
+
+    def merge(self, other: "_Histogram") -> None:
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        for index, n in list(other.buckets.items()):
+            self.buckets[index] = self.buckets.get(index, 0) + n
+
+    @staticmethod
+    def _bounds(index: int) -> Tuple[int, int]:
+        if index < _SUB_BUCKETS:
+            return index, index + 1
+        shift = index // _SUB_BUCKETS - 1
+        mantissa = index % _SUB_BUCKETS + _SUB_BUCKETS
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def quantile(self, q: float) -> float:
+        """Approximate ``q`` quantile in nanoseconds."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                low, high = self._bounds(index)
+                return min(max((low + high) / 2, self.min), self.max)
+        return float(self.max)
+
+
+class _Timeline:
+    """
+    One thread's frames, histograms and events for one profiler.
+
+    Only the owning thread writes to it; readers copy what they need.
+    """
+
+    __slots__ = ("thread_id", "thread_name", "frames", "histograms", "events", "max_events", "dropped")
+
+    def __init__(self, trace: bool, max_events: int):
+        thread = threading.current_thread()
+        self.thread_id = thread.ident or 0
+        self.thread_name = thread.name
+        self.frames: List[List[Any]] = []  # [path, start, last, previous timeline, args]
+        self.histograms: Dict[str, _Histogram] = {}
+        self.events: Optional[List[Tuple[str, int, int, Optional[Dict[str, Any]]]]] = [] if trace else None
+        self.max_events = max_events
+        self.dropped = 0
+
+    def push(self, name: str, args: Optional[Dict[str, Any]] = None) -> "_Timeline":
+        """Open a frame nested in the current one."""
+        now = time.perf_counter_ns()
+        path = f"{self.frames[-1][0]};{name}" if self.frames else name
+        self.frames.append([path, now, now, current(), args])
+        _active.timeline = self
+        return self
+
+    def lap(self, name: str) -> None:
+        """Record the time since the frame's last phase as phase ``name``."""
+        if not self.frames:
+            return
+        frame = self.frames[-1]
+        now = time.perf_counter_ns()
+        self._record(f"{frame[0]};{name}", frame[2], now, None)
+        frame[2] = now
+
+    def pop(self) -> None:
+        """Close the current frame."""
+        path, start, _, previous, args = self.frames.pop()
+        now = time.perf_counter_ns()
+        self._record(path, start, now, args)
+        if self.frames:
+            self.frames[-1][2] = now  # The parent's next phase starts here
+        _active.timeline = previous
+
+    def _record(self, path: str, start: int, end: int, args: Optional[Dict[str, Any]]) -> None:
+        histogram = self.histograms.get(path)
+        if histogram is None:
+            histogram = self.histograms[path] = _Histogram()
+        histogram.add(end - start)
+        if self.events is not None:
+            if len(self.events) < self.max_events:
+                self.events.append((path, start, end - start, args))
+            else:
+                self.dropped += 1
+
+
+class Profiler:
+    """
+    Per-phase timing of a client's requests.
+
+    Example:
+        >>> client = ReGraph(api_key="your-api-key", profile=True)
+        >>> run_workload(client)
+        >>> print(client.profiler.report())
+        >>> client.profiler.dump("run.json")  # open in chrome://tracing or Perfetto
+        >>> client.profiler.dump("run.folded")  # flamegraph.pl / speedscope
+    """
+
+    def __init__(self, trace: bool = True, max_events: int = 100000):
+        """
+        Create a profiler.
+
+        Args:
+            trace: Keep individual events for chrome_trace(), not just histograms
+            max_events: Events kept per thread; later ones are only counted
+        """
+        self.trace = trace
+        self.max_events = max_events
+        self._local = threading.local()
+        self._timelines: List[_Timeline] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    def _timeline(self) -> _Timeline:
+        timeline = getattr(self._local, "timeline", None)
+        if timeline is None:
+            timeline = self._local.timeline = _Timeline(self.trace, self.max_events)
+            with self._lock:
+                self._timelines.append(timeline)
+        return timeline
+
+    def _begin(self, name: str, args: Optional[Dict[str, Any]] = None) -> _Timeline:
+        """Open frame ``name`` on this thread's timeline; close it with ``pop()``."""
+        return self._timeline().push(name, args)
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        """Time a block of your own code as frame ``name``, with requests inside nested under it."""
+        timeline = self._begin(name, args or None)
+        try:
+            yield
+        finally:
+            timeline.pop()
+
+    def reset(self) -> None:
+        """Discard everything recorded so far."""
+        with self._lock:
+            self._local = threading.local()
+            self._timelines = []
+            self._origin = time.perf_counter_ns()
+
+    # ---------- Reading ----------
+
+    def _merged(self) -> Dict[str, _Histogram]:
+        with self._lock:
+            timelines = list(self._timelines)
+        merged: Dict[str, _Histogram] = {}
+        for timeline in timelines:
+            for path, histogram in list(timeline.histograms.items()):
+                merged.setdefault(path, _Histogram()).merge(histogram)
+        return merged
+
+    def histograms(self) -> Dict[str, Dict[str, float]]:
+        """
+        Timing statistics per phase, merged across threads.
+
+        Returns:
+            Dict mapping the phase path (frames joined with ";") to its count
+            and total, mean, p50, p90, p99 and max in milliseconds
+        """
+        return {
+            path: {
+                "count": h.count,
+                "total_ms": h.total / 1e6,
+                "mean_ms": h.total / h.count / 1e6,
+                "p50_ms": h.quantile(0.5) / 1e6,
+                "p90_ms": h.quantile(0.9) / 1e6,
+                "p99_ms": h.quantile(0.99) / 1e6,
+                "max_ms": h.max / 1e6,
+            }
+            for path, h in self._merged().items()
+        }
+
+    def report(self) -> str:
+        """A table of phases as an indented tree, the most expensive first."""
+        stats = self.histograms()
+        children: Dict[str, List[str]] = {}
+        for path in stats:
+            parent = path.rpartition(";")[0]
+            children.setdefault(parent, []).append(path)
+
+        lines = [
+            f"{'phase':<32} {'count':>8} {'total ms':>11} {'%':>6} {'mean ms':>9} "
+            f"{'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+        ]
+
+        def walk(parent: str, depth: int) -> None:
+            parent_total = stats[parent]["total_ms"] if parent in stats else 0.0
+            for path in sorted(children.get(parent, []), key=lambda p: -stats[p]["total_ms"]):
+                s = stats[path]
+                share = f"{100 * s['total_ms'] / parent_total:.1f}" if parent_total else ""
+                name = "  " * depth + path.rpartition(";")[2]
+                lines.append(
+                    f"{name:<32} {s['count']:>8} {s['total_ms']:>11.2f} {share:>6} {s['mean_ms']:>9.3f} "
+                    f"{s['p50_ms']:>9.3f} {s['p90_ms']:>9.3f} {s['p99_ms']:>9.3f} {s['max_ms']:>9.3f}"
+                )
+                walk(path, depth + 1)
+
+        walk("", 0)
+        return "\n".join(lines)
+
+    def folded(self) -> str:
+        """
+        Self time per stack in the folded format read by flamegraph.pl and speedscope.
+
+        Each line is ``frame;frame;frame <microseconds>``.
+        """
+        merged = self._merged()
+        own = {path: h.total for path, h in merged.items()}
+        for path, h in merged.items():
+            parent = path.rpartition(";")[0]
+            if parent in own:
+                own[parent] -= h.total
+        return "\n".join(f"{path} {ns // 1000}" for path, ns in sorted(own.items()) if ns >= 1000)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """
+        Recorded events in the Chrome trace-event format.
+
+        Load the JSON in chrome://tracing or https://ui.perfetto.dev.
+        """
+        with self._lock:
+            timelines = list(self._timelines)
+            origin = self._origin
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        dropped = 0
+        for timeline in timelines:
+            events.append({
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": timeline.thread_id,
+                "args": {"name": timeline.thread_name},
+            })
+            dropped += timeline.dropped
+            for path, start, duration, args in list(timeline.events or ()):
+                event = {
+                    "name": path.rpartition(";")[2],
+                    "cat": "regraph",
+                    "ph": "X",
+                    "ts": (start - origin) / 1000,
+                    "dur": duration / 1000,
+                    "pid": pid,
+                    "tid": timeline.thread_id,
+                }
+                if args:
+                    event["args"] = args
+                events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"dropped_events": dropped}}
+
+    def dump(self, path: str, format: Optional[str] = None) -> None:
+        """
+        Write the profile to a file.
+
+        Args:
+            path: Output file
+            format: "chrome" (trace-event JSON), "folded" (flame graph stacks)
+                or "text" (the report table); by default taken from the
+                extension: .json is chrome, .folded is folded, anything else text
+        """
+        if format is None:
+            extension = os.path.splitext(path)[1].lower()
+            format = {".json": "chrome", ".folded": "folded"}.get(extension, "text")
+        if format == "chrome":
+            import json
+
+            content = json.dumps(self.chrome_trace())
+        elif format == "folded":
+            content = self.folded() + "\n"
+        elif format == "text":
+            content = self.report() + "\n"
+        else:
+            raise ValueError(f"Unknown profile format: {format!r}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
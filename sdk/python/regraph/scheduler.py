@@ -0,0 +1,233 @@
+"""
+ReGraph SDK - Request Scheduler
+
+Client-side admission control for a ``ReGraph`` instance shared by workloads
+of different urgency. Requests are tagged with a priority class; the scheduler
+limits how many run at once (overall and per class), always hands a free slot
+to the most urgent waiting class, and sheds requests that cannot finish before
+their deadline instead of letting them queue behind everything else.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence
+
+from .errors import RequestShedError
+
+
+@dataclass
+class PriorityClass:
+    """Scheduling policy for one class of requests."""
+    name: str
+    priority: int  # lower values are served first
+    max_concurrency: int
+    max_queue: int = 1000
+
+
+DEFAULT_CLASSES = (
+    PriorityClass("interactive", priority=0, max_concurrency=16, max_queue=1000),
+    PriorityClass("default", priority=1, max_concurrency=12, max_queue=1000),
+    PriorityClass("background", priority=2, max_concurrency=4, max_queue=10000),
+)
+
+
+class _Waiter:
+    __slots__ = ("deadline", "enqueued_at", "event", "granted")
+
+    def __init__(self, deadline: Optional[float]):
+        self.deadline = deadline
+        self.enqueued_at = time.monotonic()
+        self.event = threading.Event()
+        self.granted = False
+
+
+class _ClassState:
+    """Queue, counters and latency estimate for one priority class."""
+
+    def __init__(self, policy: PriorityClass):
+        self.policy = policy
+        self.queue: Deque[_Waiter] = deque()
+        self.active = 0
+        self.admitted = 0
+        self.completed = 0
+        self.shed_queue_full = 0
+        self.shed_deadline = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.service_ewma = 0.0
+
+    def record_wait(self, waited: float) -> None:
+        self.admitted += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def record_service(self, elapsed: float, alpha: float = 0.2) -> None:
+        self.completed += 1
+        if self.service_ewma == 0.0:
+            self.service_ewma = elapsed
+        else:
+            self.service_ewma += alpha * (elapsed - self.service_ewma)
+
+
+class RequestScheduler:
+    """
+    Priority scheduler with per-class concurrency caps and deadline-aware shedding.
+
+    A request whose remaining time to deadline is shorter than the class's
+    observed service time is rejected with ``RequestShedError`` rather than
+    sent, both on arrival and while it waits in the queue.
+
+    Example:
+        >>> scheduler = RequestScheduler(max_concurrency=16)
+        >>> client = ReGraph(api_key="your-api-key", scheduler=scheduler)
+        >>> background = client.with_options(priority="background")
+        >>> interactive = client.with_options(priority="interactive")
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        classes: Sequence[PriorityClass] = DEFAULT_CLASSES,
+        default_class: str = "default",
+    ):
+        """
+        Create a scheduler.
+
+        Args:
+            max_concurrency: Maximum requests in flight across all classes
+            classes: Priority classes (default: interactive, default, background)
+            default_class: Class used for requests without a priority
+        """
+        self.max_concurrency = max_concurrency
+        self.default_class = default_class
+        self._classes: Dict[str, _ClassState] = {c.name: _ClassState(c) for c in classes}
+        if default_class not in self._classes:
+            raise ValueError(f"Unknown default priority class: {default_class!r}")
+        self._order: List[_ClassState] = sorted(
+            self._classes.values(), key=lambda s: s.policy.priority
+        )
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def _state(self, priority: Optional[str]) -> _ClassState:
+        name = priority or self.default_class
+        try:
+            return self._classes[name]
+        except KeyError:
+            raise ValueError(f"Unknown priority class: {name!r}") from None
+
+    def _too_late(self, state: _ClassState, deadline: Optional[float], now: float) -> bool:
+        return deadline is not None and deadline - now < state.service_ewma
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiters, most urgent class first. Caller holds the lock."""
+        now = time.monotonic()
+        for state in self._order:
+            while state.queue and self._active < self.max_concurrency:
+                if state.active >= state.policy.max_concurrency:
+                    break
+                waiter = state.queue.popleft()
+                if self._too_late(state, waiter.deadline, now):
+                    state.shed_deadline += 1
+                    waiter.event.set()
+                    continue
+                waiter.granted = True
+                state.active += 1
+                self._active += 1
+                state.record_wait(now - waiter.enqueued_at)
+                waiter.event.set()
+
+    def _acquire(self, state: _ClassState, deadline: Optional[float]) -> None:
+        name = state.policy.name
+        with self._lock:
+            now = time.monotonic()
+            if self._too_late(state, deadline, now):
+                state.shed_deadline += 1
+                raise RequestShedError(
+                    f"Request in class '{name}' cannot finish before its deadline", reason="deadline"
+                )
+            if (
+                not state.queue
+                and self._active < self.max_concurrency
+                and state.active < state.policy.max_concurrency
+            ):
+                state.active += 1
+                self._active += 1
+                state.record_wait(0.0)
+                return
+            if len(state.queue) >= state.policy.max_queue:
+                state.shed_queue_full += 1
+                raise RequestShedError(f"Queue for class '{name}' is full", reason="queue_full")
+
+            waiter = _Waiter(deadline)
+            state.queue.append(waiter)
+
+        # Give up once there is no longer time to serve the request.
+        timeout = None
+        if deadline is not None:
+            timeout = max(0.0, deadline - state.service_ewma - time.monotonic())
+        waiter.event.wait(timeout)
+
+        with self._lock:
+            if waiter.granted:
+                return
+            if not waiter.event.is_set():
+                state.queue.remove(waiter)
+                state.shed_deadline += 1
+        raise RequestShedError(
+            f"Request in class '{name}' cannot finish before its deadline", reason="deadline"
+        )
+
+    def _release(self, state: _ClassState, elapsed: float) -> None:
+        with self._lock:
+            state.active -= 1
+            self._active -= 1
+            state.record_service(elapsed)
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, priority: Optional[str] = None, deadline: Optional[float] = None) -> Iterator[None]:
+        """
+        Hold one execution slot for the duration of a request.
+
+        Args:
+            priority: Priority class name (default: the scheduler's default class)
+            deadline: Absolute ``time.monotonic()`` time by which the request
+                must finish, or None for no deadline
+
+        Raises:
+            RequestShedError: If the queue is full or the deadline cannot be met
+        """
+        state = self._state(priority)
+        self._acquire(state, deadline)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(state, time.monotonic() - start)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Snapshot queue depth, concurrency and wait-time metrics per class.
+
+        Returns:
+            Dict mapping class name to its metrics
+        """
+        with self._lock:
+            return {
+                name: {
+                    "queued": len(s.queue),
+                    "active": s.active,
+                    "admitted": s.admitted,
+                    "completed": s.completed,
+                    "shed_queue_full": s.shed_queue_full,
+                    "shed_deadline": s.shed_deadline,
+                    "wait_ms_avg": s.wait_total / s.admitted * 1000 if s.admitted else 0.0,
+                    "wait_ms_max": s.wait_max * 1000,
+                    "service_ms_ewma": s.service_ewma * 1000,
+                }
+                for name, s in self._classes.items()
+            }
@@ -0,0 +1,351 @@
+"""
+ReGraph SDK - Semantic Cache
+
+Serves chat completions for prompts that are near-duplicates of earlier ones.
+The final message of each request is embedded with ``client.embeddings.create``
+and compared by cosine similarity against cached prompts that share the same
+model, sampling parameters and preceding conversation; a close enough match
+returns the cached ``ChatCompletion`` instead of running inference again.
+
+NumPy is used when installed (``pip install regraph[vectors]``), with an
+optional random-hyperplane LSH index for large caches; otherwise a pure-Python
+exact search is used.
+"""
+
+import copy
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from .errors import ReGraphError, RequestCancelledError
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+if TYPE_CHECKING:
+    from .client import ReGraph
+    from .models import ChatCompletion
+    from .timeouts import CancellationToken
+
+
+class _Probe:
+    """A looked-up prompt, kept so a miss can be stored without re-embedding."""
+    __slots__ = ("partition", "vector")
+
+    def __init__(self, partition: str, vector: List[float]):
+        self.partition = partition
+        self.vector = vector
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache for ``chat.completions.create``.
+
+    Example:
+        >>> cache = SemanticCache(embedding_model="text-embedding-3-small", threshold=0.95)
+        >>> client = ReGraph(api_key="your-api-key", semantic_cache=cache)
+        >>> client.chat.completions.create(model="gpt-5", messages=[...])  # miss
+        >>> client.chat.completions.create(model="gpt-5", messages=[...])  # near-duplicate: hit
+        >>> cache.metrics()["hit_rate"]
+    """
+
+    def __init__(
+        self,
+        embedding_model: str = "text-embedding-3-small",
+        threshold: float = 0.95,
+        max_entries: int = 10000,
+        ttl: Optional[float] = None,
+        index: str = "auto",
+        approximate_above: int = 50000,
+        num_planes: int = 12,
+        seed: int = 0,
+    ):
+        """
+        Create a semantic cache.
+
+        Args:
+            embedding_model: Embedding model used to embed prompts
+            threshold: Minimum cosine similarity for a hit (0-1)
+            max_entries: Entries kept before least recently used ones are evicted
+            ttl: Seconds an entry stays valid, or None for no expiry
+            index: "exact" (brute force), "lsh" (approximate; requires NumPy)
+                or "auto" (LSH once the cache holds ``approximate_above`` entries)
+            approximate_above: Size at which "auto" switches to LSH
+            num_planes: Hyperplanes per LSH signature; more planes mean smaller
+                buckets, faster lookups and lower recall
+            seed: Seed for the LSH hyperplanes
+        """
+        if index not in ("exact", "lsh", "auto"):
+            raise ValueError(f"Unknown index type: {index!r}")
+        if index == "lsh" and np is None:
+            raise ImportError("The LSH index requires NumPy: pip install regraph[vectors]")
+        if not 1 <= num_planes <= 62:
+            raise ValueError("num_planes must be between 1 and 62")
+
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.index = index
+        self.approximate_above = approximate_above
+        self.num_planes = num_planes
+        self.seed = seed
+
+        # Slot-based storage: a slot holds one cached prompt; freed slots are reused.
+        self._completions: List[Optional["ChatCompletion"]] = []
+        self._created: List[float] = []
+        self._partition_of: List[int] = []
+        self._vectors: Any = None  # np.ndarray (capacity x dim) or list of lists
+        self._partition_rows: Any = None  # np.ndarray of partition ids, -1 for free slots
+        self._free: List[int] = []
+        self._lru: "OrderedDict[int, None]" = OrderedDict()
+        self._partition_ids: Dict[str, int] = {}
+        self._planes: Any = None
+        self._weights: Any = None
+        self._buckets: Dict[Tuple[int, int], Set[int]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.embedding_errors = 0
+
+    # ---------- Keys ----------
+
+    @staticmethod
+    def _prompt_parts(data: Dict[str, Any]) -> Tuple[str, str]:
+        """Split a request into its exact-match partition and the text to embed."""
+        messages = data.get("messages", [])
+        params = {k: v for k, v in data.items() if k != "messages"}
+        head = json.dumps([params, messages[:-1]], sort_keys=True, separators=(",", ":"))
+        partition = hashlib.sha256(head.encode("utf-8")).hexdigest()
+        text = messages[-1].get("content", "") if messages else ""
+        return partition, text
+
+    # ---------- Vector storage ----------
+
+    def _normalize(self, vector: List[float]) -> Any:
+        if np is not None:
+            v = np.asarray(vector, dtype=np.float32)
+            norm = float(np.linalg.norm(v))
+            return v / norm if norm else v
+        norm = math.sqrt(sum(x * x for x in vector))
+        return [x / norm for x in vector] if norm else list(vector)
+
+    def _use_lsh(self) -> bool:
+        if np is None or self.index == "exact":
+            return False
+        return self.index == "lsh" or len(self._lru) >= self.approximate_above
+
+    def _signature(self, vector: Any) -> int:
+        if self._planes is None:
+            rng = np.random.default_rng(self.seed)
+            self._planes = rng.standard_normal((self.num_planes, len(vector))).astype(np.float32)
+            self._weights = 1 << np.arange(self.num_planes, dtype=np.int64)
+        bits = (self._planes @ vector) > 0
+        return int(bits @ self._weights)
+
+    def _allocate(self, vector: Any, partition_id: int) -> int:
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._completions)
+            self._completions.append(None)
+            self._created.append(0.0)
+            self._partition_of.append(-1)
+            if np is not None:
+                if self._vectors is None:
+                    self._vectors = np.zeros((16, len(vector)), dtype=np.float32)
+                    self._partition_rows = np.full(16, -1, dtype=np.int64)
+                elif slot >= len(self._vectors):
+                    grow = len(self._vectors)
+                    self._vectors = np.vstack(
+                        [self._vectors, np.zeros((grow, self._vectors.shape[1]), dtype=np.float32)]
+                    )
+                    self._partition_rows = np.concatenate(
+                        [self._partition_rows, np.full(grow, -1, dtype=np.int64)]
+                    )
+            else:
+                if self._vectors is None:
+                    self._vectors = []
+                self._vectors.append([])
+
+        self._vectors[slot] = vector
+        self._partition_of[slot] = partition_id
+        if np is not None:
+            self._partition_rows[slot] = partition_id
+            if self.index != "exact":
+                key = (partition_id, self._signature(vector))
+                self._buckets.setdefault(key, set()).add(slot)
+        return slot
+
+    def _release(self, slot: int) -> None:
+        partition_id = self._partition_of[slot]
+        if partition_id == -1:
+            return  # Already free
+        if np is not None:
+            self._partition_rows[slot] = -1
+            if self.index != "exact":
+                key = (partition_id, self._signature(self._vectors[slot]))
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(slot)
+                    if not bucket:
+                        del self._buckets[key]
+        self._partition_of[slot] = -1
+        self._completions[slot] = None
+        self._lru.pop(slot, None)
+        self._free.append(slot)
+
+    def _search(self, vector: Any, partition_id: int) -> Tuple[int, float]:
+        """Return the most similar live slot in a partition and its similarity."""
+        if not self._lru:
+            return -1, -1.0
+
+        if np is not None:
+            if self._use_lsh():
+                candidates = self._buckets.get((partition_id, self._signature(vector)))
+                if not candidates:
+                    return -1, -1.0
+                slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+                sims = self._vectors[slots] @ vector
+                best = int(np.argmax(sims))
+                return int(slots[best]), float(sims[best])
+
+            n = len(self._completions)
+            sims = self._vectors[:n] @ vector
+            sims[self._partition_rows[:n] != partition_id] = -np.inf
+            best = int(np.argmax(sims))
+            if not np.isfinite(sims[best]):
+                return -1, -1.0  # No live entry in the partition
+            return best, float(sims[best])
+
+        best_slot, best_sim = -1, -1.0
+        for slot in self._lru:
+            if self._partition_of[slot] != partition_id:
+                continue
+            sim = sum(a * b for a, b in zip(self._vectors[slot], vector))
+            if sim > best_sim:
+                best_slot, best_sim = slot, sim
+        return best_slot, best_sim
+
+    # ---------- Public API ----------
+
+    def lookup(
+        self,
+        client: "ReGraph",
+        data: Dict[str, Any],
+        deadline: Optional[float] = None,
+        cancel_token: Optional["CancellationToken"] = None,
+    ) -> Tuple[Optional["ChatCompletion"], Optional[_Probe]]:
+        """
+        Find a cached completion for a request body.
+
+        A failed embeddings call counts as a miss with no probe, so the chat
+        request is still sent; only cancellation is raised.
+
+        Args:
+            client: Client used to embed the prompt
+            data: Chat completion request body
+            deadline: Deadline forwarded to the embeddings call
+            cancel_token: Cancellation token forwarded to the embeddings call
+
+        Returns:
+            Tuple of (cached ChatCompletion or None, probe to pass to add() or
+            None if the prompt could not be embedded)
+        """
+        partition, text = self._prompt_parts(data)
+        try:
+            embedding = client.embeddings.create(
+                model=self.embedding_model,
+                input=text,
+                deadline=deadline,
+                cancel_token=cancel_token,
+            )
+        except RequestCancelledError:
+            raise
+        except ReGraphError:
+            with self._lock:
+                self.misses += 1
+                self.embedding_errors += 1
+            return None, None
+        probe = _Probe(partition, embedding.data[0].embedding if embedding.data else [])
+
+        with self._lock:
+            partition_id = self._partition_ids.get(partition)
+            if partition_id is None or len(probe.vector) == 0:
+                self.misses += 1
+                return None, probe
+
+            vector = self._normalize(probe.vector)
+            slot, similarity = self._search(vector, partition_id)
+            if slot >= 0 and self.ttl is not None and time.time() - self._created[slot] > self.ttl:
+                self._release(slot)
+                self.expirations += 1
+                slot = -1
+            if slot < 0 or similarity < self.threshold:
+                self.misses += 1
+                return None, probe
+
+            self.hits += 1
+            self._lru.move_to_end(slot)
+            completion = self._completions[slot]
+        return copy.deepcopy(completion), probe
+
+    def add(self, probe: _Probe, completion: "ChatCompletion") -> None:
+        """
+        Cache a completion for a prompt that missed.
+
+        Args:
+            probe: Probe returned by lookup()
+            completion: Completion returned by the API
+        """
+        if len(probe.vector) == 0:
+            return
+        vector = self._normalize(probe.vector)
+        with self._lock:
+            partition_id = self._partition_ids.setdefault(probe.partition, len(self._partition_ids))
+            while len(self._lru) >= self.max_entries:
+                oldest = next(iter(self._lru))
+                self._release(oldest)
+                self.evictions += 1
+            slot = self._allocate(vector, partition_id)
+            self._completions[slot] = completion
+            self._created[slot] = time.time()
+            self._lru[slot] = None
+
+    def clear(self) -> None:
+        """Remove all entries (metrics are kept)."""
+        with self._lock:
+            for slot in list(self._lru):
+                self._release(slot)
+            self._partition_ids.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot cache effectiveness.
+
+        Returns:
+            Dict with hits, misses, hit_rate, entries, evictions, expirations,
+            embedding_errors (lookups that could not embed the prompt) and the
+            index type currently in use
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._lru),
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "embedding_errors": self.embedding_errors,
+                "index": "lsh" if self._use_lsh() else "exact",
+            }
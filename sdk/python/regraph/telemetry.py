@@ -0,0 +1,395 @@
+"""
+ReGraph SDK - Provider Telemetry
+
+A background agent that reports the load and health of a provider device, so
+the marketplace can route work to idle capacity. It samples CPU, memory and
+load average (from /proc on Linux, or psutil elsewhere) and GPU utilisation,
+memory and temperature when ``nvidia-smi`` is available. Samples are kept in
+fixed-size float ring buffers and pushed in batches: each push carries only
+the samples the server has not acknowledged yet, as compact columns plus a
+min/avg/max summary per metric.
+"""
+
+import math
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .client import ReGraph
+
+# A sampler returns metric name -> value; metrics may come and go between calls.
+Sampler = Callable[[], Dict[str, float]]
+
+
+class RingBuffer:
+    """
+    Fixed-capacity buffer of numbers; the oldest values are overwritten.
+
+    Values are addressed by a running sequence number, so readers can ask for
+    everything appended since the sequence number they last saw.
+    """
+
+    def __init__(self, capacity: int, typecode: str = "f", start: int = 0):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._data = array(typecode, [0]) * capacity
+        self.start = start  # Sequence number of the first value ever appended
+        self.end = start  # Sequence number the next value will get
+
+    def append(self, value: float) -> None:
+        self._data[self.end % self.capacity] = value
+        self.end += 1
+
+    @property
+    def first(self) -> int:
+        """Sequence number of the oldest value still held."""
+        return max(self.start, self.end - self.capacity)
+
+    def since(self, seq: int) -> List[float]:
+        """Values with sequence numbers from ``seq`` on that are still held."""
+        return [self._data[i % self.capacity] for i in range(max(seq, self.first), self.end)]
+
+    def __len__(self) -> int:
+        return self.end - self.first
+
+
+class SystemSampler:
+    """CPU, memory and load average of this machine."""
+
+    def __init__(self) -> None:
+        self._linux = sys.platform.startswith("linux") and os.path.exists("/proc/stat")
+        self._last_cpu: Optional[List[int]] = None
+        self._psutil: Any = None
+        if not self._linux:
+            try:
+                import psutil
+            except ImportError:
+                psutil = None  # Only the load average is available
+            self._psutil = psutil
+            if psutil is not None:
+                psutil.cpu_percent(interval=None)  # Prime the counter
+
+    def __call__(self) -> Dict[str, float]:
+        values: Dict[str, float] = {}
+        if self._linux:
+            cpu = self._proc_cpu_percent()
+            if cpu is not None:
+                values["cpu_percent"] = cpu
+            values.update(self._proc_memory())
+        elif self._psutil is not None:
+            memory = self._psutil.virtual_memory()
+            values["cpu_percent"] = self._psutil.cpu_percent(interval=None)
+            values["memory_percent"] = memory.percent
+            values["memory_available_mb"] = memory.available / 1048576
+        if hasattr(os, "getloadavg"):
+            values["load_1m"] = os.getloadavg()[0]
+        return values
+
+    def _proc_cpu_percent(self) -> Optional[float]:
+        with open("/proc/stat", "rb") as f:
+            fields = [int(x) for x in f.readline().split()[1:]]
+        last, self._last_cpu = self._last_cpu, fields
+        if last is None:
+            return None
+        # idle + iowait count as idle time
+        total = sum(fields) - sum(last)
+        idle = fields[3] + fields[4] - last[3] - last[4]
+        return 100.0 * (total - idle) / total if total > 0 else 0.0
+
+    @staticmethod
+    def _proc_memory() -> Dict[str, float]:
+        info = {}
+        with open("/proc/meminfo", "rb") as f:
+            for line in f:
+                name, _, rest = line.partition(b":")
+                if name in (b"MemTotal", b"MemAvailable"):
+                    info[name] = int(rest.split()[0])  # kB
+                    if len(info) == 2:
+                        break
+        total = info.get(b"MemTotal")
+        available = info.get(b"MemAvailable")
+        if not total or available is None:
+            return {}
+        return {"memory_percent": 100.0 * (total - available) / total, "memory_available_mb": available / 1024}
+
+
+class GPUSampler:
+    """Per-GPU utilisation, memory and temperature from ``nvidia-smi``."""
+
+    QUERY = "index,utilization.gpu,memory.used,memory.total,temperature.gpu"
+
+    def __init__(self, command: str = "nvidia-smi", timeout: float = 5.0):
+        self.command = shutil.which(command)
+        self.timeout = timeout
+
+    @property
+    def available(self) -> bool:
+        return self.command is not None
+
+    def __call__(self) -> Dict[str, float]:
+        if self.command is None:
+            return {}
+        try:
+            output = subprocess.run(
+                [self.command, f"--query-gpu={self.QUERY}", "--format=csv,noheader,nounits"],
+                capture_output=True,
+                timeout=self.timeout,
+                check=True,
+            ).stdout.decode()
+        except (OSError, subprocess.SubprocessError):
+            return {}
+        values: Dict[str, float] = {}
+        for line in output.splitlines():
+            fields = [x.strip() for x in line.split(",")]
+            if len(fields) != 5:
+                continue
+            try:
+                index, util, used, total, temperature = (float(x) for x in fields)
+            except ValueError:  # "[N/A]" on some boards
+                continue
+            prefix = f"gpu{int(index)}"
+            values[f"{prefix}_utilization"] = util
+            values[f"{prefix}_memory_percent"] = 100.0 * used / total if total else 0.0
+            values[f"{prefix}_temperature"] = temperature
+        return values
+
+
+class TelemetryAgent:
+    """
+    Samples device metrics in the background and pushes them in batches.
+
+    Example:
+        >>> with client.provider.telemetry(device_id="dev_123") as agent:
+        ...     serve_jobs()
+        >>> agent.metrics()
+    """
+
+    def __init__(
+        self,
+        client: "ReGraph",
+        device_id: str,
+        sample_interval: float = 1.0,
+        push_interval: float = 15.0,
+        capacity: int = 3600,
+        gpu_interval: float = 5.0,
+        samplers: Optional[List[Sampler]] = None,
+        precision: int = 1,
+    ):
+        """
+        Create an agent (call start() to begin sampling).
+
+        Args:
+            client: ReGraph client to push with
+            device_id: Device ID returned by provider.register
+            sample_interval: Seconds between samples
+            push_interval: Seconds between pushes
+            capacity: Samples kept per metric while pushes are failing; older
+                samples are dropped (and counted)
+            gpu_interval: Seconds between GPU samples; nvidia-smi is much more
+                expensive than reading /proc
+            samplers: Callables returning metric name -> value (default: system
+                metrics plus GPUs when nvidia-smi is present)
+            precision: Decimal places values are rounded to when pushed
+        """
+        self.client = client
+        self.device_id = device_id
+        self.sample_interval = sample_interval
+        self.push_interval = push_interval
+        self.capacity = capacity
+        self.precision = precision
+        if samplers is None:
+            samplers = [SystemSampler()]
+            gpus = GPUSampler()
+            if gpus.available:
+                samplers.append(_Throttled(gpus, gpu_interval))
+        self.samplers = samplers
+
+        self._times = RingBuffer(capacity, "d")
+        self._series: Dict[str, RingBuffer] = {}
+        self._pushed = 0  # Sequence number of the first sample not yet acknowledged
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {
+            "samples": 0,
+            "sample_failures": 0,
+            "pushes": 0,
+            "push_failures": 0,
+            "dropped": 0,
+            "sampling_seconds": 0.0,
+        }
+        self._last_error: Optional[str] = None
+
+    # ---------- Sampling ----------
+
+    def sample(self) -> Dict[str, float]:
+        """
+        Take one sample from every sampler and append it to the buffers.
+
+        A sampler that raises is counted in ``sample_failures`` and its
+        metrics are missing from this sample; the others are still recorded.
+        """
+        started = time.perf_counter()
+        values: Dict[str, float] = {}
+        for sampler in self.samplers:
+            try:
+                values.update(sampler())
+            except Exception as e:
+                self._failed("sample_failures", e)
+        with self._lock:
+            seq = self._times.end
+            if seq - self._pushed >= self.capacity:
+                self._stats["dropped"] += 1
+                self._pushed += 1
+            self._times.append(time.time())
+            for name in values.keys() - self._series.keys():
+                self._series[name] = RingBuffer(self.capacity, "f", start=seq)
+            for name, series in self._series.items():
+                series.append(values.get(name, math.nan))
+            self._stats["samples"] += 1
+            self._stats["sampling_seconds"] += time.perf_counter() - started
+        return values
+
+    # ---------- Pushing ----------
+
+    def pending(self) -> Dict[str, Any]:
+        """The push payload for all samples not yet acknowledged."""
+        with self._lock:
+            return self._payload(self._pushed)[1]
+
+    def _payload(self, since: int) -> Tuple[int, Dict[str, Any]]:
+        times = self._times.since(since)
+        end = self._times.end
+        if not times:
+            return end, {}
+        base = times[0]
+        first = end - len(times)
+        metrics = {}
+        summary = {}
+        for name, series in self._series.items():
+            values = [None] * max(0, series.first - first) + [
+                None if math.isnan(v) else round(v, self.precision) for v in series.since(first)
+            ]
+            present = [v for v in values if v is not None]
+            if not present:
+                continue
+            metrics[name] = values
+            summary[name] = {
+                "min": min(present),
+                "avg": round(sum(present) / len(present), self.precision),
+                "max": max(present),
+                "last": present[-1],
+            }
+        payload = {
+            "device_id": self.device_id,
+            "start": round(base, 3),
+            "t": [int((t - base) * 1000) for t in times],  # ms offsets from start
+            "metrics": metrics,
+            "summary": summary,
+            "dropped": self._stats["dropped"],
+        }
+        return end, payload
+
+    def push(self) -> bool:
+        """
+        Push all unacknowledged samples now.
+
+        Returns:
+            True if the push succeeded (or there was nothing to push); failed
+            samples stay buffered for the next push
+        """
+        with self._lock:
+            end, payload = self._payload(self._pushed)
+        if not payload:
+            return True
+        try:
+            self.client._request("POST", "/provider/telemetry", payload, timeout=self.push_interval)
+        except Exception as e:  # ReGraphError, or a reply that is not JSON
+            self._failed("push_failures", e)
+            return False
+        with self._lock:
+            self._pushed = max(self._pushed, end)
+            self._stats["pushes"] += 1
+        return True
+
+    # ---------- Lifecycle ----------
+
+    def start(self) -> "TelemetryAgent":
+        """Start sampling and pushing on a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="regraph-telemetry", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, flush: bool = True) -> None:
+        """Stop the agent, pushing any remaining samples first if ``flush``."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if flush:
+            self.push()
+
+    def _run(self) -> None:
+        next_sample = next_push = time.monotonic()
+        next_push += self.push_interval
+        while not self._stop.is_set():
+            now = time.monotonic()
+            # Errors are counted, never raised: they would end the thread silently.
+            # (push() already counts its own.)
+            if now >= next_sample:
+                try:
+                    self.sample()
+                except Exception as e:
+                    self._failed("sample_failures", e)
+                # Skip missed slots rather than sampling in a burst after a stall.
+                next_sample += max(1, math.ceil((now - next_sample) / self.sample_interval)) * self.sample_interval
+            if now >= next_push:
+                self.push()
+                next_push = time.monotonic() + self.push_interval
+            self._stop.wait(max(0.0, min(next_sample, next_push) - time.monotonic()))
+
+    def _failed(self, counter: str, error: BaseException) -> None:
+        with self._lock:
+            self._stats[counter] += 1
+            self._last_error = f"{type(error).__name__}: {error}"
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters for the agent itself, including its own sampling cost and last error."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["last_error"] = self._last_error
+            stats["buffered"] = self._times.end - max(self._pushed, self._times.first)
+            stats["metrics"] = sorted(self._series)
+        return stats
+
+    def __enter__(self) -> "TelemetryAgent":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+class _Throttled:
+    """Calls a sampler at most every ``interval`` seconds, repeating its last values in between."""
+
+    def __init__(self, sampler: Sampler, interval: float):
+        self.sampler = sampler
+        self.interval = interval
+        self._next = 0.0
+        self._last: Dict[str, float] = {}
+
+    def __call__(self) -> Dict[str, float]:
+        now = time.monotonic()
+        if now >= self._next:
+            self._last = self.sampler()
+            self._next = now + self.interval
+        return self._last
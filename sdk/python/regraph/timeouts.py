@@ -0,0 +1,92 @@
+"""
+ReGraph SDK - Timeouts and Cancellation
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Union
+
+from .errors import RequestCancelledError
+
+
+@dataclass(frozen=True)
+class Timeout:
+    """
+    Timeout settings for a request, in seconds.
+
+    Attributes:
+        connect: Limit for establishing the connection (TCP + TLS)
+        read: Limit for each read from the server while waiting or downloading
+        total: Limit for the whole call, including queueing and a slow body
+    """
+    connect: Optional[float] = None
+    read: Optional[float] = None
+    total: Optional[float] = None
+
+    @classmethod
+    def coerce(cls, value: Union[float, "Timeout", None]) -> "Timeout":
+        """Convert a legacy per-operation number of seconds into a Timeout."""
+        if value is None or isinstance(value, Timeout):
+            return value or cls()
+        return cls(connect=value, read=value)
+
+
+class CancellationToken:
+    """
+    Cancels in-flight calls from another thread.
+
+    Pass the same token to any number of calls; ``cancel()`` closes their
+    connections immediately and makes them raise ``RequestCancelledError``.
+
+    Example:
+        >>> token = CancellationToken()
+        >>> threading.Timer(5.0, token.cancel).start()
+        >>> client.chat.completions.create(model="gpt-5", messages=messages, cancel_token=token)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks: Dict[int, Callable[[], None]] = {}
+        self._next_handle = 0
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() has been called."""
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """Cancel all calls using this token, now and in the future."""
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = list(self._callbacks.values()), {}
+        for callback in callbacks:
+            callback()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise RequestCancelledError if the token has been cancelled."""
+        if self._cancelled:
+            raise RequestCancelledError("Request was cancelled")
+
+    def register(self, callback: Callable[[], None]) -> int:
+        """
+        Run ``callback`` on cancellation (immediately if already cancelled).
+
+        Returns:
+            Handle for unregister()
+        """
+        with self._lock:
+            if not self._cancelled:
+                handle = self._next_handle
+                self._next_handle += 1
+                self._callbacks[handle] = callback
+                return handle
+        callback()
+        return -1
+
+    def unregister(self, handle: int) -> None:
+        """Remove a callback added with register()."""
+        with self._lock:
+            self._callbacks.pop(handle, None)
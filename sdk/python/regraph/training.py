@@ -0,0 +1,118 @@
+"""
+ReGraph SDK - Training Job Watching
+
+Follows many training jobs from one poll loop. Each round fetches every
+watched job (one list call when watching several, individual gets otherwise),
+compares it with the previous snapshot, and emits an event only for jobs whose
+status, progress or ETA changed. The poll interval backs off while nothing
+changes and resets as soon as something does.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from ._retry import retryable
+from .errors import ReGraphError
+
+if TYPE_CHECKING:
+    from .client import ReGraph
+    from .models import TrainingJob
+    from .timeouts import CancellationToken
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+WATCHED_FIELDS = ("status", "progress", "eta_minutes")
+
+
+@dataclass
+class TrainingJobEvent:
+    """A change in one watched training job."""
+    job: "TrainingJob"
+    previous: Optional["TrainingJob"]  # None for the first snapshot of the job
+    changed: Tuple[str, ...]  # Names from WATCHED_FIELDS that differ from previous
+
+    @property
+    def job_id(self) -> str:
+        return self.job.job_id
+
+    @property
+    def done(self) -> bool:
+        return self.job.status in TERMINAL_STATUSES
+
+
+def watch_jobs(
+    client: "ReGraph",
+    job_ids: Iterable[str],
+    poll_interval: float = 5.0,
+    max_poll_interval: float = 60.0,
+    list_threshold: int = 4,
+    until_done: bool = True,
+    cancel_token: Optional["CancellationToken"] = None,
+) -> Iterator[TrainingJobEvent]:
+    """Implementation of ``client.training.jobs.watch``; see its docstring."""
+    order = list(dict.fromkeys(job_ids))
+    pending = set(order)
+    last: Dict[str, "TrainingJob"] = {}
+    interval = poll_interval
+    wake = threading.Event()
+    handle = cancel_token.register(wake.set) if cancel_token is not None else None
+
+    def get(job_id: str) -> Optional["TrainingJob"]:
+        try:
+            return client.training.jobs.get(job_id, cancel_token=cancel_token)
+        except ReGraphError as e:
+            if not retryable(e):
+                raise
+            return None  # Try again next round
+
+    try:
+        with ThreadPoolExecutor(min(8, max(1, len(order))), thread_name_prefix="regraph-watch") as executor:
+            while pending:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+
+                jobs: Dict[str, "TrainingJob"] = {}
+                if len(pending) >= list_threshold:
+                    try:
+                        listed = client.training.jobs.list(cancel_token=cancel_token)
+                    except ReGraphError as e:
+                        if not retryable(e):
+                            raise
+                        listed = []
+                    jobs = {job.job_id: job for job in listed if job.job_id in pending}
+                # Jobs the list did not include (or all of them, for small watches).
+                missing = [job_id for job_id in order if job_id in pending and job_id not in jobs]
+                for job_id, job in zip(missing, executor.map(get, missing)):
+                    if job is not None:
+                        jobs[job_id] = job
+
+                changed_any = False
+                for job_id in order:
+                    job = jobs.get(job_id)
+                    if job is None:
+                        continue
+                    previous = last.get(job_id)
+                    changed = _diff(previous, job)
+                    if changed:
+                        changed_any = True
+                        last[job_id] = job
+                        event = TrainingJobEvent(job=job, previous=previous, changed=changed)
+                        if event.done and until_done:
+                            pending.discard(job_id)
+                        yield event
+
+                if not pending:
+                    break
+                interval = poll_interval if changed_any else min(interval * 1.5, max_poll_interval)
+                wake.wait(interval)
+    finally:
+        if handle is not None:
+            cancel_token.unregister(handle)
+
+
+def _diff(previous: Optional["TrainingJob"], job: "TrainingJob") -> Tuple[str, ...]:
+    if previous is None:
+        return WATCHED_FIELDS
+    return tuple(name for name in WATCHED_FIELDS if getattr(previous, name) != getattr(job, name))
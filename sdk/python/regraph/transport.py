@@ -0,0 +1,383 @@
+"""
+ReGraph SDK - Transports
+
+A transport sends one encoded API request and returns the raw response. The
+client uses a transport for every call, so networking can be swapped without
+touching request building or error handling:
+
+- ``HTTPTransport``: the default; HTTP/1.1 keep-alive connection pool
+- ``HTTP2Transport``: multiplexes concurrent requests over a few HTTP/2
+  connections (requires ``h2``)
+- ``MockTransport``: in-memory canned responses, for tests and benchmarks of
+  high-concurrency code without a network
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from .errors import RequestCancelledError, RequestTimeoutError
+
+if TYPE_CHECKING:
+    from .timeouts import CancellationToken, Timeout
+
+# (method, path, body, headers) -> (status, body)
+Handler = Callable[[str, str, Optional[bytes], Dict[str, str]], Tuple[int, bytes]]
+
+
+class Transport:
+    """
+    Interface for sending requests on behalf of a ReGraph client.
+
+    Subclasses implement ``request``; ``stream`` returns the whole body as a
+    single chunk unless a subclass can stream it.
+    """
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional["Timeout"] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional["CancellationToken"] = None,
+    ) -> Tuple[int, bytes]:
+        """
+        Send a request and read the full response.
+
+        Args:
+            method: HTTP method
+            path: Request path relative to the API base URL, including query
+            body: Encoded request body
+            headers: Request headers
+            timeout: Connect/read limits
+            deadline: Absolute time.monotonic() time the response must be read by
+            cancel: Token whose cancellation aborts the request
+
+        Returns:
+            Tuple of (status code, response body)
+
+        Raises:
+            RequestTimeoutError: If a timeout or the deadline is exceeded
+            RequestCancelledError: If the token is cancelled
+            OSError: On connection failures
+        """
+        raise NotImplementedError
+
+    def stream(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional["Timeout"] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional["CancellationToken"] = None,
+    ) -> Tuple[int, Iterator[bytes]]:
+        """
+        Send a request and return the status with an iterator over body chunks.
+
+        Transports that cannot stream return the whole body as one chunk.
+        Arguments are as for request().
+        """
+        status, payload = self.request(method, path, body, headers, timeout, deadline, cancel)
+        return status, iter((payload,))
+
+    def close(self) -> None:
+        """Release connections held by the transport."""
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class HTTPTransport(Transport):
+    """HTTP/1.1 transport reusing up to ``max_connections`` keep-alive connections."""
+
+    def __init__(self, base_url: str, max_connections: int = 10, timeout: Optional["Timeout"] = None):
+        """
+        Create an HTTP transport.
+
+        Args:
+            base_url: API base URL, e.g. https://api.regraph.tech/v1
+            max_connections: Maximum idle keep-alive connections to reuse
+            timeout: Default connect/read limits
+        """
+        from ._pool import ConnectionPool
+
+        self._pool = ConnectionPool(base_url, maxsize=max_connections, timeout=timeout)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional["Timeout"] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional["CancellationToken"] = None,
+    ) -> Tuple[int, bytes]:
+        return self._pool.request(method, path, body, headers, timeout, deadline, cancel)
+
+    def stream(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional["Timeout"] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional["CancellationToken"] = None,
+    ) -> Tuple[int, Iterator[bytes]]:
+        return self._pool.stream(method, path, body, headers, timeout, deadline, cancel)
+
+    def close(self) -> None:
+        self._pool.close()
+
+
+class HTTP2Transport(Transport):
+    """
+    HTTP/2 transport multiplexing concurrent requests as streams.
+
+    Thousands of concurrent requests share ``max_connections`` TCP connections
+    instead of needing one socket each. HTTPS servers that do not negotiate
+    HTTP/2 are used over HTTP/1.1 instead; plain ``http://`` URLs use HTTP/2
+    with prior knowledge (h2c).
+
+    Example:
+        >>> transport = HTTP2Transport("https://api.regraph.tech/v1")
+        >>> client = ReGraph(api_key="your-api-key", transport=transport)
+        >>> transport.metrics()["active_streams"]
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int = 2,
+        max_streams_per_connection: int = 256,
+        timeout: Optional["Timeout"] = None,
+        window_size: int = 4 * 1024 * 1024,
+        ssl_context: Any = None,
+    ):
+        """
+        Create an HTTP/2 transport.
+
+        Args:
+            base_url: API base URL, e.g. https://api.regraph.tech/v1
+            max_connections: Maximum HTTP/2 connections to open
+            max_streams_per_connection: Concurrent streams per connection; the
+                server's SETTINGS_MAX_CONCURRENT_STREAMS applies if lower
+            timeout: Default connect/read limits
+            window_size: Flow-control window advertised per stream and for the
+                connection, in bytes
+            ssl_context: ssl.SSLContext for HTTPS connections
+
+        Raises:
+            ImportError: If the h2 package is not installed
+        """
+        from ._h2 import H2ConnectionPool
+
+        self._pool = H2ConnectionPool(
+            base_url,
+            max_connections=max_connections,
+            max_streams_per_connection=max_streams_per_connection,
+            timeout=timeout,
+            window_size=window_size,
+            ssl_context=ssl_context,
+        )
+        self._base_url = base_url
+        self._timeout = timeout
+        self._fallback: Optional[HTTPTransport] = None
+
+    def _call(self, send: Callable[[Any], Any]) -> Any:
+        if self._fallback is None:
+            from ._h2 import H2NotNegotiated
+
+            try:
+                return send(self._pool)
+            except H2NotNegotiated:
+                if self._fallback is None:
+                    self._fallback = HTTPTransport(
+                        self._base_url, max_connections=self._pool.max_connections, timeout=self._timeout
+                    )
+        return send(self._fallback)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional["Timeout"] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional["CancellationToken"] = None,
+    ) -> Tuple[int, bytes]:
+        return self._call(lambda pool: pool.request(method, path, body, headers, timeout, deadline, cancel))
+
+    def stream(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional["Timeout"] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional["CancellationToken"] = None,
+    ) -> Tuple[int, Iterator[bytes]]:
+        return self._call(lambda pool: pool.stream(method, path, body, headers, timeout, deadline, cancel))
+
+    @property
+    def http2(self) -> bool:
+        """False once the server turned out not to support HTTP/2."""
+        return self._fallback is None
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot connection-level statistics.
+
+        Returns:
+            Dict with open connections, active and peak concurrent streams,
+            streams opened, bytes sent/received, flow-control and slot waits,
+            plus per-connection details
+        """
+        return self._pool.metrics()
+
+    def close(self) -> None:
+        self._pool.close()
+        if self._fallback is not None:
+            self._fallback.close()
+
+
+class MockResponse:
+    """A canned response served by MockTransport."""
+
+    __slots__ = ("status", "body", "latency")
+
+    def __init__(
+        self,
+        body: Union[bytes, str, Dict[str, Any], List[Any]] = b"",
+        status: int = 200,
+        latency: float = 0.0,
+    ):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.body = body
+        self.status = status
+        self.latency = latency
+
+
+class MockTransport(Transport):
+    """
+    In-memory transport serving canned responses.
+
+    Responses are registered per (method, path); the query string is ignored
+    when matching. Several responses for one route are served in order and the
+    last one is repeated. Requests are recorded in ``calls``.
+
+    Example:
+        >>> transport = MockTransport()
+        >>> transport.add("POST", "/inference", {"id": "c1", "choices": [...]}, latency=0.05)
+        >>> transport.add("GET", "/status", {"error": {"message": "down"}}, status=503)
+        >>> client = ReGraph(api_key="test", transport=transport)
+    """
+
+    def __init__(self, handler: Optional[Handler] = None, latency: float = 0.0, record_calls: bool = True):
+        """
+        Create a mock transport.
+
+        Args:
+            handler: Fallback called as handler(method, path, body, headers) for
+                unregistered routes; returns (status, body). Unmatched requests
+                get a 404 when no handler is set.
+            latency: Default simulated latency in seconds
+            record_calls: Keep (method, path, body, headers) of every request in ``calls``
+        """
+        self.handler = handler
+        self.latency = latency
+        self.record_calls = record_calls
+        self.calls: List[Tuple[str, str, Optional[bytes], Dict[str, str]]] = []
+        self._routes: Dict[Tuple[str, str], Deque[MockResponse]] = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        method: str,
+        path: str,
+        body: Union[bytes, str, Dict[str, Any], List[Any]] = b"",
+        status: int = 200,
+        latency: Optional[float] = None,
+    ) -> None:
+        """
+        Register a response for a route.
+
+        Args:
+            method: HTTP method
+            path: Path relative to the API base URL, without query string
+            body: Response body; dicts and lists are encoded as JSON
+            status: HTTP status code
+            latency: Simulated latency in seconds (default: the transport's)
+        """
+        response = MockResponse(body, status, self.latency if latency is None else latency)
+        with self._lock:
+            self._routes.setdefault((method.upper(), path), deque()).append(response)
+
+    def _resolve(
+        self, method: str, path: str, body: Optional[bytes], headers: Optional[Dict[str, str]]
+    ) -> MockResponse:
+        headers = dict(headers or {})
+        route = (method.upper(), path.split("?", 1)[0])
+        with self._lock:
+            if self.record_calls:
+                self.calls.append((method, path, body, headers))
+            queue = self._routes.get(route)
+            if queue:
+                return queue.popleft() if len(queue) > 1 else queue[0]
+        if self.handler is not None:
+            status, payload = self.handler(method, path, body, headers)
+            return MockResponse(payload, status, self.latency)
+        return MockResponse({"error": {"message": f"No mock response for {method} {path}"}}, 404)
+
+    @staticmethod
+    def _wait_time(latency: float, deadline: Optional[float]) -> Tuple[float, bool]:
+        """Return how long to wait and whether the deadline cuts the wait short."""
+        if deadline is None:
+            return latency, False
+        remaining = deadline - time.monotonic()
+        return (remaining, True) if remaining < latency else (latency, False)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional["Timeout"] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional["CancellationToken"] = None,
+    ) -> Tuple[int, bytes]:
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        response = self._resolve(method, path, body, headers)
+        wait, expires = self._wait_time(response.latency, deadline)
+        if wait > 0:
+            if cancel is not None:
+                cancelled = threading.Event()
+                handle = cancel.register(cancelled.set)
+                try:
+                    cancelled.wait(wait)
+                finally:
+                    cancel.unregister(handle)
+            else:
+                time.sleep(wait)
+        if cancel is not None and cancel.cancelled:
+            raise RequestCancelledError("Request was cancelled")
+        if expires:
+            raise RequestTimeoutError("Request deadline exceeded")
+        return response.status, response.body
@@ -0,0 +1,261 @@
+"""
+ReGraph SDK - Chunked Uploads
+
+Uploads large local files (training datasets, model weights) as a multipart
+upload: the file is memory-mapped, split into fixed-size parts, and a bounded
+number of parts are sent concurrently, each retried on its own. Completed parts
+are recorded in a ``.upload.json`` manifest next to the file, so an interrupted
+upload resumes by sending only the parts the server does not have yet.
+
+Protocol:
+    POST /uploads                      -> {"upload_id", "part_size"}
+    GET  /uploads/{id}                 -> {"parts": [{"part_number", "sha256"}]}
+    PUT  /uploads/{id}/parts/{n}       raw bytes, X-Content-SHA256 header
+    POST /uploads/{id}/complete        -> UploadedFile
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from ._retry import backoff, retryable
+from .errors import ReGraphError
+
+if TYPE_CHECKING:
+    from .client import ReGraph
+    from .models import UploadedFile
+    from .timeouts import CancellationToken
+
+MANIFEST_SUFFIX = ".upload.json"
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+
+
+@dataclass
+class UploadProgress:
+    """Progress of one file upload."""
+    bytes_done: int  # Including parts sent by an earlier, interrupted run
+    bytes_total: int
+    parts_done: int
+    parts_total: int
+    retries: int
+    elapsed: float
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_done / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class _UploadManifest:
+    """Upload ID and completed parts, persisted so an upload can be resumed."""
+
+    def __init__(self, path: str, identity: Dict[str, Any], resume: bool):
+        self.path = path
+        self.identity = identity
+        self.upload_id: Optional[str] = None
+        self.part_size: Optional[int] = None  # As chosen by the server, which may differ from the caller's
+        self.parts: Dict[int, str] = {}  # part number -> sha256
+        self._lock = threading.Lock()
+
+        if resume and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("identity") == identity:
+                self.upload_id = state["upload_id"]
+                self.part_size = state.get("part_size")
+                self.parts = {int(n): sha for n, sha in state["parts"].items()}
+
+    def record(self, part_number: int, sha256: str) -> None:
+        with self._lock:
+            self.parts[part_number] = sha256
+            self._save()
+
+    def save(self) -> None:
+        with self._lock:
+            self._save()
+
+    def _save(self) -> None:
+        state = {
+            "identity": self.identity,
+            "upload_id": self.upload_id,
+            "part_size": self.part_size,
+            "parts": self.parts,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def discard(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def upload_file(
+    client: "ReGraph",
+    path: str,
+    purpose: str = "dataset",
+    filename: Optional[str] = None,
+    part_size: int = DEFAULT_PART_SIZE,
+    concurrency: int = 4,
+    resume: bool = True,
+    max_retries: int = 5,
+    manifest_path: Optional[str] = None,
+    progress: Optional[Callable[[UploadProgress], None]] = None,
+    cancel_token: Optional["CancellationToken"] = None,
+) -> "UploadedFile":
+    """Implementation of ``client.files.upload``; see its docstring."""
+    from .models import UploadedFile
+
+    if part_size < 1 or concurrency < 1:
+        raise ValueError("part_size and concurrency must be at least 1")
+    stat = os.stat(path)
+    size = stat.st_size
+    filename = filename or os.path.basename(path)
+
+    with open(path, "rb") as f:
+        view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+    try:
+        # A changed file must not resume into an upload of its old contents.
+        identity = {
+            "filename": filename,
+            "purpose": purpose,
+            "size": size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": hashlib.sha256(view).hexdigest(),
+            "part_size": part_size,
+        }
+        manifest = _UploadManifest(manifest_path or path + MANIFEST_SUFFIX, identity, resume)
+
+        if manifest.upload_id is not None:
+            part_size = manifest.part_size or part_size
+            try:
+                state = client._request("GET", f"/uploads/{manifest.upload_id}", cancel_token=cancel_token)
+            except ReGraphError as e:
+                if e.status_code not in (404, 410):
+                    raise
+                manifest.upload_id, manifest.parts = None, {}  # Expired on the server; start over
+            else:
+                on_server = {p.get("part_number"): p.get("sha256") for p in state.get("parts", [])}
+                manifest.parts = {
+                    n: sha for n, sha in manifest.parts.items() if n in on_server and on_server[n] in (sha, None)
+                }
+                # Parts the server stored after the last run stopped waiting for them.
+                for n, sha in on_server.items():
+                    if n not in manifest.parts and sha is not None:
+                        offset = (n - 1) * part_size
+                        if 0 <= offset < size and hashlib.sha256(view[offset : offset + part_size]).hexdigest() == sha:
+                            manifest.parts[n] = sha
+
+        if manifest.upload_id is None:
+            # Not journaled: the manifest already carries the upload across restarts,
+            # and a journaled replay would hand back an upload that has since expired.
+            response = client._request(
+                "POST",
+                "/uploads",
+                {
+                    "filename": filename,
+                    "purpose": purpose,
+                    "size_bytes": size,
+                    "part_size": part_size,
+                    "sha256": identity["sha256"],
+                },
+                cancel_token=cancel_token,
+            )
+            manifest.upload_id = response["upload_id"]
+            # The identity keeps the caller's part size so a rerun with the same
+            # arguments still matches this manifest.
+            part_size = manifest.part_size = response.get("part_size", part_size)
+        manifest.save()
+
+        parts = [(n + 1, offset, min(part_size, size - offset)) for n, offset in enumerate(range(0, size, part_size))]
+        if not parts:
+            parts = [(1, 0, 0)]
+        _send_parts(client, manifest, view, parts, concurrency, max_retries, progress, cancel_token)
+
+        response = client._journaled_request(
+            "POST",
+            f"/uploads/{manifest.upload_id}/complete",
+            {"parts": [{"part_number": n, "sha256": sha} for n, sha in sorted(manifest.parts.items())]},
+            cancel_token=cancel_token,
+        )
+    finally:
+        if isinstance(view, mmap.mmap):
+            view.close()
+
+    manifest.discard()
+    return client._parse(UploadedFile, response)
+
+
+def _send_parts(
+    client: "ReGraph",
+    manifest: _UploadManifest,
+    view: Any,
+    parts: List[Tuple[int, int, int]],
+    concurrency: int,
+    max_retries: int,
+    progress: Optional[Callable[[UploadProgress], None]],
+    cancel_token: Optional["CancellationToken"],
+) -> None:
+    """PUT every part the manifest does not have yet, at most ``concurrency`` at a time."""
+    sizes = {n: length for n, _, length in parts}
+    stats_lock = threading.Lock()
+    started = time.monotonic()
+    stats = UploadProgress(
+        bytes_done=sum(sizes[n] for n in manifest.parts if n in sizes),
+        bytes_total=sum(sizes.values()),
+        parts_done=len(manifest.parts),
+        parts_total=len(parts),
+        retries=0,
+        elapsed=0.0,
+    )
+    errors: List[BaseException] = []
+
+    def send(part_number: int, offset: int, length: int) -> None:
+        if errors:
+            return
+        try:
+            # Slicing the map copies just this part into memory, so memory use
+            # is bounded by the number of parts in flight.
+            payload = bytes(view[offset : offset + length])
+            digest = hashlib.sha256(payload).hexdigest()
+            headers = {"Content-Type": "application/octet-stream", "X-Content-SHA256": digest}
+            for attempt in range(max_retries + 1):
+                try:
+                    client._send(
+                        "PUT",
+                        f"/uploads/{manifest.upload_id}/parts/{part_number}",
+                        payload,
+                        headers,
+                        cancel_token=cancel_token,
+                    )
+                    break
+                except ReGraphError as e:
+                    if attempt == max_retries or not retryable(e) or errors:
+                        raise
+                    with stats_lock:
+                        stats.retries += 1
+                    time.sleep(backoff(attempt))
+            manifest.record(part_number, digest)
+
+            with stats_lock:
+                stats.parts_done += 1
+                stats.bytes_done += length
+                stats.elapsed = time.monotonic() - started
+                snapshot = UploadProgress(**stats.__dict__)
+            if progress is not None:
+                progress(snapshot)
+        except BaseException as e:
+            errors.append(e)
+
+    with ThreadPoolExecutor(concurrency, thread_name_prefix="regraph-upload") as executor:
+        for part_number, offset, length in parts:
+            if part_number not in manifest.parts:
+                executor.submit(send, part_number, offset, length)
+    if errors:
+        raise errors[0]
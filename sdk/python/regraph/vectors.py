@@ -0,0 +1,307 @@
+"""
+ReGraph SDK - Vector Index
+
+In-process similarity search over embeddings. ``Embedding`` responses are
+ingested directly into one contiguous float32 matrix whose rows are normalised
+once on insertion, so cosine similarity is a single matrix product at query
+time.
+
+On disk an index is a directory holding the raw matrix (``vectors.f32``), a
+small ``meta.json`` and, if custom IDs were given, ``ids.json``. Loading maps
+the matrix into memory instead of reading it, so large indexes open instantly.
+
+Requires NumPy: ``pip install regraph[vectors]``.
+"""
+
+import json
+import os
+import threading
+from typing import Any, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+if TYPE_CHECKING:
+    from .models import Embedding, EmbeddingData
+
+VectorId = Union[int, str]
+
+FORMAT_VERSION = 1
+VECTORS_FILE = "vectors.f32"
+META_FILE = "meta.json"
+IDS_FILE = "ids.json"
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("regraph.vectors requires NumPy: pip install regraph[vectors]")
+
+
+def as_matrix(vectors: Any) -> Any:
+    """
+    Convert embeddings to a 2-D float32 array.
+
+    Args:
+        vectors: An Embedding response, a list of EmbeddingData, a single
+            vector, a list of vectors or an array
+
+    Returns:
+        float32 array of shape (n, dim)
+    """
+    _require_numpy()
+    if hasattr(vectors, "data") and not isinstance(vectors, np.ndarray):
+        vectors = vectors.data
+    if isinstance(vectors, (list, tuple)) and vectors and hasattr(vectors[0], "embedding"):
+        vectors = [e.embedding for e in sorted(vectors, key=lambda e: e.index)]
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected vectors of shape (n, dim), got {matrix.shape}")
+    return matrix
+
+
+def normalize(matrix: Any) -> Any:
+    """Scale the rows of a float32 matrix to unit length in place (zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+class VectorIndex:
+    """
+    Exact cosine-similarity index over normalised float32 vectors.
+
+    Example:
+        >>> index = VectorIndex()
+        >>> docs = ["ReGraph is a compute marketplace", "Cats sleep a lot"]
+        >>> index.add(client.embeddings.create(model="text-embedding-3-small", input=docs), ids=docs)
+        >>> query = client.embeddings.create(model="text-embedding-3-small", input="GPU rental")
+        >>> index.search(query, k=1)
+        [[('ReGraph is a compute marketplace', 0.83)]]
+        >>> index.save("docs-index")
+        >>> index = VectorIndex.load("docs-index")  # memory-mapped
+    """
+
+    def __init__(self, dim: Optional[int] = None, capacity: int = 1024):
+        """
+        Create an empty index.
+
+        Args:
+            dim: Vector dimension (default: taken from the first vectors added)
+            capacity: Rows to preallocate; storage doubles as needed
+        """
+        _require_numpy()
+        self.dim = dim
+        self._capacity = capacity
+        self._matrix: Any = None
+        self._count = 0
+        self._ids: Optional[List[VectorId]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def vectors(self) -> Any:
+        """Read-only view of the stored (normalised) vectors."""
+        if self._matrix is None:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        view = self._matrix[: self._count]
+        view.flags.writeable = False
+        return view
+
+    # ---------- Ingestion ----------
+
+    def _reserve(self, rows: int) -> None:
+        needed = self._count + rows
+        if self._matrix is not None and needed <= len(self._matrix) and self._matrix.flags.writeable:
+            return
+        capacity = max(self._capacity, needed, 2 * (len(self._matrix) if self._matrix is not None else 0))
+        matrix = np.empty((capacity, self.dim), dtype=np.float32)
+        if self._count:
+            # Also turns a read-only memory map into an in-memory copy.
+            matrix[: self._count] = self._matrix[: self._count]
+        self._matrix = matrix
+
+    def add(
+        self,
+        vectors: Union["Embedding", Sequence["EmbeddingData"], Any],
+        ids: Optional[Sequence[VectorId]] = None,
+        normalized: bool = False,
+    ) -> List[int]:
+        """
+        Append vectors to the index.
+
+        Args:
+            vectors: An Embedding response, a list of EmbeddingData, or an
+                array-like of shape (n, dim)
+            ids: IDs to return from searches (default: row numbers)
+            normalized: Skip normalisation for vectors already of unit length
+
+        Returns:
+            Row numbers assigned to the new vectors
+        """
+        matrix = as_matrix(vectors)
+        if ids is not None and len(ids) != len(matrix):
+            raise ValueError(f"Got {len(ids)} ids for {len(matrix)} vectors")
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = matrix.shape[1]
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(f"Expected vectors of dimension {self.dim}, got {matrix.shape[1]}")
+
+            self._reserve(len(matrix))
+            start = self._count
+            rows = self._matrix[start : start + len(matrix)]
+            rows[:] = matrix
+            if not normalized:
+                normalize(rows)
+
+            if ids is not None and self._ids is None:
+                self._ids = list(range(start))
+            if self._ids is not None:
+                self._ids.extend(ids if ids is not None else range(start, start + len(matrix)))
+            self._count += len(matrix)
+            return list(range(start, self._count))
+
+    # ---------- Search ----------
+
+    def search_arrays(self, queries: Any, k: int = 10, block_size: int = 65536) -> Tuple[Any, Any]:
+        """
+        Find the k most similar stored vectors for each query.
+
+        The stored matrix is scanned in blocks of ``block_size`` rows, so memory
+        use is bounded by ``len(queries) x block_size`` scores however large the
+        index is.
+
+        Args:
+            queries: An Embedding response, a single vector or an array of shape (n, dim)
+            k: Number of neighbours per query
+            block_size: Stored rows scored per matrix product
+
+        Returns:
+            Tuple of (scores, rows) arrays of shape (n, k), best match first;
+            rows are -1 (with score -inf) where the index holds fewer than k vectors
+        """
+        q = normalize(as_matrix(queries).copy())
+        n = len(q)
+        best_scores = np.full((n, k), -np.inf, dtype=np.float32)
+        best_rows = np.full((n, k), -1, dtype=np.int64)
+
+        with self._lock:
+            matrix, count = self._matrix, self._count
+        if count == 0:
+            return best_scores, best_rows
+        if q.shape[1] != self.dim:
+            raise ValueError(f"Expected queries of dimension {self.dim}, got {q.shape[1]}")
+
+        for start in range(0, count, block_size):
+            block = matrix[start : min(start + block_size, count)]
+            scores = q @ block.T
+            if len(block) > k:
+                top = np.argpartition(scores, -k, axis=1)[:, -k:]
+            else:
+                top = np.broadcast_to(np.arange(len(block)), (n, len(block)))
+            cand_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            cand_rows = np.concatenate([best_rows, top + start], axis=1)
+            keep = np.argpartition(cand_scores, -k, axis=1)[:, -k:]
+            best_scores = np.take_along_axis(cand_scores, keep, axis=1)
+            best_rows = np.take_along_axis(cand_rows, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        return np.take_along_axis(best_scores, order, axis=1), np.take_along_axis(best_rows, order, axis=1)
+
+    def search(self, queries: Any, k: int = 10) -> List[List[Tuple[VectorId, float]]]:
+        """
+        Find the k most similar stored vectors for each query.
+
+        Args:
+            queries: An Embedding response, a single vector or an array of shape (n, dim)
+            k: Number of neighbours per query
+
+        Returns:
+            One list of (id, cosine similarity) pairs per query, best match first
+        """
+        scores, rows = self.search_arrays(queries, k)
+        ids = self._ids
+        return [
+            [(ids[r] if ids is not None else r, float(s)) for s, r in zip(srow, rrow) if r >= 0]
+            for srow, rrow in zip(scores.tolist(), rows.tolist())
+        ]
+
+    # ---------- Persistence ----------
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to a directory.
+
+        Args:
+            path: Directory to write (created if missing)
+        """
+        os.makedirs(path, exist_ok=True)
+        with self._lock:
+            tmp_path = os.path.join(path, VECTORS_FILE + ".tmp")
+            with open(tmp_path, "wb") as f:
+                if self._count:
+                    self._matrix[: self._count].tofile(f)
+            os.replace(tmp_path, os.path.join(path, VECTORS_FILE))
+
+            if self._ids is not None:
+                tmp_path = os.path.join(path, IDS_FILE + ".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._ids, f)
+                os.replace(tmp_path, os.path.join(path, IDS_FILE))
+
+            meta = {
+                "version": FORMAT_VERSION,
+                "dim": self.dim,
+                "count": self._count,
+                "normalized": True,
+                "ids": self._ids is not None,
+            }
+            tmp_path = os.path.join(path, META_FILE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, os.path.join(path, META_FILE))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "VectorIndex":
+        """
+        Open an index written by save().
+
+        Args:
+            path: Index directory
+            mmap: Map the vectors read-only instead of reading them into memory;
+                the first add() after loading copies them into memory
+
+        Returns:
+            VectorIndex
+        """
+        _require_numpy()
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version", FORMAT_VERSION) > FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format version: {meta['version']}")
+
+        index = cls(dim=meta["dim"])
+        count = meta["count"]
+        vectors_path = os.path.join(path, VECTORS_FILE)
+        if count and mmap and meta.get("normalized", True):
+            index._matrix = np.memmap(vectors_path, dtype=np.float32, mode="r", shape=(count, index.dim))
+        elif count:
+            # The file may be longer than count after an interrupted write.
+            matrix = np.fromfile(vectors_path, dtype=np.float32, count=count * index.dim)
+            index._matrix = matrix.reshape(count, index.dim)
+            if not meta.get("normalized", True):
+                normalize(index._matrix)
+        index._count = count
+
+        if meta.get("ids"):
+            with open(os.path.join(path, IDS_FILE), "r", encoding="utf-8") as f:
+                index._ids = json.load(f)
+        return index
@@ -38,6 +38,11 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=[],  # No external dependencies - uses stdlib only
+    entry_points={
+        "console_scripts": [
+            "regraph=regraph.cli:main",
+        ],
+    },
     extras_require={
         "dev": [
             "pytest>=7.0.0",
@@ -45,6 +50,18 @@ setup(
             "black>=23.0.0",
             "mypy>=1.0.0",
         ],
+        "vectors": [
+            "numpy>=1.20",
+        ],
+        "http2": [
+            "h2>=4.0",
+        ],
+        "telemetry": [
+            "psutil>=5.8",
+        ],
+        "speedups": [
+            "orjson>=3.6",
+        ],
     },
     keywords=[
         "regraph",
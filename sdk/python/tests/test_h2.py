@@ -0,0 +1,120 @@
+"""Tests for the HTTP/2 transport against a local h2c stand-in."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+h2 = pytest.importorskip("h2")
+import h2.config  # noqa: E402
+import h2.connection  # noqa: E402
+import h2.events  # noqa: E402
+import h2.exceptions  # noqa: E402
+
+from regraph import CancellationToken, HTTP2Transport  # noqa: E402
+from regraph.timeouts import Timeout  # noqa: E402
+
+WINDOW = 256 * 1024
+BODY = b"x" * (4 * WINDOW)
+
+
+class _StandIn:
+    """h2c server answering every request with BODY, sent as flow control allows."""
+
+    def __init__(self):
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self._listener.getsockname()[1]}/v1"
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock):
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        pending = {}  # stream id -> body still to send
+        with sock:
+            sock.sendall(conn.data_to_send())
+            while True:
+                try:
+                    data = sock.recv(65536)
+                except OSError:
+                    return
+                if not data:
+                    return
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        conn.send_headers(
+                            event.stream_id, [(":status", "200"), ("content-length", str(len(BODY)))]
+                        )
+                        pending[event.stream_id] = memoryview(BODY)
+                    elif isinstance(event, h2.events.StreamReset):
+                        pending.pop(event.stream_id, None)
+                for stream_id, rest in list(pending.items()):
+                    try:
+                        while rest:
+                            size = min(conn.local_flow_control_window(stream_id), conn.max_outbound_frame_size)
+                            if size <= 0:
+                                break
+                            conn.send_data(stream_id, bytes(rest[:size]), end_stream=size >= len(rest))
+                            rest = rest[size:]
+                    except h2.exceptions.StreamClosedError:
+                        rest = None
+                    if rest:
+                        pending[stream_id] = rest
+                    else:
+                        pending.pop(stream_id, None)
+                sock.sendall(conn.data_to_send())
+
+    def close(self):
+        self._listener.close()
+
+
+@pytest.fixture
+def transport():
+    server = _StandIn()
+    transport = HTTP2Transport(
+        server.url, max_connections=1, window_size=WINDOW, timeout=Timeout(connect=2, read=2)
+    )
+    yield transport
+    transport.close()
+    server.close()
+
+
+def _read_all(transport):
+    status, chunks = transport.stream("GET", "/blob")
+    assert status == 200
+    return sum(len(chunk) for chunk in chunks)
+
+
+def test_streams_closed_early_return_their_window(transport):
+    for _ in range(8):
+        status, chunks = transport.stream("GET", "/blob")
+        assert status == 200
+        next(chunks)
+        time.sleep(0.05)  # Let the rest of the stream window arrive unread
+        chunks.close()
+
+    # With the unread data still charged to the connection window this stalls
+    # and times out.
+    assert _read_all(transport) == len(BODY)
+    assert transport.metrics()["connections_opened"] == 1
+
+
+def test_cancelled_streams_return_their_window(transport):
+    for _ in range(8):
+        token = CancellationToken()
+        status, chunks = transport.stream("GET", "/blob", cancel=token)
+        next(chunks)
+        time.sleep(0.05)
+        token.cancel()
+        chunks.close()
+
+    assert _read_all(transport) == len(BODY)
+    assert transport.metrics()["connections_opened"] == 1
@@ -0,0 +1,89 @@
+"""Tests for TelemetryAgent against an in-memory telemetry endpoint."""
+
+import json
+import time
+
+from regraph import MockTransport, ReGraph
+from regraph.telemetry import TelemetryAgent
+
+
+class _Endpoint:
+    """Telemetry endpoint whose next replies can be set to fail."""
+
+    def __init__(self):
+        self.replies = []  # (status, body) served before falling back to success
+        self.received = []  # seq values of accepted samples
+
+    def __call__(self, method, path, body, headers):
+        if self.replies:
+            return self.replies.pop(0)
+        self.received.extend(json.loads(body)["metrics"]["seq"])
+        return 200, b'{"accepted": true}'
+
+
+class _Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"seq": float(self.calls)}
+
+
+def _failing_sampler():
+    raise RuntimeError("sensor unavailable")
+
+
+def _agent(endpoint, **kwargs):
+    client = ReGraph(api_key="test", transport=MockTransport(endpoint))
+    return TelemetryAgent(client, device_id="dev_test", **kwargs)
+
+
+def test_failed_pushes_keep_samples_buffered():
+    endpoint = _Endpoint()
+    endpoint.replies = [(503, b'{"error": {"message": "try again"}}'), (200, b'{"accepted": ')]
+    agent = _agent(endpoint, samplers=[_Counter()])
+    for _ in range(3):
+        agent.sample()
+
+    assert agent.push() is False  # 503
+    assert agent.push() is False  # Reply is not JSON
+    stats = agent.metrics()
+    assert stats["push_failures"] == 2
+    assert stats["buffered"] == 3
+    assert stats["last_error"]
+
+    assert agent.push() is True
+    assert endpoint.received == [1.0, 2.0, 3.0]
+    assert agent.metrics()["buffered"] == 0
+
+
+def test_failing_sampler_does_not_lose_other_metrics():
+    agent = _agent(_Endpoint(), samplers=[_Counter(), _failing_sampler])
+    values = agent.sample()
+
+    assert values == {"seq": 1.0}
+    stats = agent.metrics()
+    assert stats["sample_failures"] == 1
+    assert "sensor unavailable" in stats["last_error"]
+
+
+def test_thread_survives_sampler_and_push_errors():
+    endpoint = _Endpoint()
+    endpoint.replies = [(503, b"{}")] * 5 + [(200, b"not json")] * 5
+    counter = _Counter()
+    agent = _agent(endpoint, sample_interval=0.005, push_interval=0.01, samplers=[counter, _failing_sampler])
+    agent.start()
+    deadline = time.monotonic() + 5
+    while endpoint.replies and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    thread = agent._thread
+    assert thread is not None and thread.is_alive()
+    agent.stop()
+
+    stats = agent.metrics()
+    assert stats["push_failures"] >= 10
+    assert stats["sample_failures"] == stats["samples"]
+    assert stats["buffered"] == 0
+    assert endpoint.received == [float(i) for i in range(1, counter.calls + 1)]
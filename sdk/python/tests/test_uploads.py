@@ -0,0 +1,75 @@
+"""Tests for chunked uploads against an in-memory stand-in for the upload API."""
+
+import hashlib
+import json
+import os
+
+import pytest
+
+from regraph import MockTransport, ReGraph, ReGraphError
+
+SERVER_PART_SIZE = 1000
+
+
+class _UploadAPI:
+    """Upload endpoints that override the part size and can reject one part."""
+
+    def __init__(self, reject_part=None):
+        self.reject_part = reject_part
+        self.creates = 0
+        self.parts = {}  # part number -> bytes
+        self.puts = []
+
+    def __call__(self, method, path, body, headers):
+        if method == "POST" and path == "/uploads":
+            self.creates += 1
+            return 200, json.dumps({"upload_id": "upl_1", "part_size": SERVER_PART_SIZE}).encode()
+        if method == "GET" and path == "/uploads/upl_1":
+            parts = [{"part_number": n, "sha256": hashlib.sha256(b).hexdigest()} for n, b in self.parts.items()]
+            return 200, json.dumps({"parts": parts}).encode()
+        if method == "PUT":
+            n = int(path.rsplit("/", 1)[-1])
+            self.puts.append(n)
+            if n == self.reject_part:
+                return 400, b'{"error": {"message": "rejected"}}'
+            self.parts[n] = body
+            return 200, b"{}"
+        if method == "POST" and path == "/uploads/upl_1/complete":
+            size = sum(len(b) for b in self.parts.values())
+            return 200, json.dumps({"id": "upl_1", "filename": "data.bin", "purpose": "dataset",
+                                    "bytes": size, "created_at": ""}).encode()
+        return 404, b'{"error": {"message": "not found"}}'
+
+
+def test_resume_after_server_overrides_part_size(tmp_path):
+    data = os.urandom(5 * SERVER_PART_SIZE + 123)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    api = _UploadAPI(reject_part=3)
+    client = ReGraph(api_key="test", transport=MockTransport(api))
+
+    with pytest.raises(ReGraphError):
+        client.files.upload(str(path), part_size=4096, concurrency=1)
+    assert sorted(api.parts) == [1, 2]
+
+    api.reject_part = None
+    api.puts.clear()
+    client.files.upload(str(path), part_size=4096, concurrency=1)
+
+    assert api.creates == 1  # Resumed into the same upload
+    assert sorted(api.puts) == [3, 4, 5, 6]  # Only the missing parts were sent
+    assert b"".join(api.parts[n] for n in sorted(api.parts)) == data
+    assert not os.path.exists(str(path) + ".upload.json")
+
+
+def test_manifest_keeps_callers_part_size(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(os.urandom(3 * SERVER_PART_SIZE))
+    client = ReGraph(api_key="test", transport=MockTransport(_UploadAPI(reject_part=2)))
+
+    with pytest.raises(ReGraphError):
+        client.files.upload(str(path), part_size=4096, concurrency=1)
+    with open(str(path) + ".upload.json", encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["identity"]["part_size"] == 4096
+    assert state["part_size"] == SERVER_PART_SIZE